@@ -1,22 +1,23 @@
 #!/usr/bin/env python3
 """
 Add sub-municipalities section to all location pages
+
+Only generated pages are updated, pass --overwrite-pages to include the
+hand-made ones (see page_rewriter.location_pages).
 """
+import argparse
 import os
 import json
 
-def add_submunicipalities_section(filepath, city_slug):
-    """Add sub-municipalities section to a location page"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Check if section already exists
-    if 'id="submunicipalities-section"' in content:
-        print(f"  ⏭️  Section already exists in {os.path.basename(filepath)}")
-        return False
-    
-    # Add section before products section
-    submunicipalities_html = '''
+from page_rewriter import InsertSectionRule, RewritePipeline, add_overwrite_argument, location_pages
+
+SECTION_MARKER = 'id="submunicipalities-section"'
+
+PRODUCTS_ANCHOR = '    <!-- Products Showcase (Dynamic) -->'
+LOAD_PRODUCTS_ANCHOR = '    // Initialize\n    loadProducts();'
+
+# Add section before products section
+SUBMUNICIPALITIES_HTML = '''
     <!-- Sub-municipalities Section -->
     <section id="submunicipalities-section" class="content-row" data-animate="fade-up" style="display: none;">
       <div class="content-label">
@@ -31,12 +32,11 @@ def add_submunicipalities_section(filepath, city_slug):
       </div>
     </section>
 
-    <!-- Products Showcase (Dynamic) -->'''
-    
-    content = content.replace('    <!-- Products Showcase (Dynamic) -->', submunicipalities_html)
-    
-    # Add script to load sub-municipalities
-    script_addition = f'''
+'''
+
+def script_addition(page):
+    """Script that loads the sub-municipalities for this page's city"""
+    return f'''
     
     // Load sub-municipalities for this location
     async function loadSubMunicipalities() {{
@@ -53,7 +53,7 @@ def add_submunicipalities_section(filepath, city_slug):
         
         // Find sub-municipalities for this city
         const subMunicipalities = allLocations.filter(loc => 
-          loc.slug === '{city_slug}' && loc.parent !== null
+          loc.slug === '{page.slug}' && loc.parent !== null
         );
         
         if (subMunicipalities.length > 0) {{
@@ -75,51 +75,46 @@ def add_submunicipalities_section(filepath, city_slug):
     }}
     
     loadSubMunicipalities();'''
+
+def rewrite_rules():
+    """Edits this script makes to a location page"""
+    return [
+        InsertSectionRule('Added sub-municipalities section', PRODUCTS_ANCHOR,
+                          SUBMUNICIPALITIES_HTML, unless=SECTION_MARKER),
+        # Insert after the products loader, unless the loader is already there
+        InsertSectionRule('Added sub-municipalities script', LOAD_PRODUCTS_ANCHOR,
+                          script_addition, unless='loadSubMunicipalities', before=False),
+    ]
+
+def main_cities(json_path='public/data/all-locations.json'):
+    """slug -> name of every main municipality (hoofdgemeente)"""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        locations_data = json.load(f)
     
-    # Insert before the closing script tag
-    content = content.replace('    // Initialize\n    loadProducts();', f'    // Initialize\n    loadProducts();{script_addition}')
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
-    
-    return True
+    all_locations = locations_data['west-vlaanderen'] + locations_data['oost-vlaanderen']
+    return {loc['slug']: loc['name'] for loc in all_locations if loc['parent'] is None}
 
 def main():
-    base_dir = '/Users/larsleenders/Downloads/Tafel Totaal/public/locaties'
+    parser = argparse.ArgumentParser(description='Add the sub-municipalities section to the location pages')
+    add_overwrite_argument(parser)
+    args = parser.parse_args()
+    
+    base_dir = 'public/locaties'
     
     if not os.path.exists(base_dir):
         print(f"❌ Directory not found: {base_dir}")
         return
     
-    # Load all locations to get slugs
-    json_path = '/Users/larsleenders/Downloads/Tafel Totaal/public/data/all-locations.json'
-    with open(json_path, 'r', encoding='utf-8') as f:
-        locations_data = json.load(f)
-    
-    # Get all unique slugs (main municipalities)
-    all_locations = locations_data['west-vlaanderen'] + locations_data['oost-vlaanderen']
-    main_cities = {}
-    for loc in all_locations:
-        if loc['parent'] is None:
-            main_cities[loc['slug']] = loc['name']
+    # Only process pages of main cities
+    cities = main_cities()
     
+    pipeline = RewritePipeline(rewrite_rules())
     updated = 0
     
-    for filename in sorted(os.listdir(base_dir)):
-        if not filename.endswith('.html'):
-            continue
-        
-        city_slug = filename.replace('.html', '')
-        
-        # Only process if this is a main city
-        if city_slug not in main_cities:
-            continue
-        
-        filepath = os.path.join(base_dir, filename)
-        
-        if add_submunicipalities_section(filepath, city_slug):
+    for page in location_pages(base_dir, overwrite=args.overwrite_pages, slugs=cities):
+        if pipeline.run_page(page):
             updated += 1
-            print(f"✅ Updated: {filename} ({main_cities[city_slug]})")
+            print(f"✅ Updated: {page.slug} ({cities[page.slug]})")
     
     print(f"\n📊 Summary: {updated} pages updated with sub-municipalities section")
 
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the location build pipeline on synthetic datasets
+
+Writes locations.csv files of 500, 5k, 50k and 500k rows in the import
+schema (cached in .build/benchmarks/) and times each stage separately:
+
+    parse    import_locations_from_csv.parse_csv
+    json     all-locations.json and the per-slug shards, serialized
+    render   location_template.render_location_bytes (what
+             generate_location_page and the generator call)
+    write    generate_missing_location_pages.write_page into a temp dir
+
+Every dataset runs in a fresh process, so memory from one size does not
+count towards the next. Peak RSS is the stage's high-water mark (reset per
+stage through /proc/self/clear_refs where the kernel allows it, otherwise
+the process maximum from getrusage). Rendering and writing use the first
+--max-pages hoofdgemeenten; their cost per page does not depend on the
+dataset size, and 500k rows would otherwise mean ~100k pages on disk.
+
+Results go to .build/benchmarks/results.json and are compared against
+benchmarks/baseline.json, which is committed; a stage that got slower (or
+bigger) than --threshold makes the script exit with status 1. Timings only
+compare on similar machines, so refresh the baseline (--save-baseline, then
+commit benchmarks/baseline.json) after an intended performance change or
+when benchmarking on a different machine; see benchmarks/README.md.
+
+Usage:
+    python3 benchmark_build.py                    # all sizes, compare with baseline
+    python3 benchmark_build.py --sizes 500 5000   # quick run
+    python3 benchmark_build.py --save-baseline    # record this run as the baseline (commit it)
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+
+from build_manifest import BUILD_DIR, write_atomic
+
+BENCH_DIR = os.path.join(BUILD_DIR, 'benchmarks')
+RESULTS_PATH = os.path.join(BENCH_DIR, 'results.json')
+# Tracked, unlike the rest of BENCH_DIR
+BASELINE_PATH = os.path.join('benchmarks', 'baseline.json')
+
+SIZES = (500, 5_000, 50_000, 500_000)
+STAGES = ('parse', 'json', 'render', 'write')
+RESULTS_VERSION = 1
+
+CSV_HEADER = 'provincie,postcode,plaats,Type,hoofdgemeente\n'
+PROVINCES = ('West-Vlaanderen', 'Oost-Vlaanderen')
+
+# Name parts for synthetic municipalities; a few carry accents so slugify
+# takes its Unicode path as it does for the real data
+NAME_PARTS = ('Ber', 'Gem', 'Kerk', 'Lo', 'Mer', 'Ro', 'Sint-', 'Wa', 'Vel', 'Zee',
+              'Hou', 'Ter', 'Bee', 'Ka', 'Dré', 'Pol', 'Mon', 'Ghe', 'Lin', 'Noë')
+DEEL_SUFFIXES = ('Noord', 'Zuid', 'Dorp', 'Veld', 'Hoek', 'Broek', 'Kapelle', 'Statie')
+
+# Changes smaller than this are noise, whatever the percentage
+NOISE_FLOOR = 0.02
+
+
+def synthetic_csv(rows, path, seed=1):
+    """Write a locations.csv with `rows` rows in the import schema"""
+    rng = random.Random(seed)
+    written = 0
+    index = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(CSV_HEADER)
+        while written < rows:
+            index += 1
+            province = PROVINCES[index % 2]
+            name = f"{rng.choice(NAME_PARTS)}{rng.choice(NAME_PARTS).lower()}{index}"
+            group = name.upper()
+            postcode = 8000 + index % 2000
+
+            lines = [f'{province},{postcode},{name},Hoofdgemeente,{group}\n']
+            for suffix in rng.sample(DEEL_SUFFIXES, rng.randint(2, 6)):
+                deel_code = postcode + rng.randint(1, 9) * 10
+                lines.append(f'{province},{deel_code},{name} {suffix},Deelgemeente,{group}\n')
+                # Some deelgemeenten have a second postcode, merged by the importer
+                if rng.random() < 0.1:
+                    lines.append(f'{province},{deel_code + 1},{name} {suffix},Deelgemeente,{group}\n')
+
+            lines = lines[:rows - written]
+            f.writelines(lines)
+            written += len(lines)
+    return path
+
+
+def dataset(rows):
+    """Path of the cached synthetic CSV for a size, generated on first use"""
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    path = os.path.join(BENCH_DIR, f'locations-{rows}.csv')
+    if not os.path.exists(path):
+        synthetic_csv(rows, path)
+    return path
+
+
+def _reset_peak_rss():
+    """Reset the kernel's RSS high-water mark; False if not supported"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss(reset):
+    """Peak RSS in bytes since the last reset (or since process start)"""
+    if reset:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kB on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def measure(func, items, repeat):
+    """Run func `repeat` times; fastest wall time, highest peak RSS"""
+    best = None
+    peak = 0
+    result = None
+    for _ in range(repeat):
+        reset = _reset_peak_rss()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = func()
+        wall = time.perf_counter() - start
+        best = wall if best is None else min(best, wall)
+        peak = max(peak, _peak_rss(reset))
+
+    return {
+        'wall': best,
+        'peak_rss': peak,
+        'items': items,
+        'per_second': items / best if best else 0,
+    }, result
+
+
+def run_size(rows, max_pages, repeat):
+    """Benchmark every stage on one dataset; runs in its own process"""
+    from generate_missing_location_pages import get_hoofdgemeenten, write_page
+    from import_locations_from_csv import build_location_shards, parse_csv
+    from location_template import load_template, render_location_bytes
+
+    csv_path = dataset(rows)
+    load_template()
+    stages = {}
+
+    stages['parse'], data = measure(lambda: parse_csv(csv_path), rows, repeat)
+
+    def serialize():
+        content = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+        shards = [json.dumps(children, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                  for children in build_location_shards(data).values()]
+        return len(content) + sum(len(shard) for shard in shards)
+
+    locations = sum(len(province) for province in data.values())
+    stages['json'], size = measure(serialize, locations, repeat)
+    stages['json']['bytes'] = size
+
+    pages = get_hoofdgemeenten(data)[:max_pages]
+    stages['render'], contents = measure(
+        lambda: [render_location_bytes(location, province, children) for location, province, children in pages],
+        len(pages), repeat)
+    stages['render']['bytes'] = sum(len(content) for content in contents)
+
+    # Each run writes into a fresh directory; removing them is not timed
+    scratch = tempfile.mkdtemp(prefix='bench-pages-')
+
+    def write_pages():
+        out_dir = Path(tempfile.mkdtemp(dir=scratch))
+        for (location, _, _), content in zip(pages, contents):
+            write_page(out_dir / location['slug'] / 'index.html', content)
+
+    try:
+        stages['write'], _ = measure(write_pages, len(pages), repeat)
+    finally:
+        shutil.rmtree(scratch)
+    return stages
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def run(sizes, max_pages, repeat):
+    results = {}
+    for rows in sizes:
+        dataset(rows)
+        # Fresh interpreter per size, so peak RSS is not inherited
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+            results[str(rows)] = pool.submit(run_size, rows, max_pages, repeat).result()
+        print_size(rows, results[str(rows)])
+    return {
+        'version': RESULTS_VERSION,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment(),
+        'max_pages': max_pages,
+        'results': results,
+    }
+
+
+def print_size(rows, stages):
+    print(f"\n⏱️  {rows:,} rows")
+    for stage in STAGES:
+        result = stages[stage]
+        print(f"   {stage:<7} {result['wall'] * 1000:>10.1f} ms  {result['per_second']:>12,.0f} items/s  "
+              f"{result['peak_rss'] / 2 ** 20:>7.1f} MB peak RSS  ({result['items']:,} items)")
+
+
+def compare(current, baseline, threshold):
+    """Print the change per stage, return the regressions"""
+    if baseline.get('environment') != current['environment']:
+        print("\n⚠️  Baseline was recorded on a different machine or Python version")
+
+    regressions = []
+    print(f"\n📊 Compared with baseline from {baseline['timestamp']}:")
+    for rows, stages in current['results'].items():
+        base_stages = baseline['results'].get(rows)
+        if not base_stages:
+            continue
+        for stage in STAGES:
+            now, base = stages[stage], base_stages.get(stage)
+            if not base:
+                continue
+            wall_change = now['wall'] / base['wall'] - 1 if base['wall'] else 0
+            rss_change = now['peak_rss'] / base['peak_rss'] - 1 if base['peak_rss'] else 0
+
+            slower = wall_change > threshold and now['wall'] - base['wall'] > NOISE_FLOOR
+            bigger = rss_change > threshold
+            marker = '❌' if slower or bigger else '✓'
+            print(f"   {marker} {int(rows):>9,} {stage:<7} time {wall_change:>+7.1%}  peak RSS {rss_change:>+7.1%}")
+            if slower or bigger:
+                regressions.append((rows, stage))
+    return regressions
+
+
+def load_results(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    return results if results.get('version') == RESULTS_VERSION else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the location build on synthetic datasets')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, metavar='ROWS',
+                        help='dataset sizes in CSV rows (default: %(default)s)')
+    parser.add_argument('--max-pages', type=int, default=1000, metavar='N',
+                        help='pages to render and write per dataset (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3, metavar='N',
+                        help='runs per stage, the fastest counts (default: %(default)s)')
+    parser.add_argument('--output', default=RESULTS_PATH, help='results file (default: %(default)s)')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline to compare with (default: %(default)s)')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='relative slowdown that counts as a regression (default: %(default)s)')
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the baseline')
+    args = parser.parse_args()
+
+    current = run(args.sizes, args.max_pages, max(1, args.repeat))
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    payload = json.dumps(current, indent=2).encode('utf-8')
+    write_atomic(args.output, payload)
+    print(f"\n✓ Results written to {args.output}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or '.', exist_ok=True)
+        write_atomic(args.baseline, payload)
+        print(f"✅ Saved as baseline: {args.baseline}")
+        return
+
+    baseline = load_results(args.baseline)
+    if baseline is None:
+        print(f"💡 No baseline at {args.baseline}, run with --save-baseline to record one")
+        return
+
+    regressions = compare(current, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} stages regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+    print(f"\n✅ No regressions above {args.threshold:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Content-hash manifest used by the incremental build scripts
+
+Each manifest is a small JSON file under .build/ that maps a key (a location
+slug, a file path, ...) to the hashes that were recorded the last time that
+output was produced.
+"""
+import hashlib
+import json
+import os
+
+from build_metrics import count
+
+BUILD_DIR = '.build'
+MANIFEST_VERSION = 1
+
+
+def hash_bytes(data):
+    """Return the hex SHA-256 of a bytes object"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_json(obj):
+    """Return a stable hash of a JSON-serializable object"""
+    payload = json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hash_bytes(payload.encode('utf-8'))
+
+
+def hash_file(path):
+    """Return the hash of a file on disk, or None if it does not exist"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    count('files_read')
+    count('bytes_read', len(data))
+    return hash_bytes(data)
+
+
+def write_atomic(path, data):
+    """Write bytes to a temp file next to `path` and move it into place
+
+    Readers see either the old or the new file, and a process that dies
+    halfway leaves only the stray .tmp file behind.
+    """
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    count('files_written')
+    count('bytes_written', len(data))
+
+
+def write_if_changed(path, data):
+    """Atomically write bytes unless the file already holds them, return True if written"""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                count('files_unchanged')
+                return False
+    except FileNotFoundError:
+        pass
+
+    write_atomic(path, data)
+    return True
+
+
+def manifest_path(name):
+    """Path of a named manifest inside the build directory"""
+    return os.path.join(BUILD_DIR, f'{name}.json')
+
+
+class Manifest:
+    """Key -> record mapping persisted as JSON between builds"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            # Missing or corrupt manifest: start over with a full build
+            return
+
+        if data.get('version') == MANIFEST_VERSION:
+            self.entries = data.get('entries', {})
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, **record):
+        if self.entries.get(key) != record:
+            self.entries[key] = record
+            self.dirty = True
+
+    def remove(self, key):
+        if self.entries.pop(key, None) is not None:
+            self.dirty = True
+
+    def prune(self, keep):
+        """Drop entries whose key is not in `keep`, return the removed keys"""
+        stale = [key for key in self.entries if key not in keep]
+        for key in stale:
+            del self.entries[key]
+        if stale:
+            self.dirty = True
+        return stale
+
+    def save(self):
+        """Write the manifest if anything changed since it was loaded"""
+        if not self.dirty:
+            return False
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        payload = json.dumps({'version': MANIFEST_VERSION, 'entries': self.entries},
+                             ensure_ascii=False, indent=2, sort_keys=True)
+        write_atomic(self.path, payload.encode('utf-8'))
+        self.dirty = False
+        return True
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Timers, counters and optional profiling for the build scripts
+
+The build modules count what they do (files read, bytes written, regex
+substitutions, ...) with count() and time their stages with timer(). A
+script's main() calls start_run() once after parsing its arguments; at exit
+the run's wall and CPU time, peak RSS, timers and counters are written to
+.build/metrics/<script>.json. Nothing is printed unless --profile is given.
+
+With --profile the run is also captured with cProfile and tracemalloc: the
+raw stats go to .build/metrics/<script>.prof (for pstats or snakeviz), the
+hottest functions and largest allocation sites are added to the JSON summary
+and printed after the script's own output.
+
+Counters only see the process they run in: work done in worker processes
+(generate_missing_location_pages.py --jobs N) is counted from the results
+the workers send back.
+
+Usage:
+    python3 build_metrics.py                         # summaries of the last runs
+    python3 build_metrics.py import_locations_from_csv
+"""
+import argparse
+import atexit
+import cProfile
+import io
+import json
+import os
+import pstats
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+# build_manifest.BUILD_DIR, not imported since build_manifest imports this module
+METRICS_DIR = os.path.join('.build', 'metrics')
+METRICS_VERSION = 1
+
+PROFILE_TOP = 25
+PRINT_TOP = 15
+ALLOCATIONS_TOP = 10
+
+_counters = {}
+_timers = {}
+_run = None
+
+
+def count(name, amount=1):
+    """Add `amount` to a named counter"""
+    _counters[name] = _counters.get(name, 0) + amount
+
+
+@contextmanager
+def timer(name):
+    """Add the wall time of the block to a named timer"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry = _timers.setdefault(name, [0.0, 0])
+        entry[0] += time.perf_counter() - start
+        entry[1] += 1
+
+
+def add_profile_argument(parser):
+    parser.add_argument('--profile', action='store_true',
+                        help='capture cProfile and tracemalloc data, print the hot spots at exit')
+
+
+def start_run(script, profile=False):
+    """Start measuring this process; the summary is written at exit"""
+    global _run
+    _counters.clear()
+    _timers.clear()
+
+    profiler = None
+    if profile:
+        tracemalloc.start()
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    _run = {
+        'script': script,
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'wall': time.perf_counter(),
+        'cpu': time.process_time(),
+        'profiler': profiler,
+    }
+    atexit.register(finish_run)
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kB on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _profile_rows(stats, limit):
+    rows = []
+    for (filename, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            'function': f'{os.path.relpath(filename) if filename.startswith("/") else filename}:{line}({function})',
+            'calls': calls,
+            'tottime': round(tottime, 6),
+            'cumtime': round(cumtime, 6),
+        })
+    rows.sort(key=lambda row: row['cumtime'], reverse=True)
+    return rows[:limit]
+
+
+def summary():
+    """The current run as a JSON-serializable dict"""
+    return {
+        'version': METRICS_VERSION,
+        'script': _run['script'],
+        'argv': sys.argv[1:],
+        'started_at': _run['started_at'],
+        'wall': round(time.perf_counter() - _run['wall'], 6),
+        'cpu': round(time.process_time() - _run['cpu'], 6),
+        'peak_rss': peak_rss(),
+        'timers': {name: {'seconds': round(seconds, 6), 'calls': calls}
+                   for name, (seconds, calls) in _timers.items()},
+        'counters': dict(_counters),
+    }
+
+
+def finish_run():
+    """Write the summary (and profile) of the current run"""
+    global _run
+    if _run is None:
+        return
+
+    profiler = _run['profiler']
+    if profiler:
+        profiler.disable()
+    data = summary()
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    base = os.path.join(METRICS_DIR, _run['script'])
+
+    if profiler:
+        profile_path = f'{base}.prof'
+        profiler.dump_stats(profile_path)
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        data['profile'] = _profile_rows(stats, PROFILE_TOP)
+        data['profile_path'] = profile_path
+
+        traced, traced_peak = tracemalloc.get_traced_memory()
+        top = tracemalloc.take_snapshot().statistics('lineno')[:ALLOCATIONS_TOP]
+        tracemalloc.stop()
+        data['allocations'] = {
+            'traced': traced,
+            'traced_peak': traced_peak,
+            'top': [{'location': f'{stat.traceback[0].filename}:{stat.traceback[0].lineno}',
+                     'size': stat.size, 'count': stat.count} for stat in top],
+        }
+
+    # Plain write: build_manifest imports this module, and the metrics file
+    # should not show up in its own counters
+    tmp_path = f'{base}.json.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, f'{base}.json')
+
+    if profiler:
+        print_profile(data)
+    _run = None
+
+
+def print_profile(data):
+    print(f"\n📊 Profile of {data['script']}: {data['wall']:.3f}s wall, {data['cpu']:.3f}s CPU, "
+          f"{data['peak_rss'] / 2 ** 20:.1f} MB peak RSS")
+    for name, timer_data in data['timers'].items():
+        print(f"   ⏱️  {name:<28} {timer_data['seconds'] * 1000:>10.1f} ms  ({timer_data['calls']}x)")
+    for name, value in sorted(data['counters'].items()):
+        print(f"   #  {name:<28} {value:>12,}")
+
+    print(f"\n   Top {PRINT_TOP} functions by cumulative time:")
+    for row in data['profile'][:PRINT_TOP]:
+        print(f"   {row['cumtime'] * 1000:>10.1f} ms {row['calls']:>9,}x  {row['function']}")
+
+    allocations = data['allocations']
+    print(f"\n   Python allocations: {allocations['traced_peak'] / 2 ** 20:.1f} MB peak, largest live sites:")
+    for stat in allocations['top']:
+        print(f"   {stat['size'] / 1024:>10.1f} KB {stat['count']:>9,}x  {stat['location']}")
+    print(f"\n   Full profile: {data['profile_path']} (python3 -m pstats {data['profile_path']})")
+
+
+def load_summary(script):
+    try:
+        with open(os.path.join(METRICS_DIR, f'{script}.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show the metrics of the last build script runs')
+    parser.add_argument('scripts', nargs='*', help='script names (default: every recorded run)')
+    args = parser.parse_args()
+
+    scripts = args.scripts
+    if not scripts and os.path.isdir(METRICS_DIR):
+        scripts = sorted(name[:-5] for name in os.listdir(METRICS_DIR) if name.endswith('.json'))
+    if not scripts:
+        print(f"No metrics recorded yet in {METRICS_DIR}")
+        return
+
+    for script in scripts:
+        data = load_summary(script)
+        if data is None:
+            print(f"⚠️  No metrics for {script}")
+            continue
+        timers = ', '.join(f"{name} {t['seconds'] * 1000:.0f} ms" for name, t in data['timers'].items())
+        counters = ', '.join(f"{name} {value:,}" for name, value in sorted(data['counters'].items()))
+        print(f"📊 {script} ({data['started_at']}): {data['wall']:.3f}s wall, "
+              f"{data['peak_rss'] / 2 ** 20:.1f} MB peak RSS")
+        if timers:
+            print(f"   ⏱️  {timers}")
+        if counters:
+            print(f"   #  {counters}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Stylesheet bundling and critical CSS for generated pages
+
+build_bundle() concatenates a page type's stylesheets in link order,
+minifies them into public/css/bundles/<name>.<hash>.css and extracts the
+rules that match the above-the-fold markup, so they can be inlined in
+<head> while the full bundle loads without blocking rendering.
+
+The critical rules are found statically: a selector is kept when every tag,
+class and id it names occurs in the markup (pseudo-classes and attribute
+selectors are ignored), together with the @media blocks around kept rules
+and the @keyframes they animate with.
+
+Bundles are cached in .build/css-bundles.json by the hash of every input
+stylesheet and of the markup, so a CSS change rebuilds the bundle once.
+
+Usage:
+    python3 css_bundle.py    # build the location page bundle
+"""
+import os
+import posixpath
+import re
+
+from build_manifest import Manifest, hash_bytes, hash_file, hash_json, manifest_path, write_if_changed
+
+PUBLIC_DIR = 'public'
+BUNDLE_DIR = 'css/bundles'
+URL_PREFIX = '/Tafel-Totaal'
+BUNDLE_VERSION = 2
+
+MANIFEST_NAME = 'css-bundles'
+
+TOKEN_PATTERN = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|/\*.*?\*/)''', re.DOTALL)
+URL_PATTERN = re.compile(r'''url\((\s*['"]?)([^'")]+)''')
+
+# At-rules whose body holds rules, as opposed to declarations or keyframes
+NESTED_AT_RULES = ('@media', '@supports', '@layer', '@container')
+
+PSEUDO_PATTERN = re.compile(r'::?[a-zA-Z-]+(\((?:[^()]|\([^()]*\))*\))?')
+ATTRIBUTE_PATTERN = re.compile(r'\[[^\]]*\]')
+COMBINATOR_PATTERN = re.compile(r'\s*[\s>+~]\s*')
+TAG_PATTERN = re.compile(r'^[a-zA-Z][a-zA-Z0-9-]*')
+CLASS_PATTERN = re.compile(r'\.([\w-]+)')
+ID_PATTERN = re.compile(r'#([\w-]+)')
+
+HTML_TAG_PATTERN = re.compile(r'<([a-zA-Z][a-zA-Z0-9-]*)')
+HTML_CLASS_PATTERN = re.compile(r'\sclass="([^"]*)"')
+HTML_ID_PATTERN = re.compile(r'\sid="([^"]*)"')
+
+
+def rebase_urls(css, stylesheet_url):
+    """Make relative url()s absolute, since the bundle lives in another directory
+
+    `stylesheet_url` is the site path (/css/...); the result carries the
+    /Tafel-Totaal prefix the bundle itself is served under.
+    """
+    base = posixpath.dirname(stylesheet_url)
+
+    def rebase(match):
+        quote, url = match.groups()
+        if url.startswith(('/', 'data:', 'http:', 'https:', '#')):
+            return match.group(0)
+        return f'url({quote}{URL_PREFIX}{posixpath.normpath(posixpath.join(base, url))}'
+
+    return URL_PATTERN.sub(rebase, css)
+
+
+def minify_css(css):
+    """Drop comments and redundant whitespace, leaving strings untouched"""
+    def squeeze(text):
+        text = re.sub(r'\s+', ' ', text)
+        text = re.sub(r'\s*([{};,>])\s*', r'\1', text)
+        # Last declaration of a block needs no semicolon
+        text = text.replace(';}', '}')
+        return re.sub(r':\s+', ':', text)
+
+    out = []
+    pending = []
+    for i, token in enumerate(TOKEN_PATTERN.split(css)):
+        if not i % 2:
+            pending.append(token)
+        elif token.startswith('/*'):
+            pending.append(' ')
+        else:
+            out.append(squeeze(''.join(pending)))
+            out.append(token)
+            pending = []
+    out.append(squeeze(''.join(pending)))
+    return ''.join(out).strip()
+
+
+def parse_rules(css):
+    """Split minified CSS into (prelude, body) pairs
+
+    For nested at-rules (@media, @supports, ...) the body is a list of
+    pairs; for everything else it is the raw text between the braces, or
+    None for statements like @import.
+    """
+    rules = []
+    i = 0
+    length = len(css)
+    while i < length:
+        # Scan the prelude up to { or ; outside strings
+        start = i
+        while i < length and css[i] not in '{;':
+            if css[i] in '"\'':
+                i = _skip_string(css, i)
+            else:
+                i += 1
+        prelude = css[start:i].strip()
+        if i >= length:
+            break
+        if css[i] == ';':
+            rules.append((prelude, None))
+            i += 1
+            continue
+
+        # Find the matching closing brace
+        depth = 0
+        body_start = i + 1
+        while i < length:
+            char = css[i]
+            if char in '"\'':
+                i = _skip_string(css, i)
+                continue
+            if char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth == 0:
+                    break
+            i += 1
+        body = css[body_start:i]
+        i += 1
+
+        if prelude.startswith(NESTED_AT_RULES):
+            rules.append((prelude, parse_rules(body)))
+        else:
+            rules.append((prelude, body))
+    return rules
+
+
+def _skip_string(css, i):
+    quote = css[i]
+    i += 1
+    while i < len(css) and css[i] != quote:
+        i += 2 if css[i] == '\\' else 1
+    return i + 1
+
+
+def serialize(rules):
+    out = []
+    for prelude, body in rules:
+        if body is None:
+            out.append(f'{prelude};')
+        elif isinstance(body, list):
+            out.append(f'{prelude}{{{serialize(body)}}}')
+        else:
+            out.append(f'{prelude}{{{body}}}')
+    return ''.join(out)
+
+
+def markup_names(html):
+    """Tags, classes and ids that occur in a piece of markup"""
+    tags = {tag.lower() for tag in HTML_TAG_PATTERN.findall(html)} | {'html', 'body'}
+    classes = {name for value in HTML_CLASS_PATTERN.findall(html) for name in value.split()}
+    ids = set(HTML_ID_PATTERN.findall(html))
+    return tags, classes, ids
+
+
+def selector_matches(selector, names):
+    """True if every tag, class and id in the selector occurs in the markup"""
+    tags, classes, ids = names
+    selector = ATTRIBUTE_PATTERN.sub('', PSEUDO_PATTERN.sub('', selector))
+    for compound in COMBINATOR_PATTERN.split(selector.strip()):
+        tag = TAG_PATTERN.match(compound)
+        if tag and tag.group(0).lower() not in tags:
+            return False
+        if not classes.issuperset(CLASS_PATTERN.findall(compound)):
+            return False
+        if not ids.issuperset(ID_PATTERN.findall(compound)):
+            return False
+    return True
+
+
+def critical_rules(rules, names):
+    """Rules (with their selectors narrowed) that apply to the markup"""
+    kept = []
+    for prelude, body in rules:
+        if body is None or prelude.startswith(('@keyframes', '@-webkit-keyframes', '@font-face')):
+            continue
+        if isinstance(body, list):
+            inner = critical_rules(body, names)
+            if inner:
+                kept.append((prelude, inner))
+            continue
+        if prelude.startswith('@'):
+            continue
+        selectors = [s for s in prelude.split(',') if selector_matches(s, names)]
+        if selectors:
+            kept.append((','.join(selectors), body))
+    return kept
+
+
+def used_keyframes(rules, critical_css):
+    """@keyframes and @font-face rules the critical rules depend on"""
+    kept = []
+    for prelude, body in rules:
+        if prelude.startswith(('@keyframes', '@-webkit-keyframes')):
+            name = prelude.split(None, 1)[1]
+            if re.search(rf'(?<![\w-]){re.escape(name)}(?![\w-])', critical_css):
+                kept.append((prelude, body))
+        elif prelude.startswith('@font-face'):
+            kept.append((prelude, body))
+    return kept
+
+
+def bundle_inputs(stylesheets, markup, public_dir=PUBLIC_DIR):
+    return hash_json({
+        'version': BUNDLE_VERSION,
+        'stylesheets': {url: hash_file(os.path.join(public_dir, url.lstrip('/'))) for url in stylesheets},
+        'markup': hash_bytes(markup.encode('utf-8')),
+    })
+
+
+def build_bundle(name, stylesheets, markup, public_dir=PUBLIC_DIR, manifest=None):
+    """Build (or reuse) the bundle for `stylesheets`, return its manifest record
+
+    `stylesheets` are site paths like /css/base.css, in link order; `markup`
+    is the above-the-fold HTML the critical rules are extracted for.
+    """
+    manifest = manifest or Manifest(manifest_path(MANIFEST_NAME))
+    inputs = bundle_inputs(stylesheets, markup, public_dir)
+    entry = manifest.get(name)
+    if entry and entry['inputs'] == inputs and os.path.exists(os.path.join(public_dir, entry['path'])):
+        return entry
+
+    sources = []
+    original_size = 0
+    for url in stylesheets:
+        with open(os.path.join(public_dir, url.lstrip('/')), 'r', encoding='utf-8') as f:
+            css = f.read()
+        original_size += len(css.encode('utf-8'))
+        sources.append(minify_css(rebase_urls(css, url)))
+    bundle = ''.join(sources)
+
+    rules = parse_rules(bundle)
+    critical = serialize(critical_rules(rules, markup_names(markup)))
+    critical = serialize(used_keyframes(rules, critical)) + critical
+
+    content = bundle.encode('utf-8')
+    filename = f'{name}.{hash_bytes(content)[:12]}.css'
+    bundle_dir = os.path.join(public_dir, BUNDLE_DIR)
+    os.makedirs(bundle_dir, exist_ok=True)
+    write_if_changed(os.path.join(bundle_dir, filename), content)
+
+    # Older bundles of this page type are no longer referenced
+    for old in os.listdir(bundle_dir):
+        if old.startswith(f'{name}.') and old.endswith('.css') and old != filename:
+            os.remove(os.path.join(bundle_dir, old))
+
+    manifest.set(name, inputs=inputs, path=f'{BUNDLE_DIR}/{filename}',
+                 url=f'{URL_PREFIX}/{BUNDLE_DIR}/{filename}', critical=critical,
+                 original_size=original_size, size=len(content))
+    manifest.save()
+    return manifest.get(name)
+
+
+def load_bundle(name):
+    """Manifest record of a built bundle, or None"""
+    return Manifest(manifest_path(MANIFEST_NAME)).get(name)
+
+
+def head_markup(record, indent='  '):
+    """Inline critical CSS plus a non-blocking link to the full bundle"""
+    return (f"{indent}<style>{record['critical']}</style>\n"
+            f"{indent}<link rel=\"preload\" href=\"{record['url']}\" as=\"style\" "
+            f"onload=\"this.onload=null;this.rel='stylesheet'\">\n"
+            f"{indent}<noscript><link rel=\"stylesheet\" href=\"{record['url']}\"></noscript>")
+
+
+def main():
+    from location_template import build_css_bundle
+
+    record = build_css_bundle()
+    print(f"✓ {record['path']}: {record['original_size'] / 1024:.1f} KB in "
+          f"-> {record['size'] / 1024:.1f} KB minified")
+    print(f"   Critical CSS inlined per page: {len(record['critical'].encode('utf-8')) / 1024:.1f} KB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Local dev server that renders the location pages on request
+
+Serves public/ (under / and under the /Tafel-Totaal GitHub Pages prefix),
+but the /locaties/<slug>/ pages the generator owns are rendered from the
+location data and the compiled template in memory instead of read from
+disk. Hand-made pages (no record in the generator's manifest, or changed
+since it wrote them, like the SEO pages) are served from disk as they are,
+the same pages a build keeps; --overwrite-pages renders those too. Before
+each page request the
+server checks the CSV, the template, the components and the build
+manifests the template reads (CSS bundle, fingerprints, images, featured
+products); whatever changed is reloaded, so editing the CSV or the template
+costs a browser refresh instead of a rebuild. CSS and image changes still
+go through the build (python3 sitebuild.py assets --watch next to this).
+
+Rendered pages are cached by the generator's input hash, which also serves
+as the ETag: a refresh with nothing changed is answered with 304 Not
+Modified, any change to the page's inputs means a new ETag and one render.
+
+/api/products answers from import-data/products-fixture.json, standing in
+for the Railway backend. It is served on the site port and on --api-port
+(3000, where the page scripts look for the API on localhost). Other /api/
+routes answer 404.
+
+Requests are handled by a pool of --threads worker threads.
+
+Usage:
+    python3 dev_server.py                  # http://localhost:8000/locaties/<slug>/
+    python3 dev_server.py --port 8080 --api-port 0
+    python3 dev_server.py --no-minify      # readable page source
+    python3 dev_server.py --overwrite-pages  # preview the template on the hand-made pages too
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+from urllib.parse import parse_qs, urlsplit
+
+from build_manifest import manifest_path
+from featured_products import CACHE_PATH as PRODUCTS_SNAPSHOT, FIXTURE_PATH
+from generate_missing_location_pages import get_hoofdgemeenten, input_hash, page_path
+from location_template import (COMPONENTS_DIR, TEMPLATE_PATH, load_components, load_template,
+                               render_location_bytes)
+from locations import CSV_PATH, load_locations
+from page_rewriter import GENERATOR_MANIFEST, LOCATIES_DIR, generated_slugs
+from sitebuild import file_signature
+
+PUBLIC_DIR = 'public'
+SITE_PREFIX = '/Tafel-Totaal'
+
+PORT = 8000
+API_PORT = 3000
+THREADS = 8
+# Rendered pages kept in memory, about 60 KB each
+CACHE_SIZE = 256
+
+LOCATION_PATH_PATTERN = re.compile(r'^/locaties/([a-z0-9-]+)(/|/index\.html)?$')
+
+# Everything the compiled template is built from
+TEMPLATE_INPUTS = (
+    TEMPLATE_PATH,
+    COMPONENTS_DIR,
+    manifest_path('css-bundles'),
+    manifest_path('assets'),
+    manifest_path('images'),
+    PRODUCTS_SNAPSHOT,
+)
+
+
+class DevSite:
+    """Location data and rendered pages, reloaded when their sources change"""
+
+    def __init__(self, csv_path=CSV_PATH, minify=True, cache_size=CACHE_SIZE,
+                 locaties_dir=LOCATIES_DIR, overwrite_pages=False):
+        self.csv_path = csv_path
+        self.minify = minify
+        self.cache_size = cache_size
+        self.locaties_dir = locaties_dir
+        self.overwrite_pages = overwrite_pages
+        self.pages = {}
+        self.hand_made = set()
+        self.cache = OrderedDict()
+        self.renders = 0
+        self.lock = threading.Lock()
+        self._data_signature = None
+        self._template_signature = None
+        self._owner_signature = None
+
+    def refresh(self):
+        """Reload the data or the template if their files changed since the last request"""
+        data_signature = file_signature([self.csv_path])
+        template_signature = file_signature(TEMPLATE_INPUTS)
+        owner_signature = file_signature([manifest_path(GENERATOR_MANIFEST), self.locaties_dir])
+        with self.lock:
+            if data_signature != self._data_signature:
+                data = load_locations(self.csv_path)
+                self.pages = {location['slug']: (location, province, children)
+                              for location, province, children in get_hoofdgemeenten(data)}
+                self._data_signature = data_signature
+                self._owner_signature = None
+                print(f"📖 Loaded {len(self.pages)} location pages from {self.csv_path}")
+            if owner_signature != self._owner_signature and not self.overwrite_pages:
+                self.hand_made = self.find_hand_made()
+                self._owner_signature = owner_signature
+            if template_signature != self._template_signature:
+                load_components.cache_clear()
+                load_template.cache_clear()
+                self._template_signature = template_signature
+
+    def find_hand_made(self):
+        """Slugs with a page on disk the generator did not write, see page_rewriter.generated_slugs"""
+        generated = generated_slugs(self.locaties_dir)
+        return {slug for slug in self.pages
+                if slug not in generated and page_path(self.locaties_dir, slug).is_file()}
+
+    def lookup(self, slug):
+        """(location, province, children) and the quoted ETag of a page, None for
+        unknown slugs and hand-made pages"""
+        page = self.pages.get(slug)
+        if page is None or slug in self.hand_made:
+            return None
+        return page, f'"{input_hash(*page)[:32]}{"" if self.minify else "-full"}"'
+
+    def render(self, page, etag):
+        """Page bytes for a page and ETag from lookup(), and whether they came from the cache"""
+        with self.lock:
+            content = self.cache.get(etag)
+            if content is not None:
+                self.cache.move_to_end(etag)
+                return content, True
+
+        content = render_location_bytes(*page, minify=self.minify)
+        with self.lock:
+            self.cache[etag] = content
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            self.renders += 1
+        return content, False
+
+
+def products_response(query):
+    """The fixture in the shape of GET /api/products, honouring ?limit="""
+    with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
+        payload = json.load(f)
+
+    limit = parse_qs(query).get('limit', [''])[0]
+    if limit.isdigit():
+        payload['data'] = payload['data'][:int(limit)]
+        payload['pagination'] = dict(payload.get('pagination', {}), limit=int(limit))
+    return payload
+
+
+class DevRequestHandler(SimpleHTTPRequestHandler):
+    """Static files from public/, rendered location pages and the products stand-in"""
+
+    def __init__(self, *args, site=None, **kwargs):
+        self.site = site
+        super().__init__(*args, directory=PUBLIC_DIR, **kwargs)
+
+    def end_headers(self):
+        # Always revalidate, the files change while developing
+        self.send_header('Cache-Control', 'no-cache')
+        super().end_headers()
+
+    def do_GET(self):
+        self.route(head=False)
+
+    def do_HEAD(self):
+        self.route(head=True)
+
+    def route(self, head):
+        url = urlsplit(self.path)
+        path = url.path
+        if path == SITE_PREFIX or path.startswith(SITE_PREFIX + '/'):
+            path = path[len(SITE_PREFIX):] or '/'
+
+        if path.startswith('/api/'):
+            self.send_api(path, url.query, head)
+            return
+
+        match = LOCATION_PATH_PATTERN.match(path)
+        if match and self.send_location(match.group(1), match.group(2), head):
+            return
+
+        # Static file; SimpleHTTPRequestHandler resolves self.path against public/
+        self.path = path + (f'?{url.query}' if url.query else '')
+        if head:
+            super().do_HEAD()
+        else:
+            super().do_GET()
+
+    def send_location(self, slug, suffix, head):
+        """Render a location page, False to serve the static file (unknown slug or hand-made page)"""
+        self.site.refresh()
+        found = self.site.lookup(slug)
+        if found is None:
+            return False
+        page, etag = found
+        if not suffix:
+            self.send_response(HTTPStatus.MOVED_PERMANENTLY)
+            self.send_header('Location', f'{self.path.split("?")[0]}/')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return True
+
+        if etag in (tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return True
+
+        start = time.perf_counter()
+        content, cached = self.site.render(page, etag)
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('ETag', etag)
+        self.send_header('X-Render', 'cached' if cached else f'{(time.perf_counter() - start) * 1000:.1f} ms')
+        self.end_headers()
+        if not head:
+            self.wfile.write(content)
+        return True
+
+    def send_api(self, path, query, head):
+        if path.rstrip('/') == '/api/products':
+            status, payload = HTTPStatus.OK, products_response(query)
+        else:
+            status, payload = HTTPStatus.NOT_FOUND, {'success': False, 'error': f'{path} is not in the dev stand-in'}
+
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        # The page scripts call the API on another port
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that handles requests in a fixed pool of threads"""
+
+    def __init__(self, address, handler, threads=THREADS):
+        super().__init__(address, handler)
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='dev-server')
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve public/ with location pages rendered on request')
+    parser.add_argument('--host', default='localhost', help='address to listen on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=PORT, help='site port (default: %(default)s)')
+    parser.add_argument('--api-port', type=int, default=API_PORT,
+                        help='also serve the /api/products stand-in here, 0 to disable (default: %(default)s)')
+    parser.add_argument('--threads', type=int, default=THREADS, help='request threads (default: %(default)s)')
+    parser.add_argument('--no-minify', action='store_true', help='serve the pages unminified')
+    parser.add_argument('--overwrite-pages', action='store_true',
+                        help='also render the slugs that have a hand-made page instead of serving it')
+    args = parser.parse_args()
+
+    site = DevSite(minify=not args.no_minify, overwrite_pages=args.overwrite_pages)
+    site.refresh()
+    handler = partial(DevRequestHandler, site=site)
+
+    servers = [PooledHTTPServer((args.host, args.port), handler, args.threads)]
+    if args.api_port and args.api_port != args.port:
+        try:
+            servers.append(PooledHTTPServer((args.host, args.api_port), handler, 2))
+        except OSError as error:
+            print(f"⚠️  No products stand-in on port {args.api_port}: {error}")
+
+    for server in servers[1:]:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    print(f"🚀 http://{args.host}:{args.port}/locaties/ (rendered on request, Ctrl+C to stop)")
+    if len(servers) > 1:
+        print(f"🛒 Products stand-in: http://{args.host}:{args.api_port}/api/products ({FIXTURE_PATH})")
+    try:
+        servers[0].serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n👋 Stopped after {site.renders} page renders")
+    finally:
+        for server in servers:
+            server.server_close()
+
+
+if __name__ == '__main__':
+    main()
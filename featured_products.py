@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Build-time snapshot of the featured products on the location pages
+
+Instead of every page view calling /api/products?limit=4 on the Railway
+backend, the build fetches the products once and the location template
+renders the cards statically (the page script only fetches them when the
+grid is still empty).
+
+The snapshot lives in .build/featured-products.json, stamped with when it
+was fetched, where from and when it expires. Builds reuse it until it is
+older than the TTL, then refresh it from the same source; if the source is
+unreachable the stale snapshot is kept. Run this script from a scheduled job
+to refresh the products without rebuilding on every change in the backend.
+
+The source is the production API or any file with the same JSON shape, such
+as import-data/products-fixture.json for offline builds.
+
+Usage:
+    python3 featured_products.py                       # refresh if expired
+    python3 featured_products.py --force               # refresh now
+    python3 featured_products.py --fixture             # use the offline fixture
+"""
+import argparse
+import html
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from decimal import Decimal, ROUND_HALF_UP
+
+from build_manifest import BUILD_DIR, write_atomic
+
+API_URL = 'https://tafel-totaal-production.up.railway.app/api/products?limit=4'
+FIXTURE_PATH = 'import-data/products-fixture.json'
+CACHE_PATH = os.path.join(BUILD_DIR, 'featured-products.json')
+
+TTL = 6 * 60 * 60
+FETCH_TIMEOUT = 10
+
+# Fields the cards use; the rest of the API record is not cached
+PRODUCT_FIELDS = ('id', 'name', 'category_name', 'price_per_day', 'images')
+
+PLACEHOLDER_IMAGE = '/Tafel-Totaal/images/products/placeholder.jpg'
+
+PRODUCT_CARD = """\
+        <article class="product-card" data-animate="scale" style="animation-delay: {delay}s;">
+          <a href="/Tafel-Totaal/product.html?id={id}" class="product-link">
+            <div class="product-image">
+              <img src="{image}" alt="{name}" loading="lazy">
+            </div>
+            <div class="product-info">
+              <span class="product-category">{category}</span>
+              <h3 class="product-title">{name}</h3>
+              <p class="product-price">{price} <span>/dag</span></p>
+            </div>
+          </a>
+        </article>"""
+
+
+def format_price(amount):
+    """Euro amount the way formatPrice() (Intl.NumberFormat nl-BE) writes it: € 1.234,50"""
+    amount = Decimal(str(amount)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    whole, cents = f'{amount:,.2f}'.split('.')
+    return f"€\xa0{whole.replace(',', '.')},{cents}"
+
+
+def priced(products):
+    """Products that can be shown: a card without a price_per_day cannot be rendered"""
+    return [product for product in products if product.get('price_per_day') is not None]
+
+
+def read_source(source):
+    """Products from the API or a file with the API's response shape"""
+    if source.startswith(('http://', 'https://')):
+        request = urllib.request.Request(source, headers={'Accept': 'application/json'})
+        with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+            payload = json.load(response)
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+
+    if not payload.get('success') or not isinstance(payload.get('data'), list):
+        raise ValueError(f'{source} did not return a product list')
+
+    products = [{field: product.get(field) for field in PRODUCT_FIELDS} for product in payload['data']]
+    shown = priced(products)
+    for product in products:
+        if product not in shown:
+            print(f"⚠️  Skipping product without a price: {product.get('name') or product.get('id')}")
+    return shown
+
+
+def load_cache(path=CACHE_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def is_fresh(cache, now=None):
+    return cache is not None and (now or time.time()) < cache['expires_at']
+
+
+def refresh(source, ttl=TTL, path=CACHE_PATH):
+    """Fetch the products and write a new snapshot, return it"""
+    products = read_source(source)
+    fetched_at = time.time()
+    cache = {
+        'source': source,
+        'fetched_at': fetched_at,
+        'expires_at': fetched_at + ttl,
+        'products': products,
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_atomic(path, json.dumps(cache, ensure_ascii=False, indent=2).encode('utf-8'))
+    return cache
+
+
+def load_featured_products(source=None, ttl=TTL, force=False, path=CACHE_PATH):
+    """Return (snapshot, status); status is 'cached', 'refreshed' or 'stale'
+
+    Without a `source`, an expired snapshot is refreshed from the source it
+    was taken from (the API for the first build). The snapshot is None when
+    there is neither a cache nor a reachable source.
+    """
+    cache = load_cache(path)
+    if not force and source is None and is_fresh(cache):
+        return cache, 'cached'
+
+    source = source or (cache['source'] if cache else API_URL)
+    try:
+        return refresh(source, ttl, path), 'refreshed'
+    except (OSError, urllib.error.URLError, ValueError) as error:
+        print(f"⚠️  Could not refresh featured products from {source}: {error}")
+        return cache, 'stale'
+
+
+def product_cards(products):
+    """Static product card markup, same as renderProducts() in the page script"""
+    cards = []
+    # Snapshots from before products without a price were skipped can still hold them
+    for i, product in enumerate(priced(products)):
+        images = product.get('images') or []
+        cards.append(PRODUCT_CARD.format(
+            delay=f'{i * 0.1:g}',
+            id=html.escape(str(product['id'])),
+            image=html.escape(images[0] if images else PLACEHOLDER_IMAGE),
+            name=html.escape(product['name']),
+            category=html.escape(product.get('category_name') or 'Product'),
+            price=format_price(product['price_per_day']),
+        ))
+    return '\n'.join(cards)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh the featured products snapshot')
+    parser.add_argument('--source', help=f'API URL or JSON file (default: the cached source, else {API_URL})')
+    parser.add_argument('--ttl', type=int, default=TTL, metavar='SECONDS',
+                        help=f'how long the snapshot stays valid (default: {TTL})')
+    parser.add_argument('--fixture', action='store_true', help=f'same as --source {FIXTURE_PATH}')
+    parser.add_argument('--force', action='store_true', help='refresh even if the snapshot is still valid')
+    args = parser.parse_args()
+
+    source = FIXTURE_PATH if args.fixture else args.source
+    cache, status = load_featured_products(source, args.ttl, args.force)
+    if cache is None:
+        print("❌ No featured products snapshot available")
+        return
+
+    for product in priced(cache['products']):
+        print(f"✓ {product['name']} ({format_price(product['price_per_day'])})")
+    age = (time.time() - cache['fetched_at']) / 60
+    print(f"\n✅ {len(priced(cache['products']))} featured products, {status} "
+          f"(from {cache['source']}, {age:.0f} min old)")
+    if status == 'refreshed':
+        print("   Run generate_missing_location_pages.py --incremental to render them into the pages")
+
+
+if __name__ == '__main__':
+    main()
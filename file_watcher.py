@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Change notifications for files and directory trees
+
+InotifyWatcher uses the Linux inotify API through ctypes (no extra
+packages): directories are watched recursively, single files through their
+parent directory so editors that save by renaming a temp file over the
+original are still seen. Where inotify is not available (macOS, some
+containers) PollingWatcher compares size and mtime snapshots instead.
+
+Both have wait(timeout), returning the set of changed paths (empty on
+timeout), and bursts() which yields one set per burst of changes: after the
+first change it keeps collecting until nothing happened for `debounce`
+seconds, so an editor's save or a CSV export triggers one rebuild.
+
+Usage:
+    python3 file_watcher.py templates public/components   # print changes
+"""
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+DEBOUNCE = 0.2
+# A steady stream of changes still gets handled after this long
+MAX_DELAY = 2.0
+POLL_INTERVAL = 0.5
+
+# Written and removed again by write_atomic, editors' swap files
+IGNORED_SUFFIXES = ('.tmp', '.swp', '~')
+
+# From <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class Watcher:
+    """Common part: which paths count, and grouping changes into bursts"""
+
+    def __init__(self, paths):
+        self.roots = [os.path.normpath(path) for path in paths]
+
+    def is_relevant(self, path):
+        if path.endswith(IGNORED_SUFFIXES):
+            return False
+        return any(path == root or path.startswith(root + os.sep) for root in self.roots)
+
+    def wait(self, timeout=None):
+        raise NotImplementedError
+
+    def bursts(self, debounce=DEBOUNCE, max_delay=MAX_DELAY):
+        """Yield (changed paths, time of the first change) per burst"""
+        while True:
+            changed = self.wait()
+            if not changed:
+                continue
+            first = time.perf_counter()
+            while time.perf_counter() - first < max_delay:
+                more = self.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+            yield changed, first
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher(Watcher):
+    """Watcher on top of inotify(7)"""
+
+    def __init__(self, paths):
+        super().__init__(paths)
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError('inotify is not available')
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.dirs = {}
+
+        for root in self.roots:
+            if os.path.isdir(root):
+                self._watch_tree(root)
+            else:
+                self._watch(os.path.dirname(root) or '.')
+
+    def _watch(self, directory):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f'inotify_add_watch failed for {directory}')
+        self.dirs[wd] = directory
+
+    def _watch_tree(self, directory):
+        self._watch(directory)
+        for dirpath, dirnames, _ in os.walk(directory):
+            for name in dirnames:
+                self._watch(os.path.join(dirpath, name))
+
+    def _read_events(self):
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'surrogateescape')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost, treat everything as changed
+                changed.update(self.roots)
+                continue
+            directory = self.dirs.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                del self.dirs[wd]
+                continue
+
+            path = os.path.join(directory, name) if name else directory
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and self.is_relevant(path):
+                # New directory (a new page): watch it and count what is already in it
+                self._watch_tree(path)
+                changed.update(os.path.join(dirpath, f) for dirpath, _, files in os.walk(path) for f in files)
+            if self.is_relevant(path):
+                changed.add(path)
+        return changed
+
+    def wait(self, timeout=None):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        return self._read_events() if ready else set()
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher(Watcher):
+    """Watcher that compares size and mtime of every file every POLL_INTERVAL"""
+
+    def __init__(self, paths, interval=POLL_INTERVAL):
+        super().__init__(paths)
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        for root in self.roots:
+            paths = ([os.path.join(dirpath, name) for dirpath, _, files in os.walk(root) for name in files]
+                     if os.path.isdir(root) else [root])
+            for path in paths:
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                if self.is_relevant(path):
+                    snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval if deadline is None else max(0, min(self.interval, deadline - time.monotonic())))
+            snapshot = self._scan()
+            changed = {path for path in snapshot.keys() | self.snapshot.keys()
+                       if snapshot.get(path) != self.snapshot.get(path)}
+            self.snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+
+def create_watcher(paths, polling=False):
+    """InotifyWatcher where the platform has it, else PollingWatcher"""
+    if not polling:
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Print changes under files and directories')
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--poll', action='store_true', help='poll instead of using inotify')
+    args = parser.parse_args()
+
+    watcher = create_watcher(args.paths, polling=args.poll)
+    print(f"👀 Watching {', '.join(args.paths)} ({type(watcher).__name__})")
+    try:
+        for changed, _ in watcher.bursts():
+            print(f"✓ {len(changed)} changed: {', '.join(sorted(changed))}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Content-hashed asset names for the generated pages
+
+Assets referenced by the location template and its components are copied
+to name.<hash>.ext next to the original (so relative module imports keep
+resolving) and the references are rewritten to the hashed name when the
+template is compiled. Those copies never change, so public/netlify.toml
+marks them immutable for a year. /css, /js and /images already are by the
+hand-written rules there; the generated block only lists hashed copies
+outside them, so a rebuild leaves netlify.toml as committed.
+
+.build/assets.json maps each site path to its current hashed copy and the
+size/mtime it was made from, so unchanged assets are not re-hashed. When a
+source changes, its older hashed copies are removed by name, so this also
+works on a checkout without the manifest.
+
+deploy.yml publishes public/ as it is in git and .build/ is not committed,
+so the hashed copies are committed with the pages that reference them. The
+same goes for the CSS bundles (css_bundle.py) and the responsive images
+(image_pipeline.py): after a build, commit whatever it added to or removed
+from public/.
+
+Usage:
+    python3 fingerprint.py    # fingerprint the location template's assets
+"""
+import os
+import re
+
+from build_manifest import Manifest, hash_file, manifest_path, write_atomic
+from publish_docs import copy_file
+
+PUBLIC_DIR = 'public'
+NETLIFY_TOML = 'public/netlify.toml'
+MANIFEST_NAME = 'assets'
+HASH_LENGTH = 10
+
+ASSET_EXTENSIONS = ('css', 'js', 'json', 'png', 'jpg', 'jpeg', 'gif', 'svg', 'webp', 'avif', 'ico', 'woff', 'woff2')
+
+# A site-absolute asset path, optionally behind the GitHub Pages prefix
+REFERENCE_PATTERN = re.compile(
+    r'''(?<=["'(,\s])(/Tafel-Totaal)?(/(?:css|js|images|data)/[^"'()\s?#,]+\.(?:%s))(?=["')\s?#,])'''
+    % '|'.join(ASSET_EXTENSIONS)
+)
+HASHED_NAME_PATTERN = re.compile(r'\.[0-9a-f]{%d,}\.[a-z0-9]+$' % HASH_LENGTH)
+
+# Generated block in netlify.toml, rewritten on every run
+HEADERS_BEGIN = '# BEGIN fingerprinted assets (generated by fingerprint.py, do not edit)'
+HEADERS_END = '# END fingerprinted assets'
+
+# Covered by the hand-written immutable rules in netlify.toml (the CSS
+# bundles in /css/bundles included)
+IMMUTABLE_PREFIXES = ('/css/', '/js/', '/images/')
+
+
+def hashed_name(path, content_hash):
+    stem, ext = os.path.splitext(path)
+    return f'{stem}.{content_hash[:HASH_LENGTH]}{ext}'
+
+
+def find_references(text):
+    """Site paths of the assets a piece of markup refers to"""
+    return {match.group(2) for match in REFERENCE_PATTERN.finditer(text)
+            if not HASHED_NAME_PATTERN.search(match.group(2))}
+
+
+class Fingerprinter:
+    """Keeps name.<hash>.ext copies in sync with their sources"""
+
+    def __init__(self, manifest, public_dir=PUBLIC_DIR):
+        self.manifest = manifest
+        self.public_dir = public_dir
+        self.created = []
+        self.removed = []
+
+    def _file(self, path):
+        return os.path.join(self.public_dir, path.lstrip('/'))
+
+    def fingerprint(self, path):
+        """Hashed site path for `path`, creating the copy if needed; None if missing"""
+        source = self._file(path)
+        try:
+            stat = os.stat(source)
+        except FileNotFoundError:
+            return None
+
+        entry = self.manifest.get(path)
+        if (entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns
+                and os.path.exists(self._file(entry['hashed']))):
+            return entry['hashed']
+
+        hashed = hashed_name(path, hash_file(source))
+        if not os.path.exists(self._file(hashed)):
+            copy_file(source, self._file(hashed))
+            self.created.append(hashed)
+        for stale in self._hashed_copies(path):
+            if stale != hashed:
+                self._remove(stale)
+
+        self.manifest.set(path, size=stat.st_size, mtime=stat.st_mtime_ns, hashed=hashed)
+        return hashed
+
+    def _hashed_copies(self, path):
+        """Site paths of every name.<hash>.ext copy of `path` on disk
+
+        Found by name rather than through the manifest, so the copies of an
+        older version are removed on a fresh checkout too.
+        """
+        directory, filename = os.path.split(path)
+        stem, ext = os.path.splitext(filename)
+        pattern = re.compile(r'%s\.[0-9a-f]{%d}%s$' % (re.escape(stem), HASH_LENGTH, re.escape(ext)))
+        return [f'{directory}/{name}' for name in os.listdir(self._file(directory)) if pattern.match(name)]
+
+    def _remove(self, hashed):
+        try:
+            os.remove(self._file(hashed))
+            self.removed.append(hashed)
+        except FileNotFoundError:
+            pass
+
+    def run(self, paths):
+        """Fingerprint `paths` and drop the copies of assets no longer referenced"""
+        assets = {}
+        for path in sorted(paths):
+            hashed = self.fingerprint(path)
+            if hashed:
+                assets[path] = hashed
+
+        for path in list(self.manifest.entries):
+            if path not in assets:
+                self._remove(self.manifest.get(path)['hashed'])
+                self.manifest.remove(path)
+        self.manifest.save()
+        return assets
+
+
+def load_asset_map():
+    """Site path -> hashed site path from the last fingerprint run"""
+    return {path: entry['hashed'] for path, entry in Manifest(manifest_path(MANIFEST_NAME)).entries.items()}
+
+
+def rewrite_references(text, assets):
+    """Point asset references at their hashed copies"""
+    if not assets:
+        return text
+
+    def rewrite(match):
+        prefix, path = match.groups()
+        return (prefix or '') + assets.get(path, path)
+
+    return REFERENCE_PATTERN.sub(rewrite, text)
+
+
+def headers_block(hashed_paths):
+    """netlify.toml [[headers]] marking hashed assets immutable"""
+    lines = [HEADERS_BEGIN]
+    for path in sorted(hashed_paths):
+        if path.startswith(IMMUTABLE_PREFIXES):
+            continue
+        lines += [
+            '[[headers]]',
+            f'  for = "{path}"',
+            '  [headers.values]',
+            '    Cache-Control = "public, max-age=31536000, immutable"',
+            '',
+        ]
+    lines.append(HEADERS_END)
+    return '\n'.join(lines)
+
+
+def update_netlify_headers(hashed_paths, toml_path=NETLIFY_TOML):
+    """Replace the generated block in netlify.toml, return True if it changed"""
+    with open(toml_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    start = content.find(HEADERS_BEGIN)
+    end = content.find(HEADERS_END)
+    if start == -1 or end == -1:
+        raise ValueError(f'{toml_path} has no "{HEADERS_BEGIN}" block')
+
+    updated = content[:start] + headers_block(hashed_paths) + content[end + len(HEADERS_END):]
+    if updated == content:
+        return False
+    write_atomic(toml_path, updated.encode('utf-8'))
+    return True
+
+
+def main():
+    from location_template import build_fingerprints
+
+    fingerprinter = build_fingerprints()
+    for hashed in fingerprinter.created:
+        print(f"✓ {hashed}")
+    for hashed in fingerprinter.removed:
+        print(f"🗑️  {hashed}")
+    print(f"\n✅ {len(fingerprinter.manifest.entries)} fingerprinted assets "
+          f"({len(fingerprinter.created)} new, {len(fingerprinter.removed)} removed)")
+
+
+if __name__ == '__main__':
+    main()
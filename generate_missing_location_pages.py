@@ -1,415 +1,225 @@
 #!/usr/bin/env python3
 """
 Generate HTML pages for missing municipalities
+
+Usage:
+    python3 generate_missing_location_pages.py                # only missing pages
+    python3 generate_missing_location_pages.py --incremental  # rebuild changed pages
+    python3 generate_missing_location_pages.py --incremental --force  # also overwrite hand-made pages
+    python3 generate_missing_location_pages.py --jobs 4       # render in 4 processes
+    python3 generate_missing_location_pages.py --profile      # print where the time goes
 """
+import argparse
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-def generate_location_page(location, province):
-    """Generate HTML for a location"""
-    name = location['name']
-    slug = location['slug']
-    postal_codes = ', '.join(location['postal_codes'])
-    
-    # Determine province name
-    province_name = 'West-Vlaanderen' if province == 'west' else 'Oost-Vlaanderen'
-    
-    html = f'''<!DOCTYPE html>
-<html lang="nl">
-<head>
-  <meta charset="UTF-8">
-  <meta name="viewport" content="width=device-width, initial-scale=1.0">
-  
-  <!-- SEO Meta Tags -->
-  <title>Servies & Tafelverhuur {name} | Tafel Totaal</title>
-  <meta name="description" content="Professionele servies- en tafelverhuur in {name}. Levering mogelijk!">
-  <meta name="robots" content="index, follow">
-  <link rel="canonical" href="https://leelars.github.io/Tafel-Totaal/locaties/{slug}.html">
-  
-  <!-- Open Graph -->
-  <meta property="og:type" content="website">
-  <meta property="og:title" content="Servies & Tafelverhuur {name} | Tafel Totaal">
-  <meta property="og:description" content="Professionele servies- en tafelverhuur in {name}. Levering mogelijk!">
-  <meta property="og:image" content="/Tafel-Totaal/images/site/Logo-T-T-Zwart-transparant.png">
-  
-  <!-- Favicon -->
-  <link rel="icon" type="image/png" href="/Tafel-Totaal/images/site/Favicon-tafel-totaal.png">
-  
-  <!-- Google Fonts -->
-  <link rel="preconnect" href="https://fonts.googleapis.com">
-  <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-  <link href="https://fonts.googleapis.com/css2?family=Righteous&family=Roboto+Mono:wght@400;500;600&family=Roboto:wght@400;500;700&display=swap" rel="stylesheet">
-  
-  <!-- Stylesheets -->
-  <link rel="stylesheet" href="/Tafel-Totaal/css/variables.css">
-  <link rel="stylesheet" href="/Tafel-Totaal/css/base.css">
-  <link rel="stylesheet" href="/Tafel-Totaal/css/components.css">
-  <link rel="stylesheet" href="/Tafel-Totaal/css/utilities.css">
-  <link rel="stylesheet" href="/Tafel-Totaal/css/pages/location-detail.css">
-  <link rel="stylesheet" href="/Tafel-Totaal/css/pages/location-hero-new.css">
-</head>
-<body>
-  <!-- Header -->
-  <div id="header-container"></div>
-
-  <main>
-    <!-- Marquee Section -->
-    <div class="marquee-section">
-      <div class="marquee-track">
-        <div class="marquee-content">
-          <span>LEVERING IN {name.upper()}</span> <span class="separator">•</span>
-          <span>GEEN AFWAS</span> <span class="separator">•</span>
-          <span>SERVIES & MEUBILAIR</span> <span class="separator">•</span>
-          <span>VOOR ELK EVENT</span> <span class="separator">•</span>
-          <span>LEVERING IN {name.upper()}</span> <span class="separator">•</span>
-          <span>GEEN AFWAS</span> <span class="separator">•</span>
-          <span>SERVIES & MEUBILAIR</span> <span class="separator">•</span>
-          <span>VOOR ELK EVENT</span> <span class="separator">•</span>
-        </div>
-        <div class="marquee-content" aria-hidden="true">
-          <span>LEVERING IN {name.upper()}</span> <span class="separator">•</span>
-          <span>GEEN AFWAS</span> <span class="separator">•</span>
-          <span>SERVIES & MEUBILAIR</span> <span class="separator">•</span>
-          <span>VOOR ELK EVENT</span> <span class="separator">•</span>
-          <span>LEVERING IN {name.upper()}</span> <span class="separator">•</span>
-          <span>GEEN AFWAS</span> <span class="separator">•</span>
-          <span>SERVIES & MEUBILAIR</span> <span class="separator">•</span>
-          <span>VOOR ELK EVENT</span> <span class="separator">•</span>
-        </div>
-      </div>
-    </div>
-
-    <!-- New Split-Screen Hero -->
-    <section class="location-hero">
-      <!-- Left: Content -->
-      <div class="location-hero__content">
-        <nav class="location-hero__breadcrumbs" aria-label="Breadcrumb">
-          <a href="/Tafel-Totaal/">Home</a>
-          <span>/</span>
-          <a href="/Tafel-Totaal/locaties.html">Locaties</a>
-          <span>/</span>
-          <span class="active">{name}</span>
-        </nav>
-
-        <div class="location-hero__badge">
-          <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
-            <path d="M21 10c0 7-9 13-9 13s-9-6-9-13a9 9 0 0 1 18 0z"></path>
-            <circle cx="12" cy="10" r="3"></circle>
-          </svg>
-          {province_name}
-        </div>
-
-        <h1 class="location-hero__title">
-          Tafelverhuur
-          <span class="location-hero__title-highlight">{name}</span>
-        </h1>
-
-        <p class="location-hero__description">
-          Professionele servies- en tafelverhuur in {name}. Van intieme diners tot grote recepties, wij verzorgen uw complete tafeldekking.
-        </p>
-
-        <div class="location-hero__info">
-          <div class="location-hero__info-item">
-            <span class="location-hero__info-label">Prijzen</span>
-            <span class="location-hero__info-value" style="font-size: var(--font-size-base); font-family: var(--font-body);">Bereken uw prijs in de checkout</span>
-          </div>
-        </div>
+from build_manifest import Manifest, hash_bytes, hash_file, hash_json, manifest_path, write_if_changed
+from build_metrics import add_profile_argument, count, start_run, timer
+from html_minify import MINIFIER_VERSION
+from import_locations_from_csv import build_location_shards
+from location_template import (build_css_bundle, build_featured_products, build_fingerprints, load_template,
+                               render_location_bytes, unminified_size)
 
-        <div class="location-hero__cta">
-          <a href="/Tafel-Totaal/pakketten.html" class="btn btn--primary btn--lg">
-            Bekijk Pakketten
-            <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
-              <line x1="5" y1="12" x2="19" y2="12"></line>
-              <polyline points="12 5 19 12 12 19"></polyline>
-            </svg>
-          </a>
-          <a href="/Tafel-Totaal/producten.html" class="btn btn--secondary btn--lg">Bekijk Losse Producten</a>
-        </div>
-      </div>
-
-      <!-- Right: Visual with Stats -->
-      <div class="location-hero__visual">
-        <img src="/Tafel-Totaal/images/site/hero-table-setting.jpg" alt="Tafelverhuur {name}" class="location-hero__image" loading="eager">
-        <div class="location-hero__overlay">
-          <div class="location-hero__stats">
-            <div class="location-hero__stat">
-              <span class="location-hero__stat-value">500+</span>
-              <span class="location-hero__stat-label">Events</span>
-            </div>
-            <div class="location-hero__stat">
-              <span class="location-hero__stat-value">100%</span>
-              <span class="location-hero__stat-label">Service</span>
-            </div>
-            <div class="location-hero__stat">
-              <span class="location-hero__stat-value">0%</span>
-              <span class="location-hero__stat-label">Afwas</span>
-            </div>
-          </div>
-        </div>
-      </div>
-    </section>
-
-    <!-- USPs Grid -->
-    <section class="usps-grid">
-      <div class="usp-item" data-animate="scale" class="delay-1">
-        <div class="usp-icon">
-          <svg width="32" height="32" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="1.5">
-            <path d="M21 10c0 7-9 13-9 13s-9-6-9-13a9 9 0 0 1 18 0z"></path>
-            <circle cx="12" cy="10" r="3"></circle>
-          </svg>
-        </div>
-        <h3>Lokale Service</h3>
-        <p>Wij kennen {name} en leveren stipt op tijd op uw locatie.</p>
-      </div>
-      
-      <div class="usp-item" data-animate="scale" class="delay-2">
-        <div class="usp-icon">
-          <svg width="32" height="32" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="1.5">
-            <path d="M22 11.08V12a10 10 0 1 1-5.93-9.14"></path>
-            <polyline points="22 4 12 14.01 9 11.01"></polyline>
-          </svg>
-        </div>
-        <h3>Wij Doen de Afwas</h3>
-        <p>Lever alles vuil in. Wij zorgen voor de professionele reiniging.</p>
-      </div>
-
-      <div class="usp-item" data-animate="scale" class="delay-3">
-        <div class="usp-icon">
-          <svg width="32" height="32" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="1.5">
-            <rect x="2" y="3" width="20" height="14" rx="2" ry="2"></rect>
-            <line x1="8" y1="21" x2="16" y2="21"></line>
-            <line x1="12" y1="17" x2="12" y2="21"></line>
-          </svg>
-        </div>
-        <h3>Alles voor uw Event</h3>
-        <p>Van borden en bestek tot tafels en stoelen.</p>
-      </div>
-    </section>
-
-    <!-- Main Content -->
-    <div class="content-wrapper">
-      
-      <section class="content-row" data-animate="fade-up">
-        <div class="content-label">
-          <span class="content-number">01</span>
-          <h2>Serviesverhuur {name}</h2>
-        </div>
-        <div class="content-body">
-          <p>Tafel Totaal is uw specialist in <strong>servies verhuur</strong> voor {name}. Ons complete servies omvat borden, kommen, schalen en serveermateriaal. Perfect voor bruiloften, communiefeesten, bedrijfsevents en verjaardagsfeesten.</p>
-        </div>
-      </section>
-      
-      <section class="content-row" data-animate="fade-up">
-        <div class="content-label">
-          <span class="content-number">02</span>
-          <h2>Contact & Levering</h2>
-        </div>
-        <div class="content-body">
-          <p>Wij leveren in heel {name} en omgeving. Neem contact met ons op voor een vrijblijvende offerte.</p>
-        </div>
-      </section>
-      
-    </div>
-
-    <!-- Sub-municipalities Section -->
-    <section id="submunicipalities-section" class="content-row" data-animate="fade-up" style="display: none;">
-      <div class="content-label">
-        <span class="content-number">03</span>
-        <h2>Deelgemeenten</h2>
-      </div>
-      <div class="content-body">
-        <p><strong>Wij leveren ook in de volgende deelgemeenten:</strong></p>
-        <div id="submunicipalities-list" class="sub-municipalities-grid">
-          <!-- Will be loaded dynamically -->
-        </div>
-      </div>
-    </section>
-
-    <!-- Products Showcase -->
-    <section class="products-section">
-      <div class="section-header">
-        <h2>Populair in {name}</h2>
-        <a href="/Tafel-Totaal/producten.html" class="btn-link">Bekijk Alles →</a>
-      </div>
-      
-      <div id="products-grid" class="products-grid">
-        <div class="loading-placeholder">Producten laden...</div>
-      </div>
-    </section>
-  </main>
-
-  <!-- Footer -->
-  <div id="footer-container"></div>
-
-  <!-- Scripts -->
-  <script type="module">
-    import {{ formatPrice }} from '/Tafel-Totaal/js/lib/utils.js';
-    
-    async function loadLocationComponents() {{
-      const basePath = window.location.hostname.includes('github.io') ? '/Tafel-Totaal' : '';
-      
-      try {{
-        const headerResponse = await fetch(`${{basePath}}/components/header.html`);
-        if (headerResponse.ok) {{
-          document.getElementById('header-container').innerHTML = await headerResponse.text();
-          const headerScript = document.createElement('script');
-          headerScript.type = 'module';
-          headerScript.textContent = `
-            import {{ initHeader }} from '/Tafel-Totaal/js/components/header.js';
-            initHeader();
-          `;
-          document.body.appendChild(headerScript);
-        }}
-      }} catch (error) {{
-        console.error('Error loading header:', error);
-      }}
-      
-      try {{
-        const footerResponse = await fetch(`${{basePath}}/components/footer.html`);
-        if (footerResponse.ok) {{
-          document.getElementById('footer-container').innerHTML = await footerResponse.text();
-        }}
-      }} catch (error) {{
-        console.error('Error loading footer:', error);
-      }}
-    }}
-    
-    loadLocationComponents();
-    
-    async function loadProducts() {{
-      try {{
-        const API_BASE = window.location.hostname.includes('github.io')
-          ? 'https://tafel-totaal-production.up.railway.app'
-          : 'http://localhost:3000';
-        
-        const response = await fetch(`${{API_BASE}}/api/products?limit=4`);
-        const data = await response.json();
-        
-        if (data.success && data.data) {{
-          renderProducts(data.data);
-        }}
-      }} catch (error) {{
-        console.error('Error loading products:', error);
-      }}
-    }}
-    
-    function renderProducts(products) {{
-      const grid = document.getElementById('products-grid');
-      if (!grid || !products.length) return;
-      
-      grid.innerHTML = products.map((product, i) => `
-        <article class="product-card" data-animate="scale" style="animation-delay: ${{i * 0.1}}s;">
-          <a href="/Tafel-Totaal/product.html?id=${{product.id}}" class="product-link">
-            <div class="product-image">
-              <img src="${{product.images?.[0] || '/Tafel-Totaal/images/products/placeholder.jpg'}}" 
-                   alt="${{product.name}}" 
-                   loading="lazy">
-            </div>
-            <div class="product-info">
-              <span class="product-category">${{product.category_name || 'Product'}}</span>
-              <h3 class="product-title">${{product.name}}</h3>
-              <p class="product-price">${{formatPrice(product.price_per_day)}} <span>/dag</span></p>
-            </div>
-          </a>
-        </article>
-      `).join('');
-    }}
-    
-    loadProducts();
-    
-    async function loadSubMunicipalities() {{
-      try {{
-        const BASE_PATH = window.location.hostname.includes('github.io') ? '/Tafel-Totaal' : '';
-        const response = await fetch(`${{BASE_PATH}}/data/all-locations.json`);
-        const data = await response.json();
-        
-        const allLocations = [
-          ...data['west-vlaanderen'],
-          ...data['oost-vlaanderen']
-        ];
-        
-        const pageSlug = window.location.pathname.split('/').pop().replace('.html', '');
-        
-        const subMunicipalities = allLocations.filter(loc => 
-          loc.slug === pageSlug && loc.parent !== null
-        );
-        
-        if (subMunicipalities.length > 0) {{
-          const section = document.getElementById('submunicipalities-section');
-          const list = document.getElementById('submunicipalities-list');
-          
-          list.innerHTML = subMunicipalities.map(sub => `
-            <div class="sub-municipality-card">
-              <span class="sub-municipality-name">${{sub.name}}</span>
-              <span class="sub-municipality-zip">${{sub.postal_codes.join(', ')}}</span>
-            </div>
-          `).join('');
-          
-          section.style.display = 'grid';
-        }}
-      }} catch (error) {{
-        console.error('Error loading sub-municipalities:', error);
-      }}
-    }}
+def generate_location_page(location, province, children=()):
+    """Generate HTML for a location"""
+    return render_location_bytes(location, province, children).decode('utf-8')
+
+def page_path(locaties_dir, slug):
+    """Pages live at locaties/<slug>/index.html"""
+    return Path(locaties_dir) / slug / 'index.html'
+
+def get_hoofdgemeenten(data):
+    """Return (location, province, deelgemeenten) for every hoofdgemeente
+    
+    Deelgemeenten are grouped by parent slug in one pass over the dataset.
+    """
+    children = build_location_shards(data)
+    hoofdgemeenten = []
+    for key, province in (('west-vlaanderen', 'west'), ('oost-vlaanderen', 'oost')):
+        for location in data[key]:
+            if location.get('parent') is None:
+                hoofdgemeenten.append((location, province, children[location['slug']]))
+    return hoofdgemeenten
+
+def input_hash(location, province, children):
+    """Hash of everything a page is rendered from
+    
+    Includes the hash of each component the template inlines, so editing
+    header.html rebuilds the pages that embed it and nothing else.
+    """
+    template = load_template()
+    return hash_json({
+        'location': location,
+        'province': province,
+        'submunicipalities': children,
+        'template': template.version,
+        'components': template.components,
+        'minifier': MINIFIER_VERSION,
+    })
+
+def write_page(filepath, content):
+    """Atomically write page bytes, returning False when the file already had this content"""
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    return write_if_changed(filepath, content), hash_bytes(content)
+
+def build_page(job):
+    """Render and write one page; runs in a worker process when --jobs > 1
+    
+    Returns (status, output_hash, sizes) where status is 'created', 'updated',
+    'unchanged' or 'kept' and sizes is (bytes before, bytes after minifying).
+    `entry` is the previous manifest record (None forces a render).
+    
+    A page on disk that the generator did not write (no manifest record, or
+    changed since it was written, like the SEO pages from
+    scripts/generate-seo-location-content.js) is kept unless `force` is set;
+    if it already holds the rendered output it is adopted into the manifest.
+    """
+    location, province, children, filepath, page_input, entry, force = job
+    
+    on_disk = hash_file(filepath)
+    if entry and entry['input'] == page_input and entry['output'] == on_disk:
+        return 'unchanged', on_disk, tuple(entry['sizes'])
+    
+    content = render_location_bytes(location, province, children)
+    output_hash = hash_bytes(content)
+    sizes = (unminified_size(location, province, children), len(content))
+    if on_disk == output_hash:
+        return 'unchanged', output_hash, sizes
+    if on_disk is not None and not force and (entry is None or entry['output'] != on_disk):
+        return 'kept', on_disk, None
+    
+    write_page(filepath, content)
+    return ('created' if on_disk is None else 'updated'), output_hash, sizes
+
+def run_jobs(jobs, workers):
+    """Run build_page over jobs, results come back in job order"""
+    with timer('pages'):
+        if workers <= 1 or len(jobs) <= 1:
+            results = [build_page(job) for job in jobs]
+        else:
+            chunksize = max(1, len(jobs) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(build_page, jobs, chunksize=chunksize))
+    
+    # Counted here rather than in build_page: counters in worker processes are lost
+    for status, _, sizes in results:
+        count(f'pages_{status}')
+        if status in ('created', 'updated'):
+            count('page_bytes_written', sizes[1])
+    return results
+
+def print_size_summary(sizes):
+    """Before/after minification totals over the pages in this build"""
+    before = sum(raw for raw, _ in sizes)
+    after = sum(minified for _, minified in sizes)
+    if before:
+        print(f"📦 HTML: {before / 1024:.0f} KB -> {after / 1024:.0f} KB minified "
+              f"({1 - after / before:.0%} smaller) across {len(sizes)} pages")
+
+def generate_missing(data, locaties_dir, workers=1):
+    """Write pages for hoofdgemeenten that do not have one yet"""
+    hoofdgemeenten = get_hoofdgemeenten(data)
+    missing = [h for h in hoofdgemeenten if not page_path(locaties_dir, h[0]['slug']).exists()]
+    existing = len(hoofdgemeenten) - len(missing)
     
-    loadSubMunicipalities();
+    print(f"Found {len(missing)} missing location pages")
+    print("Generating pages...\n")
     
-    const observer = new IntersectionObserver((entries) => {{
-      entries.forEach(entry => {{
-        if (entry.isIntersecting) {{
-          entry.target.classList.add('visible');
-          observer.unobserve(entry.target);
-        }}
-      }});
-    }}, {{ threshold: 0.1, rootMargin: '0px 0px -50px 0px' }});
+    jobs = [(l, p, c, page_path(locaties_dir, l['slug']), None, None, False) for l, p, c in missing]
+    results = run_jobs(jobs, workers)
     
-    document.querySelectorAll('[data-animate]').forEach(el => {{
-      observer.observe(el);
-    }});
-  </script>
-</body>
-</html>'''
+    created = 0
+    for location, _, _ in missing:
+        print(f"✓ Created {location['slug']}/index.html ({location['name']})")
+        created += 1
     
-    return html
+    print(f"\n✅ Created {created} new location pages")
+    print(f"   Total pages: {existing + created}")
+    print_size_summary([sizes for _, _, sizes in results])
+
+def generate_incremental(data, locaties_dir, manifest, workers=1, force=False):
+    """Rewrite only the pages whose inputs or on-disk output changed
+    
+    Pages the generator did not write are left alone unless `force` is set,
+    see build_page. Returns the page count per status.
+    """
+    hoofdgemeenten = get_hoofdgemeenten(data)
+    
+    jobs = []
+    for location, province, children in hoofdgemeenten:
+        slug = location['slug']
+        jobs.append((location, province, children, page_path(locaties_dir, slug),
+                     input_hash(location, province, children), manifest.get(slug), force))
+    
+    results = run_jobs(jobs, workers)
+    
+    counts = {'created': 0, 'updated': 0, 'unchanged': 0, 'kept': 0}
+    for (location, _, _, _, page_input, _, _), (status, output_hash, sizes) in zip(jobs, results):
+        counts[status] += 1
+        if status == 'kept':
+            continue
+        manifest.set(location['slug'], input=page_input, output=output_hash, sizes=list(sizes))
+        if status != 'unchanged':
+            print(f"✓ {status.capitalize()} {location['slug']}/index.html ({location['name']})")
+    
+    stale = manifest.prune({h[0]['slug'] for h in hoofdgemeenten})
+    manifest.save()
+    
+    print(f"\n✅ Created {counts['created']}, updated {counts['updated']}, "
+          f"unchanged {counts['unchanged']} location pages")
+    if counts['kept']:
+        print(f"   Kept {counts['kept']} pages not written by the generator")
+    print_size_summary([sizes for _, _, sizes in results if sizes])
+    if stale:
+        print(f"   No longer in dataset (left on disk): {', '.join(sorted(stale))}")
+    return counts
 
 def main():
+    parser = argparse.ArgumentParser(description='Generate location pages from all-locations.json')
+    parser.add_argument('--incremental', action='store_true',
+                        help='rebuild every page whose inputs changed since the last build')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help='render and write pages in N worker processes (0 = one per CPU)')
+    parser.add_argument('--force', action='store_true',
+                        help='with --incremental: also overwrite pages the generator did not write '
+                             '(hand-made content such as the SEO sections is lost)')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    start_run('generate_missing_location_pages', profile=args.profile)
+    
+    workers = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    
     # Load JSON
-    with open('public/data/all-locations.json') as f:
+    with timer('load_data'), open('public/data/all-locations.json', encoding='utf-8') as f:
         data = json.load(f)
     
-    # Get all hoofdgemeenten
-    all_locations = data['west-vlaanderen'] + data['oost-vlaanderen']
-    hoofdgemeenten = [l for l in all_locations if l.get('parent') is None]
-    
-    # Get existing HTML files
     locaties_dir = Path('public/locaties')
-    existing_files = set(f.stem for f in locaties_dir.glob('*.html'))
-    
-    # Find missing
-    missing = [h for h in hoofdgemeenten if h['slug'] not in existing_files]
-    
-    print(f"Found {len(missing)} missing location pages")
-    print("Generating pages...\n")
     
-    created = 0
-    for location in missing:
-        # Determine province
-        province = 'west' if location in data['west-vlaanderen'] else 'oost'
-        
-        # Generate HTML
-        html = generate_location_page(location, province)
-        
-        # Write file
-        filepath = locaties_dir / f"{location['slug']}.html"
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(html)
-        
-        print(f"✓ Created {location['slug']}.html ({location['name']})")
-        created += 1
-    
-    print(f"\n✅ Created {created} new location pages")
-    print(f"   Total pages: {len(existing_files) + created}")
+    # Product snapshot, CSS bundle and hashed asset copies first: pages embed
+    # the products and link to the assets by hash
+    with timer('featured_products'):
+        products, status = build_featured_products()
+    if products:
+        print(f"🛒 Featured products: {len(products['products'])} ({status}, from {products['source']})")
+    else:
+        print("⚠️  No featured products snapshot, pages will load them in the browser")
+    with timer('css_bundle'):
+        bundle = build_css_bundle()
+    print(f"🎨 Stylesheets: {bundle['path']} ({bundle['size'] / 1024:.1f} KB), "
+          f"{len(bundle['critical']) / 1024:.1f} KB critical CSS inlined")
+    with timer('fingerprints'):
+        assets = build_fingerprints()
+    print(f"🔖 Assets: {len(assets.manifest.entries)} fingerprinted "
+          f"({len(assets.created)} new, {len(assets.removed)} removed)\n")
+    
+    if args.incremental:
+        counts = generate_incremental(data, locaties_dir, Manifest(manifest_path('location-pages')), workers, args.force)
+        if counts['kept']:
+            print("   Pass --force to overwrite them with the template")
+    else:
+        generate_missing(data, locaties_dir, workers)
 
 if __name__ == '__main__':
     main()
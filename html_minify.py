@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+HTML minifier for generated pages
+
+minify_html() drops comments and collapses whitespace in a single pass over
+the markup. Text between tags keeps one whitespace character (a newline if
+the run had one), and whitespace next to block-level tags, where browsers
+ignore it, is removed. <pre>, <textarea> and <script> are copied verbatim and
+<style> bodies go through css_bundle.minify_css.
+
+Inline SVGs that occur more than once in a page become <symbol>s in a hidden
+sprite after <body>, and each occurrence keeps its own <svg> element (size,
+stroke, class) with a <use> pointing at the shared symbol. SVGs inside
+<script> are left alone.
+
+Usage:
+    python3 html_minify.py                  # report savings for the location pages
+    python3 html_minify.py page.html ...    # report savings for the given files
+"""
+import argparse
+import glob
+import re
+
+from css_bundle import minify_css
+
+# Bump when the output changes, so the incremental build re-renders pages
+MINIFIER_VERSION = 1
+
+TOKEN_PATTERN = re.compile(
+    r'<!--.*?-->'
+    r'|<(pre|textarea|script|style)\b[^>]*>.*?</\1\s*>'
+    r'|<[^>]+>',
+    re.DOTALL | re.IGNORECASE,
+)
+TAG_NAME_PATTERN = re.compile(r'</?([a-zA-Z][a-zA-Z0-9-]*)')
+STYLE_PATTERN = re.compile(r'(<style\b[^>]*>)(.*?)(</style\s*>)', re.DOTALL | re.IGNORECASE)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Tags around which whitespace is never rendered
+BLOCK_TAGS = frozenset('''
+    html head body title meta link base style script noscript template
+    header footer main nav section article aside div p hr br blockquote address
+    h1 h2 h3 h4 h5 h6 ul ol li dl dt dd figure figcaption picture source
+    table caption thead tbody tfoot tr td th colgroup col form fieldset legend option optgroup
+    path circle ellipse line polyline polygon rect g use defs symbol desc
+'''.split())
+
+# SVGs to sprite; <script> blocks are matched first so their contents are skipped
+SVG_PATTERN = re.compile(r'<script\b.*?</script\s*>|<svg\b([^>]*)>(.*?)</svg>', re.DOTALL | re.IGNORECASE)
+VIEWBOX_PATTERN = re.compile(r'\sviewBox="([^"]*)"')
+BODY_PATTERN = re.compile(r'<body\b[^>]*>', re.IGNORECASE)
+SPRITE_PREFIX = 'sprite-'
+
+
+def _tag_name(tag):
+    match = TAG_NAME_PATTERN.match(tag)
+    return match.group(1).lower() if match else None
+
+
+def _collapse(text, block_before, block_after):
+    def squeeze(match):
+        return '\n' if '\n' in match.group(0) else ' '
+
+    text = WHITESPACE_PATTERN.sub(squeeze, text)
+    if block_before:
+        text = text.lstrip()
+    if block_after:
+        text = text.rstrip()
+    return text
+
+
+def _minify_style(element):
+    return STYLE_PATTERN.sub(lambda m: m.group(1) + minify_css(m.group(2)) + m.group(3), element)
+
+
+def collapse_markup(html):
+    """Strip comments and insignificant whitespace, keep raw-text elements intact"""
+    out = []
+    text = []
+    previous_block = True
+
+    pos = 0
+    for match in TOKEN_PATTERN.finditer(html):
+        token = match.group(0)
+        text.append(html[pos:match.start()])
+        pos = match.end()
+
+        # Comments vanish, the text on both sides becomes one run
+        if token.startswith('<!--') and not token.startswith('<!--['):
+            continue
+
+        name = _tag_name(token)
+        is_block = name in BLOCK_TAGS or token.startswith('<!')
+        out.append(_collapse(''.join(text), previous_block, is_block))
+        text = []
+
+        raw = match.group(1)
+        if raw and raw.lower() == 'style':
+            token = _minify_style(token)
+        out.append(token)
+        previous_block = is_block
+
+    text.append(html[pos:])
+    out.append(_collapse(''.join(text), previous_block, True))
+    return ''.join(out)
+
+
+def sprite_svgs(html):
+    """Move SVGs that occur more than once into a <symbol> sprite"""
+    counts = {}
+    for match in SVG_PATTERN.finditer(html):
+        attrs, inner = match.groups()
+        if attrs is None or 'id=' in inner:
+            continue
+        viewbox = VIEWBOX_PATTERN.search(attrs)
+        key = (viewbox.group(1) if viewbox else None, inner)
+        counts[key] = counts.get(key, 0) + 1
+
+    symbols = {}
+    for (viewbox, inner), count in counts.items():
+        if count < 2:
+            continue
+        symbol_id = f'{SPRITE_PREFIX}{len(symbols) + 1}'
+        use = f'<use href="#{symbol_id}"></use>'
+        viewbox_attr = f' viewBox="{viewbox}"' if viewbox else ''
+        symbol = f'<symbol id="{symbol_id}"{viewbox_attr}>{inner}</symbol>'
+        # Only worth it when the shared copy is smaller than the repeats
+        if len(symbol) + count * len(use) < count * len(inner):
+            symbols[(viewbox, inner)] = (symbol_id, symbol, use)
+
+    body = BODY_PATTERN.search(html)
+    if not symbols or not body:
+        return html
+
+    def replace(match):
+        attrs, inner = match.groups()
+        if attrs is None:
+            return match.group(0)
+        viewbox = VIEWBOX_PATTERN.search(attrs)
+        entry = symbols.get((viewbox.group(1) if viewbox else None, inner))
+        if entry is None:
+            return match.group(0)
+        return f'<svg{attrs}>{entry[2]}</svg>'
+
+    sprite = ('<svg xmlns="http://www.w3.org/2000/svg" aria-hidden="true" style="display:none">'
+              + ''.join(symbol for _, symbol, _ in symbols.values()) + '</svg>')
+    head, rest = html[:body.end()], html[body.end():]
+    return head + sprite + SVG_PATTERN.sub(replace, rest)
+
+
+def minify_html(html):
+    return sprite_svgs(collapse_markup(html))
+
+
+def minify_html_bytes(data):
+    return minify_html(data.decode('utf-8')).encode('utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report what minification saves on HTML files')
+    parser.add_argument('paths', nargs='*', help='HTML files (default: every location page)')
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(glob.glob('public/locaties/*/index.html'))
+    before = after = 0
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        minified = minify_html_bytes(data)
+        before += len(data)
+        after += len(minified)
+        if args.paths:
+            print(f"✓ {path}: {len(data) / 1024:.1f} KB -> {len(minified) / 1024:.1f} KB")
+
+    if before:
+        print(f"\n📊 {len(paths)} files: {before / 1024:.0f} KB -> {after / 1024:.0f} KB "
+              f"({1 - after / before:.0%} smaller)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Responsive derivatives for the images in public/images/site
+
+Every JPEG/PNG is resized to the WIDTHS below that are smaller than the
+original (plus the original width) and encoded as AVIF, WebP and JPEG into
+public/images/responsive/<name>-<ext>-<width>.<format>; the source extension
+keeps hero.jpg and hero.png apart. Favicons and logos are served as they are
+and not encoded (SKIP_PREFIXES). Sources are processed in a
+process pool; the .build/images.json manifest records the source hash and
+encoder settings, so an image is only re-encoded when it or the settings
+change.
+
+The same manifest feeds the location template: picture_sources() and
+img_attributes() turn it into <source> elements and srcset/sizes/width/height
+attributes.
+
+Pillow is only needed to encode (pip install Pillow); AVIF is skipped when
+the installed Pillow cannot write it.
+
+Usage:
+    python3 image_pipeline.py            # encode new and changed images
+    python3 image_pipeline.py --force    # re-encode everything
+    python3 image_pipeline.py --jobs 4
+"""
+import argparse
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from build_manifest import Manifest, hash_file, hash_json, manifest_path, write_atomic
+from fingerprint import HASHED_NAME_PATTERN
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    Image = None
+
+SOURCE_DIR = 'public/images/site'
+OUTPUT_DIR = 'public/images/responsive'
+URL_PREFIX = '/Tafel-Totaal/images/responsive'
+
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+# Small UI images used at one size, matched case-insensitively
+SKIP_PREFIXES = ('favicon', 'logo')
+WIDTHS = (320, 480, 768, 1024, 1600)
+
+# Encoder settings per output format, in <picture> preference order
+FORMATS = {
+    'avif': {'quality': 50},
+    'webp': {'quality': 75, 'method': 6},
+    'jpeg': {'quality': 80, 'optimize': True, 'progressive': True},
+}
+EXTENSIONS = {'avif': 'avif', 'webp': 'webp', 'jpeg': 'jpg'}
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+
+MANIFEST_NAME = 'images'
+# Bumped when derivative file names change, so every image is re-encoded
+NAMING_VERSION = 2
+
+
+def supported_formats():
+    """Output formats the installed Pillow can write"""
+    return [fmt for fmt in FORMATS if fmt == 'jpeg' or features.check(fmt)]
+
+
+def derivative_widths(width):
+    """Target widths for a source: every WIDTHS step below it, plus its own width"""
+    return [w for w in WIDTHS if w < width] + [width]
+
+
+def settings_hash(formats):
+    return hash_json({'widths': WIDTHS, 'formats': {fmt: FORMATS[fmt] for fmt in formats},
+                      'naming': NAMING_VERSION})
+
+
+def encode(image, fmt):
+    """Encode a PIL image to bytes"""
+    if fmt == 'jpeg' and image.mode == 'RGBA':
+        # JPEG has no alpha channel, flatten onto the white page background
+        flattened = Image.new('RGB', image.size, (255, 255, 255))
+        flattened.paste(image, mask=image.getchannel('A'))
+        image = flattened
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt.upper(), **FORMATS[fmt])
+    return buffer.getvalue()
+
+
+def build_derivatives(job):
+    """Resize and encode one source image; runs in a worker process
+
+    Returns the manifest record: source size and, per format, a list of
+    [width, filename, bytes].
+    """
+    source_path, output_dir, formats = job
+    stem, ext = os.path.splitext(os.path.basename(source_path))
+    prefix = f'{stem}-{ext[1:].lower()}'
+
+    with Image.open(source_path) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+        width, height = image.size
+
+        variants = {fmt: [] for fmt in formats}
+        for target in derivative_widths(width):
+            if target == width:
+                resized = image
+            else:
+                resized = image.resize((target, round(height * target / width)), Image.LANCZOS)
+            for fmt in formats:
+                filename = f'{prefix}-{target}.{EXTENSIONS[fmt]}'
+                data = encode(resized, fmt)
+                write_atomic(os.path.join(output_dir, filename), data)
+                variants[fmt].append([target, filename, len(data)])
+
+    return {'width': width, 'height': height, 'variants': variants}
+
+
+def find_sources(source_dir=SOURCE_DIR):
+    # fingerprint.py's name.<hash>.ext copies sit next to the sources, skip them
+    return sorted(f for f in os.listdir(source_dir)
+                  if f.lower().endswith(SOURCE_EXTENSIONS) and not f.lower().startswith(SKIP_PREFIXES)
+                  and not HASHED_NAME_PATTERN.search(f))
+
+
+def run_pipeline(manifest, source_dir=SOURCE_DIR, output_dir=OUTPUT_DIR, workers=1, force=False):
+    """Encode new and changed sources, return (encoded names, cached names)"""
+    os.makedirs(output_dir, exist_ok=True)
+    formats = supported_formats()
+    settings = settings_hash(formats)
+
+    jobs = []
+    pending = []
+    cached = []
+    for filename in find_sources(source_dir):
+        source_path = os.path.join(source_dir, filename)
+        source_hash = hash_file(source_path)
+        entry = manifest.get(filename)
+        if (not force and entry and entry['hash'] == source_hash and entry['settings'] == settings
+                and all(os.path.exists(os.path.join(output_dir, name))
+                        for variants in entry['variants'].values() for _, name, _ in variants)):
+            cached.append(filename)
+            continue
+        jobs.append((source_path, output_dir, formats))
+        pending.append((filename, source_hash))
+
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            records = list(pool.map(build_derivatives, jobs))
+    else:
+        records = [build_derivatives(job) for job in jobs]
+
+    for (filename, source_hash), record in zip(pending, records):
+        manifest.set(filename, hash=source_hash, settings=settings,
+                     original_size=os.path.getsize(os.path.join(source_dir, filename)), **record)
+
+    manifest.prune(set(find_sources(source_dir)))
+    manifest.save()
+
+    # Drop derivatives no record refers to any more
+    referenced = {name for entry in manifest.entries.values()
+                  for variants in entry['variants'].values() for _, name, _ in variants}
+    for filename in os.listdir(output_dir):
+        if filename not in referenced:
+            os.remove(os.path.join(output_dir, filename))
+    return [filename for filename, _ in pending], cached
+
+
+def load_responsive_images():
+    """Manifest records by source filename, empty if the pipeline has not run"""
+    return Manifest(manifest_path(MANIFEST_NAME)).entries
+
+
+def _srcset(variants):
+    return ', '.join(f'{URL_PREFIX}/{filename} {width}w' for width, filename, _ in variants)
+
+
+def picture_sources(record, sizes, indent=''):
+    """<source> elements for the modern formats, best first"""
+    if not record:
+        return ''
+    return '\n'.join(
+        f'{indent}<source type="{MIME_TYPES[fmt]}" srcset="{_srcset(record["variants"][fmt])}" sizes="{sizes}">'
+        for fmt in FORMATS if fmt != 'jpeg' and fmt in record['variants']
+    )
+
+
+def img_attributes(record, sizes):
+    """JPEG srcset/sizes plus intrinsic width/height for the fallback <img>"""
+    if not record:
+        return ''
+    return (f' srcset="{_srcset(record["variants"]["jpeg"])}" sizes="{sizes}"'
+            f' width="{record["width"]}" height="{record["height"]}"')
+
+
+def report(manifest, names):
+    """Per-image size of the smallest derivative versus the original"""
+    for filename in names:
+        entry = manifest.get(filename)
+        smallest = min((v for variants in entry['variants'].values() for v in variants),
+                       key=lambda v: (v[0], v[2]))
+        print(f"✓ {filename}: {entry['original_size'] / 1024:.0f} KB -> "
+              f"{smallest[1]} {smallest[2] / 1024:.0f} KB "
+              f"({entry['original_size'] / smallest[2]:.0f}x smaller)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build responsive image derivatives')
+    parser.add_argument('--force', action='store_true', help='re-encode every image')
+    parser.add_argument('--jobs', '-j', type=int, default=0, metavar='N',
+                        help='encode in N worker processes (0 = one per CPU)')
+    args = parser.parse_args()
+
+    if Image is None:
+        print("❌ Pillow is not installed: pip install Pillow")
+        return
+
+    workers = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    missing = [fmt for fmt in FORMATS if fmt not in supported_formats()]
+    if missing:
+        print(f"⚠️  This Pillow cannot write {', '.join(missing)}, skipping")
+
+    manifest = Manifest(manifest_path(MANIFEST_NAME))
+    encoded, cached = run_pipeline(manifest, workers=workers, force=args.force)
+
+    report(manifest, encoded)
+    print(f"\n✅ Encoded {len(encoded)} images, {len(cached)} unchanged (cached)")
+    if encoded:
+        print("   Run generate_missing_location_pages.py --incremental to pick up new srcsets")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,51 +5,64 @@ Import locations from CSV file and generate all-locations.json
 Usage:
     1. Place your CSV file in import-data/locations.csv
     2. Run: python3 import_locations_from_csv.py
+       (--profile adds a cProfile/tracemalloc report, see build_metrics.py)
 """
+import argparse
 import csv
 import json
-import re
 import os
-from collections import defaultdict
+import shutil
 from datetime import datetime
+from operator import itemgetter
 
-def slugify(name):
-    """Convert name to URL-friendly slug"""
-    slug = name.lower()
-    
-    # Replace special characters
-    replacements = {
-        'à': 'a', 'á': 'a', 'â': 'a', 'ä': 'a',
-        'è': 'e', 'é': 'e', 'ê': 'e', 'ë': 'e',
-        'ï': 'i', 'î': 'i', 'ì': 'i', 'í': 'i',
-        'ô': 'o', 'ö': 'o', 'ò': 'o', 'ó': 'o',
-        'ü': 'u', 'û': 'u', 'ù': 'u', 'ú': 'u',
-        'ç': 'c', 'ñ': 'n'
-    }
-    
-    for old, new in replacements.items():
-        slug = slug.replace(old, new)
-    
-    # Replace non-alphanumeric with hyphens
-    slug = re.sub(r'[^a-z0-9]+', '-', slug)
-    slug = slug.strip('-')
-    
-    return slug
+from build_manifest import BUILD_DIR, write_atomic, write_if_changed
+from build_metrics import add_profile_argument, count, start_run, timer
+from location_search import EXPORT_DIR, export_index
+from slugs import slugify
 
-def parse_csv(csv_path):
-    """Parse CSV file and return structured data"""
-    west_vl = []
-    oost_vl = []
-    
-    # Map hoofdgemeente names to slugs
-    slug_map = {}
-    
-    # Group locations by postal code to merge duplicates
-    locations_by_key = defaultdict(lambda: {'postal_codes': []})
-    
-    print(f"📖 Reading CSV file: {csv_path}")
+# Accepted header names per column, first match wins
+COLUMNS = {
+    'province': ('Provincie', 'provincie', 'Province'),
+    'postal_code': ('Postcode', 'postcode', 'PostalCode'),
+    'name': ('Naam', 'naam', 'Name', 'plaats', 'Plaats'),
+    'type': ('Type', 'type'),
+    'parent_group': ('Hoofdgemeente', 'hoofdgemeente', 'MainMunicipality'),
+}
+
+# Provinces that are always present in the output, in this order
+PROVINCES = ('west-vlaanderen', 'oost-vlaanderen')
+
+CSV_PATH = 'import-data/locations.csv'
+OUTPUT_PATH = 'public/data/all-locations.json'
+SHARD_DIR = 'public/data/locations'
+BACKUP_DIR = os.path.join(BUILD_DIR, 'backups')
+
+# Merged municipalities whose page, links and search entry kept the slug of
+# the old municipality; every other group is slugified in full
+PARENT_SLUGS = {
+    'BEVEREN-KRUIBEKE-ZWIJNDRECHT': 'beveren',
+    'MERELBEKE-MELLE': 'merelbeke',
+    'NAZARETH-DE PINTE': 'nazareth',
+}
+
+def resolve_columns(fieldnames):
+    """Map our column names to the header names used in this CSV"""
+    present = set(fieldnames or [])
+    columns = {}
+    for column, aliases in COLUMNS.items():
+        columns[column] = next((alias for alias in aliases if alias in present), None)
+    return columns
+
+def iter_csv_rows(csv_path):
+    """Stream (province, postal_code, name, type, parent_group) tuples from the CSV
     
-    with open(csv_path, 'r', encoding='utf-8') as f:
+    Rows are read one at a time, so memory does not grow with the file size.
+    Incomplete rows are reported and skipped.
+    """
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        count('files_read')
+        count('bytes_read', os.fstat(f.fileno()).st_size)
+        
         # Try tab-separated first
         sample = f.read(1024)
         f.seek(0)
@@ -59,78 +72,189 @@ def parse_csv(csv_path):
         else:
             reader = csv.DictReader(f)
         
+        columns = resolve_columns(reader.fieldnames)
+        keys = [columns[column] for column in COLUMNS]
+        
         for row in reader:
-            # Handle different possible column names
-            province = row.get('Provincie') or row.get('provincie') or row.get('Province')
-            postal_code = row.get('Postcode') or row.get('postcode') or row.get('PostalCode')
-            name = row.get('Naam') or row.get('naam') or row.get('Name') or row.get('plaats') or row.get('Plaats')
-            loc_type = row.get('Type') or row.get('type')
-            parent_group = row.get('Hoofdgemeente') or row.get('hoofdgemeente') or row.get('MainMunicipality')
+            values = tuple(row.get(key) if key else None for key in keys)
             
-            if not all([province, postal_code, name, loc_type, parent_group]):
+            if not all(values):
                 print(f"⚠️  Skipping incomplete row: {row}")
                 continue
             
-            # Determine slug and parent
-            if loc_type == 'Hoofdgemeente':
-                slug = slugify(name)
-                slug_map[parent_group] = slug
-                parent = None
-            else:
-                # Deelgemeente - find parent slug
-                parent_slug = slug_map.get(parent_group)
-                if not parent_slug:
-                    # Try to derive from parent_group name
-                    parent_slug = slugify(parent_group.split('-')[0])
-                    slug_map[parent_group] = parent_slug
-                
-                slug = parent_slug
-                parent = parent_group.title()
-            
-            # Create unique key for this location
-            key = f"{province}|{slug}|{name}"
-            
-            # Add or update location
-            if key not in locations_by_key:
-                locations_by_key[key] = {
-                    'province': province,
-                    'name': name,
-                    'slug': slug,
-                    'parent': parent,
-                    'postal_codes': []
-                }
+            yield values
+
+def group_locations(rows):
+    """Merge rows into one entry per (province, slug, name)
+    
+    Postal codes are collected in sets, so each row costs O(1) no matter how
+    many postcodes a municipality has. Memory is bounded by the number of
+    distinct locations, not by the number of rows.
+    """
+    # Map hoofdgemeente names to slugs
+    slug_map = {}
+    
+    # key -> (province, name, slug, parent, postal code set)
+    locations_by_key = {}
+    
+    for province, postal_code, name, loc_type, parent_group in rows:
+        # Determine slug and parent
+        if loc_type == 'Hoofdgemeente':
+            slug = PARENT_SLUGS.get(parent_group) or slugify(name)
+            slug_map[parent_group] = slug
+            parent = None
+        else:
+            # Deelgemeente - find parent slug
+            parent_slug = slug_map.get(parent_group)
+            if not parent_slug:
+                # Hoofdgemeente row not seen (yet): slug of the full parent name,
+                # the first word alone would merge all "Sint-..." municipalities
+                parent_slug = PARENT_SLUGS.get(parent_group) or slugify(parent_group)
+                slug_map[parent_group] = parent_slug
             
-            # Add postal code if not already present
-            if postal_code not in locations_by_key[key]['postal_codes']:
-                locations_by_key[key]['postal_codes'].append(postal_code)
+            slug = parent_slug
+            parent = parent_group.title()
+        
+        key = (province, slug, name)
+        entry = locations_by_key.get(key)
+        if entry is None:
+            entry = locations_by_key[key] = (province, name, slug, parent, set())
+        entry[4].add(postal_code)
     
-    # Convert to lists
-    for key, loc in locations_by_key.items():
+    return locations_by_key.values()
+
+def build_province_lists(locations):
+    """Split grouped locations per province, each list sorted by name"""
+    provinces = {key: [] for key in PROVINCES}
+    
+    for province, name, slug, parent, postal_codes in locations:
         location = {
-            'name': loc['name'],
-            'slug': loc['slug'],
-            'postal_codes': sorted(loc['postal_codes']),
-            'parent': loc['parent']
+            'name': name,
+            'slug': slug,
+            'postal_codes': sorted(postal_codes),
+            'parent': parent
         }
+        provinces.setdefault(slugify(province), []).append(location)
+    
+    # Sort by name (stable, so duplicates keep CSV order)
+    for province_list in provinces.values():
+        province_list.sort(key=itemgetter('name'))
+    
+    return provinces
+
+def parse_csv(csv_path):
+    """Parse CSV file and return structured data"""
+    print(f"📖 Reading CSV file: {csv_path}")
+    
+    with timer('parse_csv'):
+        return build_province_lists(group_locations(iter_csv_rows(csv_path)))
+
+def build_location_shards(data):
+    """Group deelgemeenten per hoofdgemeente slug in a single pass
+    
+    Returns {slug: [{name, postal_codes}, ...]} with an entry for every slug
+    in the dataset, so each location page can fetch exactly its own list.
+    """
+    shards = {}
+    for locations in data.values():
+        for location in locations:
+            children = shards.setdefault(location['slug'], [])
+            if location['parent'] is not None:
+                children.append({
+                    'name': location['name'],
+                    'postal_codes': location['postal_codes'],
+                })
+    return shards
+
+def write_location_shards(data, shard_dir, full_size):
+    """Write one minified JSON file per hoofdgemeente and report the savings"""
+    os.makedirs(shard_dir, exist_ok=True)
+    shards = build_location_shards(data)
+    
+    written = 0
+    sizes = []
+    for slug, children in shards.items():
+        content = json.dumps(children, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        sizes.append(len(content))
         
-        if loc['province'] == 'West-Vlaanderen':
-            west_vl.append(location)
-        else:
-            oost_vl.append(location)
+        if write_if_changed(os.path.join(shard_dir, f'{slug}.json'), content):
+            written += 1
     
-    # Sort by name
-    west_vl.sort(key=lambda x: x['name'])
-    oost_vl.sort(key=lambda x: x['name'])
+    # Remove shards for slugs that are no longer in the dataset
+    removed = 0
+    for filename in os.listdir(shard_dir):
+        if filename.endswith('.json') and filename[:-5] not in shards:
+            os.remove(os.path.join(shard_dir, filename))
+            removed += 1
     
-    return {
-        'west-vlaanderen': west_vl,
-        'oost-vlaanderen': oost_vl
-    }
+    average = sum(sizes) / len(sizes) if sizes else 0
+    print(f"\n🧩 Location shards: {len(shards)} in {shard_dir} ({written} written, {removed} removed)")
+    print(f"   Per page: {average:.0f} bytes on average (max {max(sizes, default=0)}) "
+          f"instead of {full_size} bytes")
+    if full_size:
+        print(f"   Saved per page view: {full_size - average:.0f} bytes ({1 - average / full_size:.1%})")
+
+def backup_file(path, backup_dir):
+    """Keep the current version of `path` in backup_dir, outside public/
+    
+    The backup is a hard link to the existing inode, so no bytes are copied;
+    the new version is then written to a fresh inode with os.replace.
+    Falls back to a copy when the backup dir is on another filesystem.
+    """
+    os.makedirs(backup_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_path = os.path.join(backup_dir, f'{os.path.basename(path)}.{stamp}')
+    
+    try:
+        os.link(path, backup_path)
+    except FileExistsError:
+        pass
+    except OSError:
+        shutil.copy2(path, backup_path)
+    return backup_path
+
+def write_outputs(data, output_path=OUTPUT_PATH, shard_dir=SHARD_DIR, backup_dir=BACKUP_DIR):
+    """Write all-locations.json, the per-slug shards and the search index
+    
+    Files that already hold the right content are left alone.
+    """
+    with timer('serialize_json'):
+        content = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    
+    try:
+        with open(output_path, 'rb') as f:
+            unchanged = f.read() == content
+    except FileNotFoundError:
+        unchanged = None
+    
+    if unchanged:
+        print(f"\n✓ {output_path} is already up to date, not rewritten")
+    else:
+        # Backup existing JSON
+        if unchanged is not None:
+            print(f"💾 Creating backup: {backup_file(output_path, backup_dir)}")
+        
+        # Write JSON
+        print(f"\n📝 Writing JSON to: {output_path}")
+        with timer('write_json'):
+            write_atomic(output_path, content)
+    
+    with timer('location_shards'):
+        write_location_shards(data, shard_dir, os.path.getsize(output_path))
+    
+    # Prefix search index for the locaties page
+    with timer('search_index'):
+        sizes = export_index(data)
+    print(f"🔎 Search index: {len(sizes)} buckets in {EXPORT_DIR} (largest {max(sizes.values(), default=0)} bytes)")
 
 def main():
-    csv_path = 'import-data/locations.csv'
-    output_path = 'public/data/all-locations.json'
-    backup_path = f'public/data/all-locations.json.backup.{datetime.now().strftime("%Y%m%d_%H%M%S")}'
+    parser = argparse.ArgumentParser(description='Import locations from CSV into all-locations.json')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    start_run('import_locations_from_csv', profile=args.profile)
+    
+    csv_path = CSV_PATH
+    output_path = OUTPUT_PATH
     
     # Check if CSV exists
     if not os.path.exists(csv_path):
@@ -139,11 +263,6 @@ def main():
         print(f"   Format: Provincie, Postcode, Naam, Type, Hoofdgemeente")
         return
     
-    # Backup existing JSON
-    if os.path.exists(output_path):
-        print(f"💾 Creating backup: {backup_path}")
-        os.system(f'cp "{output_path}" "{backup_path}"')
-    
     # Parse CSV
     try:
         data = parse_csv(csv_path)
@@ -151,19 +270,15 @@ def main():
         print(f"❌ Error parsing CSV: {e}")
         return
     
-    # Write JSON
-    print(f"\n📝 Writing JSON to: {output_path}")
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    write_outputs(data, output_path)
     
     # Stats
-    west_count = len(data['west-vlaanderen'])
-    oost_count = len(data['oost-vlaanderen'])
-    total = west_count + oost_count
+    total = sum(len(locations) for locations in data.values())
     
     print(f"\n✅ Import complete!")
-    print(f"   West-Vlaanderen: {west_count} locations")
-    print(f"   Oost-Vlaanderen: {oost_count} locations")
+    for province, locations in data.items():
+        label = '-'.join(part.capitalize() for part in province.split('-'))
+        print(f"   {label}: {len(locations)} locations")
     print(f"   Total: {total} locations")
     print(f"\n💡 Next steps:")
     print(f"   1. Review the generated JSON: {output_path}")
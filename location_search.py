@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Prefix search index over municipality and deelgemeente names
+
+Every location is indexed under its accent-folded slug, under each later word
+of that slug (so "heist" finds Knokke-Heist) and under its postcodes. The keys
+are kept in one sorted array, so a prefix query is a bisect plus a short scan.
+
+The same structure is exported to public/data/location-search/, split into
+one small bucket per first character (first two digits for postcodes), so the
+locaties page only downloads the bucket for what the visitor typed and runs
+the identical lookup there.
+
+Usage:
+    python3 location_search.py sint-          # top matches for a prefix
+    python3 location_search.py --export       # write the JSON buckets
+"""
+import argparse
+import json
+import os
+import re
+from bisect import bisect_left
+
+from build_manifest import write_if_changed
+from slugs import slugify
+
+EXPORT_DIR = 'public/data/location-search'
+INDEX_VERSION = 1
+
+
+def fold_query(query):
+    """Fold a search query the same way names are folded into keys
+
+    A trailing separator is kept, so "sint-" only matches names that continue
+    with another word, not "Sinterklaas".
+    """
+    folded = slugify(query)
+    if folded and re.search(r'[^0-9A-Za-z]$', query.strip()):
+        folded += '-'
+    return folded
+
+
+def bucket_name(key):
+    """Bucket a key lands in: its first letter, or first two digits of a postcode"""
+    return key[:2] if key[0].isdigit() else key[0]
+
+
+def index_keys(location):
+    """Search keys for one location: slug words and postcodes"""
+    folded = slugify(location['name'])
+    keys = [folded]
+    for match in re.finditer('-', folded):
+        keys.append(folded[match.end():])
+    keys.extend(location['postal_codes'])
+    return keys
+
+
+class PrefixIndex:
+    """Sorted-array prefix index over all locations"""
+
+    def __init__(self, entries, keys, targets):
+        self.entries = entries   # [name, slug, parent]
+        self.keys = keys         # sorted search keys
+        self.targets = targets   # entry index for each key
+
+    @classmethod
+    def from_locations(cls, data):
+        entries = []
+        pairs = []
+        for locations in data.values():
+            for location in locations:
+                entry_id = len(entries)
+                entries.append([location['name'], location['slug'], location['parent']])
+                for key in set(index_keys(location)):
+                    pairs.append((key, entry_id))
+
+        pairs.sort()
+        return cls(entries, [key for key, _ in pairs], [entry_id for _, entry_id in pairs])
+
+    def search(self, query, limit=10):
+        """Return up to `limit` matching entries as (name, slug, parent)"""
+        prefix = fold_query(query)
+        if not prefix:
+            return []
+
+        keys = self.keys
+        seen = set()
+        results = []
+        i = bisect_left(keys, prefix)
+        while i < len(keys) and keys[i].startswith(prefix):
+            entry_id = self.targets[i]
+            if entry_id not in seen:
+                seen.add(entry_id)
+                results.append(tuple(self.entries[entry_id]))
+                if len(results) >= limit:
+                    break
+            i += 1
+        return results
+
+    def buckets(self):
+        """Split the index with bucket_name(), each bucket self-contained"""
+        buckets = {}
+        for key, entry_id in zip(self.keys, self.targets):
+            bucket = buckets.setdefault(bucket_name(key), {'keys': [], 'targets': [], 'entries': [], 'ids': {}})
+            local_id = bucket['ids'].get(entry_id)
+            if local_id is None:
+                local_id = bucket['ids'][entry_id] = len(bucket['entries'])
+                name, slug, _ = self.entries[entry_id]
+                bucket['entries'].append([name, slug])
+            bucket['keys'].append(key)
+            bucket['targets'].append(local_id)
+
+        for bucket in buckets.values():
+            del bucket['ids']
+            bucket['version'] = INDEX_VERSION
+        return buckets
+
+
+def export_index(data, export_dir=EXPORT_DIR):
+    """Write one minified file per bucket, return the bucket sizes"""
+    os.makedirs(export_dir, exist_ok=True)
+    buckets = PrefixIndex.from_locations(data).buckets()
+
+    sizes = {}
+    for name, bucket in buckets.items():
+        content = json.dumps(bucket, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        sizes[name] = len(content)
+
+        write_if_changed(os.path.join(export_dir, f'{name}.json'), content)
+
+    # Remove buckets that no longer have any keys
+    for filename in os.listdir(export_dir):
+        if filename.endswith('.json') and filename[:-5] not in buckets:
+            os.remove(os.path.join(export_dir, filename))
+
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prefix search over all locations')
+    parser.add_argument('query', nargs='?', help='name or postcode prefix')
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--export', action='store_true', help=f'write the buckets to {EXPORT_DIR}')
+    args = parser.parse_args()
+
+    with open('public/data/all-locations.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if args.export:
+        sizes = export_index(data)
+        print(f"✓ Wrote {len(sizes)} search buckets to {EXPORT_DIR} "
+              f"({sum(sizes.values())} bytes, largest {max(sizes.values(), default=0)})")
+
+    if args.query:
+        for name, slug, parent in PrefixIndex.from_locations(data).search(args.query, args.limit):
+            print(f"{name}\t{slug}\t{parent or '-'}")
+
+
+if __name__ == '__main__':
+    main()
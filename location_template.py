@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Precompiled location page template
+
+templates/location-page.html holds the page markup with two kinds of markers:
+
+    {{ name }}              per-location slot, filled in at render time
+    {{> header }}           component from public/components/header.html,
+                            spliced in when the template is compiled
+    {{> hero-sources }}     responsive image markup from image_pipeline.py,
+    {{> hero-attrs }}       also spliced in at compile time (empty until the
+                            pipeline has run)
+    {{> stylesheets }}      critical CSS and the bundle link from css_bundle.py,
+                            or the plain stylesheet links until it has run
+    {{> featured-products }}
+                            product cards from the featured_products.py
+                            snapshot, or a loading placeholder without one
+    {{#script}} ... {{/script}}
+                            named block; the marker lines are dropped from the
+                            output but the block body can be fetched on its own
+                            so the page-fixing scripts reuse the same markup,
+                            and a page can be rendered without it
+
+Asset references in the template and components are pointed at the
+name.<hash>.ext copies made by fingerprint.py before compiling.
+
+The template is compiled once into static UTF-8 chunks and slot positions, so
+rendering a page is a single b''.join over precomputed bytes. The chunks are
+minified once per template variant by html_minify.py. Components are
+read once per process and become part of the static chunks; their hashes are
+kept on the compiled template so the incremental build can tell which pages
+a component change affects.
+"""
+import copy
+import html
+import os
+import re
+from functools import lru_cache
+
+from build_manifest import Manifest, hash_bytes, manifest_path
+from css_bundle import build_bundle, head_markup, load_bundle
+from featured_products import load_cache as load_products_snapshot, load_featured_products, product_cards
+from fingerprint import (MANIFEST_NAME as ASSETS_MANIFEST, Fingerprinter, find_references,
+                         load_asset_map, rewrite_references, update_netlify_headers)
+from html_minify import minify_html, minify_html_bytes
+from image_pipeline import img_attributes, load_responsive_images, picture_sources
+
+TEMPLATE_PATH = 'templates/location-page.html'
+COMPONENTS_DIR = 'public/components'
+
+# Images in the template with responsive variants: component prefix ->
+# (file in public/images/site, sizes attribute, indent of the <source> lines)
+TEMPLATE_IMAGES = {
+    'hero': ('hero-table-setting.jpg', '(min-width: 1024px) 50vw, 100vw', ' ' * 10),
+}
+
+# Stylesheets of the location page, in link order, bundled by css_bundle.py
+CSS_BUNDLE = 'location'
+STYLESHEETS = (
+    '/css/variables.css',
+    '/css/base.css',
+    '/css/components.css',
+    '/css/utilities.css',
+    '/css/pages/location-detail.css',
+    '/css/pages/location-hero-new.css',
+)
+STYLESHEET_PREFIX = '/Tafel-Totaal'
+
+PROVINCE_NAMES = {
+    'west': 'West-Vlaanderen',
+    'oost': 'Oost-Vlaanderen',
+}
+
+SLOTS = ('name', 'slug', 'name_upper', 'province', 'postal_codes', 'submunicipalities')
+
+SLOT_PATTERN = re.compile(r'\{\{\s*([a-z_]+)\s*\}\}')
+# Stand-in for slot i while the static chunks are minified (private use chars)
+SLOT_MARKER = '\ue000{}\ue001'
+SLOT_MARKER_PATTERN = re.compile(r'\ue000(\d+)\ue001')
+COMPONENT_PATTERN = re.compile(r'\{\{>\s*([a-z_-]+)\s*\}\}')
+BLOCK_MARKER_PATTERN = re.compile(r'^[ \t]*\{\{([#/])([a-z_]+)\}\}[ \t]*\n', re.MULTILINE)
+
+PRODUCTS_PLACEHOLDER = '        <div class="loading-placeholder">Producten laden...</div>'
+
+SUBMUNICIPALITY_CARD = """\
+          <div class="sub-municipality-card">
+            <span class="sub-municipality-name">{name}</span>
+            <span class="sub-municipality-zip">{postal_codes}</span>
+          </div>"""
+
+
+class CompiledTemplate:
+    """Template split into static byte chunks and slot names"""
+
+    def __init__(self, source, components=None):
+        self.version = hash_bytes(source.encode('utf-8'))[:12]
+        self.blocks = {}
+        self.components = {}
+        self._loaded_components = components
+        self._variants = {}
+        self._minified = None
+
+        # Strip block markers, remembering where each block starts and ends
+        open_blocks = {}
+        pieces = []
+        pos = 0
+        length = 0
+        for match in BLOCK_MARKER_PATTERN.finditer(source):
+            text = source[pos:match.start()]
+            pieces.append(text)
+            length += len(text)
+            pos = match.end()
+
+            kind, name = match.groups()
+            if kind == '#':
+                open_blocks[name] = length
+            elif name in open_blocks:
+                self.blocks[name] = (open_blocks.pop(name), length)
+            else:
+                raise ValueError(f'Closing block without opening: {name}')
+        pieces.append(source[pos:])
+
+        if open_blocks:
+            raise ValueError(f"Unclosed template blocks: {', '.join(open_blocks)}")
+
+        self.source = ''.join(pieces)
+
+        # Component markup is static text, so it is joined into the chunks
+        # around it rather than scanned for slots
+        self.chunks = []
+        self.slots = []
+        pending = []
+        for i, part in enumerate(COMPONENT_PATTERN.split(self.source)):
+            if i % 2:
+                pending.append(self._component(part, components))
+                continue
+
+            parts = SLOT_PATTERN.split(part)
+            unknown = set(parts[1::2]) - set(SLOTS)
+            if unknown:
+                raise ValueError(f"Unknown template slots: {', '.join(sorted(unknown))}")
+
+            pending.append(parts[0])
+            for slot, text in zip(parts[1::2], parts[2::2]):
+                self.chunks.append(''.join(pending).encode('utf-8'))
+                self.slots.append(slot)
+                pending = [text]
+        self.chunks.append(''.join(pending).encode('utf-8'))
+
+    def _component(self, name, components):
+        if components is None or name not in components:
+            raise ValueError(f'Template uses component {name} but it was not loaded')
+        html = components[name]
+        self.components[name] = hash_bytes(html.encode('utf-8'))
+        return html
+
+    def without(self, *names):
+        """Variant of the template with the named blocks left out, compiled once"""
+        key = frozenset(names)
+        variant = self._variants.get(key)
+        if variant is None:
+            pieces = []
+            pos = 0
+            for start, end in sorted(self.blocks[name] for name in key):
+                if start >= pos:
+                    pieces.append(self.source[pos:start])
+                pos = max(pos, end)
+            pieces.append(self.source[pos:])
+            variant = self._variants[key] = CompiledTemplate(''.join(pieces), self._loaded_components)
+        return variant
+
+    def minified(self):
+        """Variant with minified static chunks, compiled once
+
+        The chunks are minified together with numbered markers in place of
+        the slots, so rendering a page stays a join over precomputed bytes.
+        Slot values are text, or markup the caller minifies itself.
+        """
+        if self._minified is None:
+            marked = ''.join(chunk.decode('utf-8') + (SLOT_MARKER.format(i) if i < len(self.slots) else '')
+                             for i, chunk in enumerate(self.chunks))
+            parts = SLOT_MARKER_PATTERN.split(minify_html(marked))
+            if [int(i) for i in parts[1::2]] != list(range(len(self.slots))):
+                raise ValueError('Minifying the template dropped or reordered a slot')
+
+            variant = copy.copy(self)
+            variant.chunks = [part.encode('utf-8') for part in parts[0::2]]
+            variant._variants = {}
+            variant._minified = variant
+            self._minified = variant
+        return self._minified
+
+    def render_bytes(self, values):
+        """Render with `values` mapping slot name -> bytes"""
+        chunks = self.chunks
+        out = [chunks[0]]
+        for i, slot in enumerate(self.slots, 1):
+            out.append(values[slot])
+            out.append(chunks[i])
+        return b''.join(out)
+
+    def render(self, values):
+        return self.render_bytes(values).decode('utf-8')
+
+    def block(self, name, values=None, omit=()):
+        """Return the body of a named block, rendered if it contains slots
+
+        Blocks nested inside it that are named in `omit` are left out.
+        """
+        start, end = self.blocks[name]
+        pieces = []
+        for inner_start, inner_end in sorted(self.blocks[inner] for inner in omit):
+            if start <= inner_start and inner_end <= end:
+                pieces.append(self.source[start:inner_start])
+                start = inner_end
+        pieces.append(self.source[start:end])
+        body = ''.join(pieces)
+        if values is not None:
+            body = SLOT_PATTERN.sub(lambda m: values[m.group(1)].decode('utf-8'), body)
+        elif SLOT_PATTERN.search(body):
+            raise ValueError(f'Block {name} has slots, pass values to render it')
+        return COMPONENT_PATTERN.sub(lambda m: self._component(m.group(1), self._loaded_components), body)
+
+
+@lru_cache(maxsize=None)
+def load_components(components_dir=COMPONENTS_DIR):
+    """Read every components/*.html once, keyed by file name without .html"""
+    components = {}
+    for filename in sorted(os.listdir(components_dir)):
+        if filename.endswith('.html'):
+            with open(os.path.join(components_dir, filename), 'r', encoding='utf-8') as f:
+                components[filename[:-5]] = f.read().rstrip('\n')
+    return components
+
+
+def image_components():
+    """<source> lines and <img> attributes for every TEMPLATE_IMAGES entry"""
+    records = load_responsive_images()
+    components = {}
+    for prefix, (filename, sizes, indent) in TEMPLATE_IMAGES.items():
+        record = records.get(filename)
+        components[f'{prefix}-sources'] = picture_sources(record, sizes, indent)
+        components[f'{prefix}-attrs'] = img_attributes(record, sizes)
+    return components
+
+
+def stylesheet_component():
+    """Critical CSS plus bundle link, or the separate stylesheet links"""
+    record = load_bundle(CSS_BUNDLE)
+    if record:
+        return head_markup(record)
+    return '\n'.join(f'  <link rel="stylesheet" href="{STYLESHEET_PREFIX}{url}">' for url in STYLESHEETS)
+
+
+def featured_products_component():
+    """Static product cards, or the placeholder the page script fills in"""
+    snapshot = load_products_snapshot()
+    if snapshot and snapshot['products']:
+        return product_cards(snapshot['products'])
+    return PRODUCTS_PLACEHOLDER
+
+
+def generated_components():
+    """Components produced by the build steps rather than read from disk"""
+    components = image_components()
+    components['stylesheets'] = stylesheet_component()
+    components['featured-products'] = featured_products_component()
+    return components
+
+
+@lru_cache(maxsize=None)
+def load_template(path=TEMPLATE_PATH, components_dir=COMPONENTS_DIR):
+    """Compile the template once per process"""
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    components = dict(load_components(components_dir), **generated_components())
+
+    assets = load_asset_map()
+    components = {name: rewrite_references(html, assets) for name, html in components.items()}
+    return CompiledTemplate(rewrite_references(source, assets), components)
+
+
+def build_fingerprints(path=TEMPLATE_PATH, components_dir=COMPONENTS_DIR):
+    """Fingerprint every asset the template and its components reference
+
+    Also regenerates the immutable cache headers in netlify.toml. Run before
+    rendering; the compiled template is reloaded to pick up the new names.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        texts = [f.read()]
+    texts += load_components(components_dir).values()
+    texts += generated_components().values()
+
+    references = set()
+    for text in texts:
+        references |= find_references(text)
+
+    fingerprinter = Fingerprinter(Manifest(manifest_path(ASSETS_MANIFEST)))
+    assets = fingerprinter.run(references)
+    update_netlify_headers(assets.values())
+    load_template.cache_clear()
+    return fingerprinter
+
+
+def build_featured_products():
+    """Refresh the featured products snapshot if it expired
+
+    Returns (snapshot, status) from featured_products.load_featured_products;
+    the compiled template is reloaded so it renders the current cards.
+    """
+    result = load_featured_products()
+    load_template.cache_clear()
+    return result
+
+
+def build_css_bundle(path=TEMPLATE_PATH):
+    """Bundle the page stylesheets with critical CSS for the above-the-fold block
+
+    Run before rendering; the compiled template is reloaded afterwards so it
+    links the new bundle.
+    """
+    placeholder = {slot: b'' for slot in SLOTS}
+    markup = load_template(path).block('above_the_fold', placeholder)
+    record = build_bundle(CSS_BUNDLE, STYLESHEETS, markup)
+    load_template.cache_clear()
+    return record
+
+
+def submunicipalities_html(children):
+    """Static markup for the deelgemeenten list"""
+    return '\n'.join(
+        SUBMUNICIPALITY_CARD.format(name=html.escape(child['name']),
+                                    postal_codes=', '.join(child['postal_codes']))
+        for child in children
+    )
+
+
+def location_values(location, province, children=()):
+    """Encode the per-location slot values once"""
+    name = location['name']
+    return {
+        'name': name.encode('utf-8'),
+        'slug': location['slug'].encode('utf-8'),
+        'name_upper': name.upper().encode('utf-8'),
+        'province': PROVINCE_NAMES[province].encode('utf-8'),
+        'postal_codes': ', '.join(location['postal_codes']).encode('utf-8'),
+        'submunicipalities': submunicipalities_html(children).encode('utf-8'),
+    }
+
+
+def _page_template(template, children):
+    template = template or load_template()
+    if children:
+        return template.without('submunicipalities_script')
+    return template.without('submunicipalities', 'submunicipalities_script')
+
+
+def render_location_bytes(location, province, children=(), template=None, minify=True):
+    """Render a location page straight to bytes
+
+    The deelgemeenten are rendered into the page, so the loader script is
+    always left out, and the whole section when there are none. The page is
+    minified unless `minify` is False.
+    """
+    template = _page_template(template, children)
+    values = location_values(location, province, children)
+    if not minify:
+        return template.render_bytes(values)
+    values['submunicipalities'] = minify_html_bytes(values['submunicipalities'])
+    return template.minified().render_bytes(values)
+
+
+def unminified_size(location, province, children=(), template=None):
+    """Length of render_location_bytes(..., minify=False), without rendering the page"""
+    template = _page_template(template, children)
+    values = location_values(location, province, children)
+    return sum(map(len, template.chunks)) + sum(len(values[slot]) for slot in template.slots)
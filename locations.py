@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Postcode lookup service for the location dataset
+
+Builds hash indexes over the output of import_locations_from_csv.parse_csv so
+questions like "which hoofdgemeente serves postcode 9130?" are answered with
+a dict lookup instead of a scan over every location:
+
+    postcode -> locations using it
+    slug     -> municipality (hoofdgemeente)
+    name     -> slugs
+
+The parsed CSV is cached with marshal under .build/ and only re-parsed when
+the CSV changes; building the indexes from it is a single linear pass.
+
+Usage:
+    echo 9130 | python3 locations.py
+    python3 locations.py < postcodes.txt     # postcodes, names or slugs per line
+"""
+import marshal
+import os
+import sys
+from collections import namedtuple
+from contextlib import redirect_stdout
+
+from build_manifest import BUILD_DIR, hash_file
+
+CSV_PATH = 'import-data/locations.csv'
+CACHE_PATH = os.path.join(BUILD_DIR, 'locations.marshal')
+# Bumped when parse_csv output changes, so old caches are re-parsed
+CACHE_VERSION = 3
+
+Location = namedtuple('Location', ['province', 'name', 'slug', 'postal_codes', 'parent'])
+Municipality = namedtuple('Municipality', ['slug', 'name', 'province', 'postal_codes'])
+
+
+def _name_key(name):
+    return name.casefold()
+
+
+class LocationIndex:
+    """Constant-time lookups over all locations"""
+
+    def __init__(self, data):
+        self.locations = []
+        self.by_postcode = {}
+        self.by_name = {}
+        self.municipalities = {}
+
+        postal_codes = {}
+        for province, province_locations in data.items():
+            for loc in province_locations:
+                location = Location(province, loc['name'], loc['slug'],
+                                    tuple(loc['postal_codes']), loc['parent'])
+                self.locations.append(location)
+
+                for postal_code in location.postal_codes:
+                    self.by_postcode.setdefault(postal_code, []).append(location)
+
+                slugs = self.by_name.setdefault(_name_key(location.name), [])
+                if location.slug not in slugs:
+                    slugs.append(location.slug)
+
+                postal_codes.setdefault(location.slug, set()).update(location.postal_codes)
+
+                # The hoofdgemeente entry names the municipality; without one
+                # fall back to the parent name its deelgemeenten carry
+                current = self.municipalities.get(location.slug)
+                if location.parent is None or current is None:
+                    self.municipalities[location.slug] = Municipality(
+                        location.slug, location.name if location.parent is None else location.parent,
+                        province, ())
+
+        for slug, municipality in self.municipalities.items():
+            self.municipalities[slug] = municipality._replace(postal_codes=tuple(sorted(postal_codes[slug])))
+
+    def __len__(self):
+        return len(self.locations)
+
+    def by_postal_code(self, postal_code):
+        """Locations (hoofd- and deelgemeenten) using a postcode"""
+        return self.by_postcode.get(postal_code.strip(), [])
+
+    def municipalities_for_postcode(self, postal_code):
+        """Municipalities delivering to a postcode, usually exactly one"""
+        seen = {}
+        for location in self.by_postal_code(postal_code):
+            if location.slug not in seen:
+                seen[location.slug] = self.municipalities[location.slug]
+        return list(seen.values())
+
+    def municipality(self, slug):
+        return self.municipalities.get(slug)
+
+    def slugs_for_name(self, name):
+        return self.by_name.get(_name_key(name.strip()), [])
+
+    def lookup(self, query):
+        """Resolve a postcode, slug or name to municipalities"""
+        query = query.strip()
+        if query.isdigit():
+            return self.municipalities_for_postcode(query)
+        if query in self.municipalities:
+            return [self.municipalities[query]]
+        return [self.municipalities[slug] for slug in self.slugs_for_name(query)]
+
+
+def parse_locations(csv_path=CSV_PATH):
+    """Parse the CSV into the all-locations.json structure"""
+    from import_locations_from_csv import parse_csv
+
+    # parse_csv reports progress on stdout, keep that out of lookup output
+    with redirect_stdout(sys.stderr):
+        return parse_csv(csv_path)
+
+
+def load_locations(csv_path=CSV_PATH, cache_path=CACHE_PATH):
+    """Parsed CSV from the marshal cache, re-parsing only if the CSV changed"""
+    source_hash = hash_file(csv_path)
+
+    try:
+        with open(cache_path, 'rb') as f:
+            version, cached_hash, data = marshal.load(f)
+        if version == CACHE_VERSION and cached_hash == source_hash:
+            return data
+    except (FileNotFoundError, EOFError, ValueError, TypeError):
+        pass
+
+    data = parse_locations(csv_path)
+
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f'{cache_path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        marshal.dump((CACHE_VERSION, source_hash, data), f)
+    os.replace(tmp_path, cache_path)
+    return data
+
+
+def load_index(csv_path=CSV_PATH, cache_path=CACHE_PATH):
+    return LocationIndex(load_locations(csv_path, cache_path))
+
+
+_index = None
+
+
+def get_index():
+    """Process-wide index, loaded on first use"""
+    global _index
+    if _index is None:
+        _index = load_index()
+    return _index
+
+
+def main():
+    index = get_index()
+
+    for line in sys.stdin:
+        query = line.strip()
+        if not query:
+            continue
+
+        matches = index.lookup(query)
+        if not matches:
+            print(f"{query}\t-\tNot found")
+            continue
+
+        for municipality in matches:
+            print(f"{query}\t{municipality.slug}\t{municipality.name}")
+
+
+if __name__ == '__main__':
+    main()
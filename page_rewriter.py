@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Single-pass batch rewriter for existing location pages
+
+The page-fixing scripts (add_submunicipalities.py, fix_location_headers.py,
+update_location_pages.py) describe their edits as rewrite rules. This module
+compiles those rules once and applies all of them with one read and one
+atomic write per page.
+
+Only pages the generator wrote and nobody changed since are rewritten; the
+hand-made pages (like the SEO pages from scripts/generate-seo-location-content.js)
+are left alone unless --overwrite-pages is passed.
+
+Usage:
+    python3 page_rewriter.py                    # run every script's rules in one sweep
+    python3 page_rewriter.py --dry-run          # only report how often each rule hits
+    python3 page_rewriter.py --overwrite-pages  # also rewrite the hand-made pages
+"""
+import argparse
+import os
+import re
+from collections import namedtuple
+
+from build_manifest import Manifest, hash_file, manifest_path, write_atomic
+from build_metrics import count
+
+LOCATIES_DIR = 'public/locaties'
+# Manifest generate_missing_location_pages.py records the pages it wrote in
+GENERATOR_MANIFEST = 'location-pages'
+
+SCRIPT_BLOCK_PATTERN = r'<script type="module">.*?</script>'
+
+# A page being rewritten; rules that need per-page values get this passed in
+Page = namedtuple('Page', ['path', 'slug'])
+
+
+def _resolve(value, page):
+    return value(page) if callable(value) else value
+
+
+class LiteralRule:
+    """Replace every occurrence of a literal string"""
+
+    def __init__(self, name, old, new):
+        self.name = name
+        self.old = old
+        self.new = new
+
+    def apply(self, content, page):
+        hits = content.count(self.old)
+        if hits:
+            content = content.replace(self.old, _resolve(self.new, page))
+            count('literal_replacements', hits)
+        return content, hits
+
+
+class RegexRule:
+    """Substitute a regular expression (compiled once)"""
+
+    def __init__(self, name, pattern, repl, flags=0, count=0):
+        self.name = name
+        self.pattern = re.compile(pattern, flags)
+        self.repl = repl
+        self.count = count
+
+    def apply(self, content, page):
+        repl = self.repl
+        if callable(repl):
+            repl = lambda match: self.repl(match, page)
+        content, hits = self.pattern.subn(repl, content, count=self.count)
+        count('regex_substitutions', hits)
+        return content, hits
+
+
+class ScriptBlockRule:
+    """Swap the page's first <script type="module"> block for a new one
+
+    `new_script` is a string or a callable taking (page, content), so the
+    replacement can depend on what else the page contains.
+    """
+
+    def __init__(self, name, new_script):
+        self.name = name
+        self.pattern = re.compile(SCRIPT_BLOCK_PATTERN, re.DOTALL)
+        self.new_script = new_script
+
+    def apply(self, content, page):
+        match = self.pattern.search(content)
+        if not match:
+            return content, 0
+
+        new_script = self.new_script
+        if callable(new_script):
+            new_script = new_script(page, content)
+        if match.group(0) == new_script:
+            return content, 0
+        return content[:match.start()] + new_script + content[match.end():], 1
+
+
+class InsertSectionRule:
+    """Insert markup next to an anchor, unless a marker shows it is already there"""
+
+    def __init__(self, name, anchor, html, unless=None, before=True):
+        self.name = name
+        self.anchor = anchor
+        self.html = html
+        self.unless = unless
+        self.before = before
+
+    def apply(self, content, page):
+        if self.unless and self.unless in content:
+            return content, 0
+
+        index = content.find(self.anchor)
+        if index == -1:
+            return content, 0
+
+        if not self.before:
+            index += len(self.anchor)
+        return content[:index] + _resolve(self.html, page) + content[index:], 1
+
+
+class OnlyPagesRule:
+    """Apply `rule` only to the pages whose slug is in `slugs`"""
+
+    def __init__(self, rule, slugs):
+        self.name = rule.name
+        self.rule = rule
+        self.slugs = slugs
+
+    def apply(self, content, page):
+        if page.slug not in self.slugs:
+            return content, 0
+        return self.rule.apply(content, page)
+
+
+def iter_location_pages(locaties_dir=LOCATIES_DIR, slugs=None):
+    """Yield a Page for every locaties/<slug>/index.html, sorted by slug"""
+    for slug in sorted(os.listdir(locaties_dir)):
+        if slugs is not None and slug not in slugs:
+            continue
+        path = os.path.join(locaties_dir, slug, 'index.html')
+        if os.path.isfile(path):
+            yield Page(path, slug)
+
+
+def generated_slugs(locaties_dir=LOCATIES_DIR, manifest=None):
+    """Slugs whose page is still exactly what the generator wrote
+
+    Same check as generate_missing_location_pages.build_page: a page without
+    a manifest record, or changed since it was written, is hand-made.
+    """
+    if manifest is None:
+        manifest = Manifest(manifest_path(GENERATOR_MANIFEST))
+    return {
+        slug for slug, entry in manifest.entries.items()
+        if hash_file(os.path.join(locaties_dir, slug, 'index.html')) == entry['output']
+    }
+
+
+def location_pages(locaties_dir=LOCATIES_DIR, overwrite=False, slugs=None, manifest=None):
+    """Pages the page-fixing scripts may rewrite, see generated_slugs
+
+    With `overwrite` every page under locaties_dir qualifies.
+    """
+    if not overwrite:
+        generated = generated_slugs(locaties_dir, manifest)
+        slugs = generated if slugs is None else generated & set(slugs)
+    return iter_location_pages(locaties_dir, slugs)
+
+
+def add_overwrite_argument(parser):
+    parser.add_argument('--overwrite-pages', action='store_true',
+                        help='also rewrite the pages the generator did not write (the hand-made SEO pages)')
+
+
+class RewritePipeline:
+    """Ordered list of rules applied in a single read/modify/write per file"""
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.hits = {rule.name: 0 for rule in self.rules}
+        self.files_hit = {rule.name: 0 for rule in self.rules}
+
+    def rewrite(self, content, page):
+        """Apply every rule, return (new content, names of rules that hit)"""
+        applied = []
+        for rule in self.rules:
+            content, hits = rule.apply(content, page)
+            if hits:
+                self.hits[rule.name] += hits
+                self.files_hit[rule.name] += 1
+                applied.append(rule.name)
+        return content, applied
+
+    def run_page(self, page, dry_run=False):
+        with open(page.path, 'r', encoding='utf-8') as f:
+            original = f.read()
+            count('files_read')
+            count('bytes_read', os.fstat(f.fileno()).st_size)
+
+        content, applied = self.rewrite(original, page)
+        if content != original and not dry_run:
+            write_atomic(page.path, content.encode('utf-8'))
+        return applied
+
+    def run(self, pages, dry_run=False, verbose=True):
+        """Rewrite every page, return (pages changed, pages seen)"""
+        changed = 0
+        total = 0
+        for page in pages:
+            total += 1
+            applied = self.run_page(page, dry_run)
+            if applied:
+                changed += 1
+                if verbose:
+                    print(f"✓ {page.slug}: {', '.join(applied)}")
+            elif verbose:
+                print(f"○ {page.slug}: No changes needed")
+        return changed, total
+
+    def report(self):
+        print("\n📊 Rule hits:")
+        width = max((len(name) for name in self.hits), default=0)
+        for rule in self.rules:
+            print(f"   {rule.name:<{width}}  {self.hits[rule.name]:>5} hits in {self.files_hit[rule.name]} files")
+
+
+def all_rules():
+    """Rules of every page-fixing script, in the order they used to be run"""
+    import add_submunicipalities
+    import fix_location_headers
+    import update_location_pages
+
+    # add_submunicipalities.py only touches the pages of main cities
+    main_cities = add_submunicipalities.main_cities()
+    submunicipality_rules = [OnlyPagesRule(rule, main_cities) for rule in add_submunicipalities.rewrite_rules()]
+
+    return (submunicipality_rules
+            + fix_location_headers.rewrite_rules()
+            + update_location_pages.rewrite_rules())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply all location page fixes in one pass')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='do not write anything, only report per-rule hit counts')
+    parser.add_argument('--quiet', action='store_true', help='only print the summary')
+    add_overwrite_argument(parser)
+    args = parser.parse_args()
+
+    if not os.path.exists(LOCATIES_DIR):
+        print(f"Error: {LOCATIES_DIR} directory not found")
+        return
+
+    pipeline = RewritePipeline(all_rules())
+    pages = location_pages(overwrite=args.overwrite_pages)
+    changed, total = pipeline.run(pages, dry_run=args.dry_run, verbose=not args.quiet)
+
+    pipeline.report()
+    verb = 'Would update' if args.dry_run else 'Updated'
+    print(f"\n✅ {verb} {changed} of {total} location pages")
+
+
+if __name__ == '__main__':
+    main()
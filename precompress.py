@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Pre-compressed .gz and .br siblings for the text files in public/
+
+Every HTML, CSS, JS, JSON, XML and SVG file of at least MIN_SIZE bytes gets
+a gzip (level 9) and, when the brotli module is installed (pip install
+Brotli), a brotli (quality 11) sibling next to it, for hosts that serve
+precompressed files instead of compressing each response themselves
+(nginx gzip_static/brotli_static, Caddy's precompressed, ...).
+
+This is an opt-in stage: GitHub Pages and Netlify compress each response
+themselves and never serve these siblings, so the default build does not
+run it, they are git-ignored and publish_docs leaves them out of docs/. Run
+it when public/ is served by such a host (python3 sitebuild.py docs precompress).
+
+Files are compressed in a process pool. The .build/precompress.json manifest
+records size, mtime and hash of each source: files whose size and mtime are
+unchanged are skipped without being read, touched files are only
+recompressed when their hash changed, and siblings of deleted sources are
+removed. A recompressed file is hashed by the worker from the bytes it
+already read, not read a second time.
+
+Usage:
+    python3 precompress.py            # compress new and changed files
+    python3 precompress.py --force    # recompress everything
+    python3 precompress.py --jobs 4
+"""
+import argparse
+import gzip
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from build_manifest import Manifest, hash_bytes, hash_file, manifest_path, write_atomic
+from publish_docs import iter_files
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PUBLIC_DIR = 'public'
+MANIFEST_NAME = 'precompress'
+
+EXTENSIONS = ('.html', '.css', '.js', '.json', '.xml', '.svg')
+# Below this the compression framing outweighs the savings
+MIN_SIZE = 1024
+
+SUFFIXES = {'gzip': '.gz', 'brotli': '.br'}
+
+
+def available_formats():
+    return ['gzip', 'brotli'] if brotli else ['gzip']
+
+
+def compress(data, fmt):
+    if fmt == 'gzip':
+        # mtime=0 keeps the output byte-identical for identical input
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, quality=11, mode=brotli.MODE_TEXT)
+
+
+def compress_file(job):
+    """Write the siblings of one file; runs in a worker process
+
+    Returns the hash of the source and the compressed size per format.
+    """
+    path, formats = job
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    sizes = {}
+    for fmt in formats:
+        compressed = compress(data, fmt)
+        write_atomic(path + SUFFIXES[fmt], compressed)
+        sizes[fmt] = len(compressed)
+    return hash_bytes(data), sizes
+
+
+def remove_siblings(path):
+    for suffix in SUFFIXES.values():
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+class Precompressor:
+    """Keeps the .gz/.br siblings under a directory in sync with their sources"""
+
+    def __init__(self, manifest, root=PUBLIC_DIR, force=False):
+        self.manifest = manifest
+        self.root = root
+        self.force = force
+        self.formats = available_formats()
+        self.compressed = []
+        self.unchanged = 0
+        self.removed = []
+
+    def is_current(self, rel_path, stat, record):
+        if self.force or not record or record['formats'] != self.formats:
+            return False
+        path = os.path.join(self.root, rel_path)
+        if not all(os.path.exists(path + SUFFIXES[fmt]) for fmt in self.formats):
+            return False
+        if record['size'] == stat.st_size and record['mtime'] == stat.st_mtime_ns:
+            return True
+        # Touched but not modified: keep the siblings, refresh the stat
+        if hash_file(path) == record['hash']:
+            self.manifest.set(rel_path, **dict(record, mtime=stat.st_mtime_ns))
+            return True
+        return False
+
+    def run(self, workers=1):
+        sources = set()
+        pending = []
+        for rel_path, entry in iter_files(self.root):
+            if not rel_path.endswith(EXTENSIONS):
+                continue
+            stat = entry.stat()
+            if stat.st_size < MIN_SIZE:
+                continue
+            sources.add(rel_path)
+            if self.is_current(rel_path, stat, self.manifest.get(rel_path)):
+                self.unchanged += 1
+            else:
+                pending.append((rel_path, stat))
+
+        jobs = [(os.path.join(self.root, rel_path), self.formats) for rel_path, _ in pending]
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(compress_file, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+        else:
+            results = [compress_file(job) for job in jobs]
+
+        for (rel_path, stat), (source_hash, sizes) in zip(pending, results):
+            self.manifest.set(rel_path, size=stat.st_size, mtime=stat.st_mtime_ns,
+                              hash=source_hash, formats=self.formats, compressed=sizes)
+            self.compressed.append(rel_path)
+
+        # Sources that were deleted or shrank below MIN_SIZE
+        for rel_path in self.manifest.prune(sources):
+            remove_siblings(os.path.join(self.root, rel_path))
+            self.removed.append(rel_path)
+        self.manifest.save()
+
+    def ratios(self):
+        """Per extension: file count, original bytes and bytes per format"""
+        totals = {}
+        for rel_path, record in self.manifest.entries.items():
+            ext = os.path.splitext(rel_path)[1]
+            total = totals.setdefault(ext, {'files': 0, 'size': 0, **{fmt: 0 for fmt in self.formats}})
+            total['files'] += 1
+            total['size'] += record['size']
+            for fmt in self.formats:
+                total[fmt] += record['compressed'].get(fmt, 0)
+        return totals
+
+    def report(self):
+        print("📊 Compression per type (all tracked files):")
+        for ext, total in sorted(self.ratios().items()):
+            ratios = ', '.join(f"{fmt} {total[fmt] / 1024:.0f} KB ({total[fmt] / total['size']:.0%})"
+                               for fmt in self.formats)
+            print(f"   {ext:<6} {total['files']:>4} files  {total['size'] / 1024:>7.0f} KB -> {ratios}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write .gz/.br siblings for the text files in public/')
+    parser.add_argument('--force', action='store_true', help='recompress every file')
+    parser.add_argument('--jobs', '-j', type=int, default=0, metavar='N',
+                        help='compress in N worker processes (0 = one per CPU)')
+    args = parser.parse_args()
+
+    if not os.path.isdir(PUBLIC_DIR):
+        print(f"❌ {PUBLIC_DIR}/ directory not found")
+        return
+    if brotli is None:
+        print("⚠️  brotli is not installed (pip install Brotli), writing .gz only")
+
+    workers = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    precompressor = Precompressor(Manifest(manifest_path(MANIFEST_NAME)), force=args.force)
+    precompressor.run(workers=workers)
+
+    precompressor.report()
+    print(f"\n✅ Compressed {len(precompressor.compressed)} files, {precompressor.unchanged} unchanged, "
+          f"{len(precompressor.removed)} removed")
+
+
+if __name__ == '__main__':
+    main()
@@ -11,8 +11,9 @@ const API_BASE_URL = false
 const BASE_PATH = '';
 
 let allCities = [];
-let allLocations = []; // Includes all municipalities and sub-municipalities
 let filteredCities = [];
+let matchingSlugs = new Set(); // Slugs whose (sub-)municipalities match the search
+const searchBuckets = new Map(); // Prefix index buckets, fetched on demand
 let currentProvince = '';
 let currentSort = 'name_asc';
 let currentQuery = '';
@@ -91,32 +92,71 @@ const STATIC_CITIES = [
 document.addEventListener('DOMContentLoaded', async () => {
   await loadHeader();
   initFilters();
-  // Load all locations including sub-municipalities
-  await loadAllLocations();
   // Use only static cities for display
   allCities = STATIC_CITIES;
   applyFiltersAndRender();
 });
 
+// Letters without an NFKD decomposition to ASCII (SPECIAL_LETTERS in slugs.py)
+const SPECIAL_LETTERS = {
+  'ß': 'ss', 'æ': 'ae', 'œ': 'oe', 'ø': 'o', 'ł': 'l', 'đ': 'd', 'ð': 'd', 'þ': 'th'
+};
+const SPECIAL_LETTER_PATTERN = new RegExp(`[${Object.keys(SPECIAL_LETTERS).join('')}]`, 'g');
+
 /**
- * Load all locations (including sub-municipalities) for search
+ * Fold a query like location_search.fold_query: no accents, words joined by '-'
  */
-async function loadAllLocations() {
-  try {
-    const response = await fetch(`${BASE_PATH}/data/all-locations.json`);
-    const data = await response.json();
-    
-    // Flatten all locations from both provinces
-    allLocations = [
-      ...data['west-vlaanderen'],
-      ...data['oost-vlaanderen']
-    ];
-    
-    console.log(`Loaded ${allLocations.length} locations (including sub-municipalities)`);
-  } catch (error) {
-    console.error('Error loading all locations:', error);
-    allLocations = [];
+function foldQuery(query) {
+  return query
+    .toLowerCase()
+    .replace(SPECIAL_LETTER_PATTERN, letter => SPECIAL_LETTERS[letter])
+    .normalize('NFKD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .replace(/[^a-z0-9]+/g, '-')
+    .replace(/^-+/, '');
+}
+
+/**
+ * Fetch the prefix index bucket a folded query falls in (built by location_search.py)
+ */
+function loadSearchBucket(key) {
+  const isPostcode = /^[0-9]/.test(key);
+  // Postcode buckets are keyed by their first two digits
+  if (isPostcode && key.length < 2) return Promise.resolve(null);
+  const name = isPostcode ? key.slice(0, 2) : key[0];
+
+  if (!searchBuckets.has(name)) {
+    searchBuckets.set(name, fetch(`${BASE_PATH}/data/location-search/${name}.json`)
+      .then(response => (response.ok ? response.json() : null))
+      .catch(() => null));
   }
+  return searchBuckets.get(name);
+}
+
+/**
+ * Slugs of all locations (including sub-municipalities) whose name or postcode starts with the query
+ */
+async function findMatchingSlugs(query) {
+  const key = foldQuery(query);
+  const slugs = new Set();
+  if (!key) return slugs;
+
+  const bucket = await loadSearchBucket(key);
+  if (!bucket) return slugs;
+
+  // Binary search for the first key >= query, then scan while the prefix matches
+  const { keys, targets, entries } = bucket;
+  let lo = 0;
+  let hi = keys.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (keys[mid] < key) lo = mid + 1;
+    else hi = mid;
+  }
+  for (let i = lo; i < keys.length && keys[i].startsWith(key); i++) {
+    slugs.add(entries[targets[i]][1]);
+  }
+  return slugs;
 }
 
 /**
@@ -172,8 +212,13 @@ function initFilters() {
   }
 
   if (searchInput) {
-    searchInput.addEventListener('input', () => {
-      currentQuery = (searchInput.value || '').trim();
+    searchInput.addEventListener('input', async () => {
+      const query = (searchInput.value || '').trim();
+      currentQuery = query;
+      const slugs = await findMatchingSlugs(query);
+      // Ignore results for a query the visitor already typed past
+      if (query !== currentQuery) return;
+      matchingSlugs = slugs;
       applyFiltersAndRender();
     });
   }
@@ -189,16 +234,6 @@ function applyFiltersAndRender() {
   if (currentQuery) {
     const q = currentQuery.toLowerCase();
     
-    // Search in allLocations (includes sub-municipalities)
-    const matchingLocations = allLocations.filter(loc => {
-      const name = (loc.name || '').toLowerCase();
-      const postalCodes = (loc.postal_codes || []).join(' ').toLowerCase();
-      return name.includes(q) || postalCodes.includes(q);
-    });
-    
-    // Get unique slugs from matching locations
-    const matchingSlugs = new Set(matchingLocations.map(loc => loc.slug));
-    
     // Filter cities by matching slugs or direct name match
     filteredCities = filteredCities.filter(city => {
       const name = (city.name || '').toLowerCase();
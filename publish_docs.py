@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Publish public/ to docs/ for GitHub Pages, copying only what changed
+
+Replaces the full rsync in sync-to-docs.sh. The .build/publish-docs.json
+manifest remembers size, mtime and hash of every file from the last publish:
+files whose size and mtime are unchanged are skipped without being read,
+changed files are copied in the kernel (copy_file_range, falling back to
+sendfile) and files that disappeared from public/ are deleted from docs/.
+
+With --relative, text files get the absolute-to-relative path rewrites of
+scripts/build-docs.js instead of a plain copy.
+
+Usage:
+    python3 publish_docs.py              # mirror public/ to docs/
+    python3 publish_docs.py --relative   # mirror with build-docs.js path rewrites
+    python3 publish_docs.py --dry-run    # only print the delta
+"""
+import argparse
+import os
+import re
+import shutil
+
+from build_manifest import Manifest, hash_bytes, hash_file, manifest_path, write_atomic
+
+SOURCE_DIR = 'public'
+DEST_DIR = 'docs'
+
+# Never copied, and never deleted from docs/
+EXCLUDE = {'.git', 'node_modules', 'CNAME'}
+# Precompressed siblings from precompress.py (GitHub Pages compresses itself)
+# and the temp files of writes still in progress
+EXCLUDE_SUFFIXES = ('.gz', '.br', '.tmp')
+
+TEXT_EXTENSIONS = ('.html', '.css', '.js', '.json')
+
+# Absolute -> relative path rewrites from scripts/build-docs.js, per extension
+_REDIRECT_REWRITES = [
+    (r"location\s*=\s*'/", "location = './"),
+    (r'location\s*=\s*"/', 'location = "./'),
+    (r"location\.href\s*=\s*'/", "location.href = './"),
+    (r'location\.href\s*=\s*"/', 'location.href = "./'),
+]
+_FETCH_IMPORT_REWRITES = [
+    (r"fetch\('/", "fetch('./"),
+    (r'fetch\("/', 'fetch("./'),
+    (r"from\s+'/([^']+)'", r"from './\1'"),
+    (r'from\s+"/([^"]+)"', r'from "./\1"'),
+]
+PATH_REWRITES = {
+    '.html': [
+        (r'(?i)<base\s+href="/"\s*/?>', ''),
+        (r'href="/', 'href="./'),
+        (r'src="/', 'src="./'),
+        (r"url\('/", "url('./"),
+        (r'url\("/', 'url("./'),
+    ] + _FETCH_IMPORT_REWRITES + _REDIRECT_REWRITES,
+    '.css': [
+        (r"url\('/", "url('./"),
+        (r'url\("/', 'url("./'),
+        (r'url\(/', 'url(./'),
+    ],
+    '.js': _FETCH_IMPORT_REWRITES + [
+        # Not /api/, those requests go to the external backend
+        (r"'/(images|css|js|components)/", r"'./\1/"),
+        (r'"/(images|css|js|components)/', r'"./\1/'),
+    ] + _REDIRECT_REWRITES,
+}
+PATH_REWRITES = {
+    ext: [(re.compile(pattern), repl) for pattern, repl in rules]
+    for ext, rules in PATH_REWRITES.items()
+}
+
+
+def rewrite_paths(content, ext):
+    """Apply the build-docs.js rewrites for one file type"""
+    for pattern, repl in PATH_REWRITES.get(ext, ()):
+        content = pattern.sub(repl, content)
+    return content
+
+
+def iter_files(root):
+    """Yield (relative path, DirEntry) for every file under root, minus the excluded ones"""
+    pending = ['']
+    while pending:
+        rel_dir = pending.pop()
+        with os.scandir(os.path.join(root, rel_dir)) as entries:
+            for entry in entries:
+                if entry.name in EXCLUDE or entry.name.endswith(EXCLUDE_SUFFIXES):
+                    continue
+                rel_path = os.path.join(rel_dir, entry.name)
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(rel_path)
+                elif entry.is_file():
+                    yield rel_path, entry
+
+
+def copy_file(src, dst):
+    """Copy file contents in the kernel where possible, atomically replacing dst"""
+    tmp_path = f'{dst}.tmp'
+    with open(src, 'rb') as fsrc, open(tmp_path, 'wb') as fdst:
+        remaining = os.fstat(fsrc.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except (AttributeError, OSError):
+            try:
+                offset = fsrc.tell()
+                while remaining > 0:
+                    sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, remaining)
+                    if sent == 0:
+                        break
+                    offset += sent
+                    remaining -= sent
+            except (AttributeError, OSError):
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+                shutil.copyfileobj(fsrc, fdst)
+    os.replace(tmp_path, dst)
+
+
+class DocsPublisher:
+    """Delta sync from SOURCE_DIR to DEST_DIR driven by a manifest"""
+
+    def __init__(self, source_dir, dest_dir, manifest, relative=False, dry_run=False):
+        self.source_dir = source_dir
+        self.dest_dir = dest_dir
+        self.manifest = manifest
+        self.mode = 'relative' if relative else 'copy'
+        self.dry_run = dry_run
+        self.added = []
+        self.updated = []
+        self.deleted = []
+        self.unchanged = 0
+        self.bytes_written = 0
+
+    def transform(self, rel_path):
+        if self.mode == 'relative' and rel_path.endswith(TEXT_EXTENSIONS):
+            return 'rewrite'
+        return 'copy'
+
+    def publish_file(self, rel_path, entry):
+        """Bring one docs/ file up to date, return True if it was (or would be) written"""
+        stat = entry.stat()
+        dst = os.path.join(self.dest_dir, rel_path)
+        record = self.manifest.get(rel_path)
+        dest_exists = os.path.exists(dst)
+
+        if (record and dest_exists and record['mode'] == self.mode
+                and record['size'] == stat.st_size and record['mtime'] == stat.st_mtime_ns):
+            self.unchanged += 1
+            return False
+
+        content_hash = hash_file(entry.path)
+        data = None
+        if dest_exists and record and record['mode'] == self.mode and record['hash'] == content_hash:
+            changed = False
+        elif self.transform(rel_path) == 'rewrite':
+            with open(entry.path, 'r', encoding='utf-8') as f:
+                content = rewrite_paths(f.read(), os.path.splitext(rel_path)[1].lower())
+            data = content.encode('utf-8')
+            changed = not dest_exists or hash_file(dst) != hash_bytes(data)
+        else:
+            # First publish or a touched file: only copy when the bytes differ
+            changed = not dest_exists or hash_file(dst) != content_hash
+
+        if changed and not self.dry_run:
+            os.makedirs(os.path.dirname(dst) or '.', exist_ok=True)
+            if data is not None:
+                write_atomic(dst, data)
+                self.bytes_written += len(data)
+            else:
+                copy_file(entry.path, dst)
+                self.bytes_written += stat.st_size
+
+        if changed:
+            (self.updated if dest_exists else self.added).append(rel_path)
+        else:
+            self.unchanged += 1
+
+        if not self.dry_run:
+            self.manifest.set(rel_path, size=stat.st_size, mtime=stat.st_mtime_ns,
+                              hash=content_hash, mode=self.mode)
+        return changed
+
+    def run(self):
+        sources = set()
+        for rel_path, entry in iter_files(self.source_dir):
+            sources.add(rel_path)
+            self.publish_file(rel_path, entry)
+
+        protected = {'.nojekyll'} if self.mode == 'relative' else set()
+        if os.path.isdir(self.dest_dir):
+            for rel_path, entry in iter_files(self.dest_dir):
+                if rel_path not in sources and rel_path not in protected:
+                    self.deleted.append(rel_path)
+                    if not self.dry_run:
+                        os.remove(entry.path)
+
+        if self.mode == 'relative' and not self.dry_run:
+            nojekyll = os.path.join(self.dest_dir, '.nojekyll')
+            if not os.path.exists(nojekyll):
+                write_atomic(nojekyll, b'')
+
+        if not self.dry_run:
+            self.remove_empty_dirs()
+            self.manifest.prune(sources)
+            self.manifest.save()
+
+    def remove_empty_dirs(self):
+        for dirpath, dirnames, filenames in os.walk(self.dest_dir, topdown=False):
+            if dirpath == self.dest_dir or os.path.basename(dirpath) in EXCLUDE:
+                continue
+            if not os.listdir(dirpath):
+                os.rmdir(dirpath)
+
+    def report(self, verbose=True):
+        if verbose:
+            for prefix, paths in (('+', self.added), ('~', self.updated), ('-', self.deleted)):
+                for rel_path in sorted(paths):
+                    print(f"   {prefix} {rel_path}")
+
+        verb = 'Would publish' if self.dry_run else 'Published'
+        print(f"\n✅ {verb} {self.source_dir}/ to {self.dest_dir}/ ({self.mode}): "
+              f"{len(self.added)} added, {len(self.updated)} updated, "
+              f"{len(self.deleted)} deleted, {self.unchanged} unchanged")
+        if not self.dry_run:
+            print(f"   {self.bytes_written / 1024:.1f} KB written (CNAME preserved)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Publish public/ to docs/ for GitHub Pages')
+    parser.add_argument('--relative', action='store_true',
+                        help='rewrite absolute paths in text files like scripts/build-docs.js')
+    parser.add_argument('--dry-run', action='store_true', help='only report what would change')
+    parser.add_argument('--quiet', action='store_true', help='only print the summary')
+    args = parser.parse_args()
+
+    if not os.path.isdir(SOURCE_DIR):
+        print(f"❌ {SOURCE_DIR}/ directory not found")
+        return
+
+    publisher = DocsPublisher(SOURCE_DIR, DEST_DIR, Manifest(manifest_path('publish-docs')),
+                              relative=args.relative, dry_run=args.dry_run)
+    publisher.run()
+    publisher.report(verbose=not args.quiet)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,530 @@
+#!/usr/bin/env python3
+"""
+One entry point for the site build, as a graph of tasks
+
+Each task declares the tasks it depends on and the files it reads and
+writes. Before a task runs, the size and mtime of its inputs, the output
+signatures of its dependencies and its options are hashed; when that hash
+and the signature of its outputs match the .build/sitebuild.json record of
+the last successful run, the task is skipped. Tasks whose dependencies are
+done run concurrently in threads (the location import next to the asset
+tasks, the docs publish next to precompress); each task's output is
+buffered and printed when it finishes. Signatures are recorded once the
+build is done, so a later task rewriting an earlier task's output (the
+page fixes on the rendered pages) does not trigger a rebuild next time.
+
+The parsed location data is handed from the import task to the page and
+sitemap tasks in memory, so a full rebuild reads and parses the CSV once.
+When the import is skipped, the tasks that need the data load
+all-locations.json instead.
+
+With --watch the targets are rebuilt after every burst of changes to their
+inputs (inotify, or polling where that is not available, see
+file_watcher.py), logging how long after the first change the rebuild was
+done.
+
+    locations ─────────────┐
+    products ─┬─ assets ───┼─ pages ─ rewrite ─ sitemap ─┬─ docs
+    images ───┴────────────┘                             └─ precompress
+
+precompress is opt-in, it only helps hosts that serve precompressed
+siblings (nginx gzip_static and the like), see precompress.py.
+
+The pages and rewrite tasks leave location pages the generator did not
+write (the SEO pages from scripts/generate-seo-location-content.js) alone;
+pass --overwrite-pages to replace them with the template.
+
+Usage:
+    python3 sitebuild.py                    # everything up to docs/
+    python3 sitebuild.py pages              # only what the pages need
+    python3 sitebuild.py docs precompress   # also write .gz/.br siblings (gzip_static hosts)
+    python3 sitebuild.py --force            # run every task
+    python3 sitebuild.py pages --overwrite-pages
+    python3 sitebuild.py --list             # show the tasks
+    python3 sitebuild.py pages --watch      # rebuild the pages on every change
+"""
+import argparse
+import glob
+import io
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+
+from build_manifest import Manifest, hash_json, manifest_path
+from build_metrics import add_profile_argument, start_run, timer
+from file_watcher import create_watcher
+
+MANIFEST_NAME = 'sitebuild'
+DEFAULT_TARGETS = ('docs',)
+
+# Never part of a signature: precompressed siblings and writes in progress
+IGNORED_SUFFIXES = ('.gz', '.br', '.tmp')
+
+
+class Task:
+    """A build step with its dependencies, inputs and outputs
+
+    `action(context)` does the work. Inputs and outputs are files,
+    directories or glob patterns. `params(context)` returns the options and
+    state outside the inputs that change the result.
+    """
+
+    def __init__(self, name, action, deps=(), inputs=(), outputs=(), params=None, description=''):
+        self.name = name
+        self.action = action
+        self.deps = tuple(deps)
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.params = params
+        self.description = description
+
+
+def _stat_entry(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return [path, None, None]
+    return [path, stat.st_size, stat.st_mtime_ns]
+
+
+def file_signature(paths):
+    """Hash of the size and mtime of every file under `paths`"""
+    entries = []
+    for pattern in paths:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if not os.path.isdir(path):
+                entries.append(_stat_entry(path))
+                continue
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                for name in sorted(filenames):
+                    if not name.endswith(IGNORED_SUFFIXES):
+                        entries.append(_stat_entry(os.path.join(dirpath, name)))
+    return hash_json(entries)
+
+
+class BuildContext:
+    """Options and in-memory data shared by the tasks of one build"""
+
+    def __init__(self, jobs=1, relative=False, overwrite_pages=False):
+        self.jobs = jobs
+        self.relative = relative
+        self.overwrite_pages = overwrite_pages
+        self._locations = None
+        self._lock = threading.Lock()
+
+    @property
+    def locations(self):
+        """The all-locations.json structure, from the import task or from disk"""
+        with self._lock:
+            if self._locations is None:
+                from import_locations_from_csv import OUTPUT_PATH
+                with open(OUTPUT_PATH, 'r', encoding='utf-8') as f:
+                    self._locations = json.load(f)
+                print(f"📖 Loaded {OUTPUT_PATH}")
+            return self._locations
+
+    @locations.setter
+    def locations(self, data):
+        with self._lock:
+            self._locations = data
+
+
+class TaskOutput:
+    """sys.stdout stand-in that collects each task thread's prints separately"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        return (getattr(self.local, 'buffer', None) or self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    @property
+    def encoding(self):
+        return self.stream.encoding
+
+
+# Task actions; the modules are imported lazily so `--list` stays instant
+
+def import_locations(context):
+    from import_locations_from_csv import CSV_PATH, parse_csv, write_outputs
+
+    data = parse_csv(CSV_PATH)
+    write_outputs(data)
+    context.locations = data
+    print(f"✓ {sum(len(locations) for locations in data.values())} locations")
+
+
+def refresh_products(context):
+    from location_template import build_featured_products
+
+    products, status = build_featured_products()
+    if products:
+        print(f"🛒 Featured products: {len(products['products'])} ({status}, from {products['source']})")
+    else:
+        print("⚠️  No featured products snapshot, pages will load them in the browser")
+
+
+def products_expired(context):
+    from featured_products import is_fresh, load_cache
+
+    return {'expired': not is_fresh(load_cache())}
+
+
+def build_images(context):
+    from image_pipeline import MANIFEST_NAME as IMAGES_MANIFEST, Image, run_pipeline
+
+    if Image is None:
+        print("⚠️  Pillow is not installed (pip install Pillow), keeping the responsive images as they are")
+        return
+    encoded, cached = run_pipeline(Manifest(manifest_path(IMAGES_MANIFEST)), workers=context.jobs)
+    print(f"✓ Encoded {len(encoded)} images, {len(cached)} unchanged")
+
+
+def build_assets(context):
+    from location_template import build_css_bundle, build_fingerprints
+
+    bundle = build_css_bundle()
+    print(f"🎨 Stylesheets: {bundle['path']} ({bundle['size'] / 1024:.1f} KB), "
+          f"{len(bundle['critical']) / 1024:.1f} KB critical CSS inlined")
+    assets = build_fingerprints()
+    print(f"🔖 Assets: {len(assets.manifest.entries)} fingerprinted "
+          f"({len(assets.created)} new, {len(assets.removed)} removed)")
+
+
+def build_pages(context):
+    from pathlib import Path
+
+    from generate_missing_location_pages import generate_incremental
+
+    counts = generate_incremental(context.locations, Path('public/locaties'),
+                                  Manifest(manifest_path('location-pages')), context.jobs, context.overwrite_pages)
+    if counts['kept']:
+        print("   Pass --overwrite-pages to overwrite them with the template")
+
+
+def rewrite_pages(context):
+    from page_rewriter import RewritePipeline, all_rules, location_pages
+
+    # Like the pages task, leave the pages the generator did not write alone
+    pipeline = RewritePipeline(all_rules())
+    changed, total = pipeline.run(location_pages(overwrite=context.overwrite_pages), verbose=False)
+    print(f"✓ Page fixes applied to {changed} of {total} generated location pages")
+
+
+def build_sitemap(context):
+    from locations import LocationIndex
+    from sitemap_builder import update_sitemap
+
+    update_sitemap(LocationIndex(context.locations))
+
+
+def publish(context):
+    from publish_docs import DEST_DIR, SOURCE_DIR, DocsPublisher
+
+    publisher = DocsPublisher(SOURCE_DIR, DEST_DIR, Manifest(manifest_path('publish-docs')),
+                              relative=context.relative)
+    publisher.run()
+    publisher.report(verbose=False)
+
+
+def precompress(context):
+    from precompress import MANIFEST_NAME as PRECOMPRESS_MANIFEST, Precompressor
+
+    precompressor = Precompressor(Manifest(manifest_path(PRECOMPRESS_MANIFEST)))
+    precompressor.run(workers=context.jobs)
+    print(f"✅ Compressed {len(precompressor.compressed)} files, {precompressor.unchanged} unchanged, "
+          f"{len(precompressor.removed)} removed")
+
+
+TEMPLATE_INPUTS = ('templates', 'public/components', 'location_template.py', 'html_minify.py')
+
+TASKS = [
+    Task('locations', import_locations,
+         inputs=('import-data/locations.csv', 'import_locations_from_csv.py', 'location_search.py', 'slugs.py'),
+         outputs=('public/data/all-locations.json', 'public/data/locations', 'public/data/location-search'),
+         description='CSV -> all-locations.json, shards and search index'),
+    Task('products', refresh_products, outputs=('.build/featured-products.json',), params=products_expired,
+         description='featured products snapshot (refreshed when its TTL expired)'),
+    Task('images', build_images, inputs=('public/images/site', 'image_pipeline.py'),
+         outputs=('public/images/responsive', '.build/images.json'),
+         description='responsive AVIF/WebP/JPEG derivatives of public/images/site'),
+    Task('assets', build_assets, deps=('products', 'images'),
+         inputs=TEMPLATE_INPUTS + ('public/css', 'public/js', 'public/images', 'css_bundle.py', 'fingerprint.py'),
+         outputs=('.build/css-bundles.json', '.build/assets.json', 'public/netlify.toml'),
+         description='CSS bundle with critical CSS, fingerprinted asset copies'),
+    Task('pages', build_pages, deps=('locations', 'images', 'assets'),
+         inputs=TEMPLATE_INPUTS + ('generate_missing_location_pages.py',),
+         outputs=('public/locaties',), params=lambda context: {'overwrite': context.overwrite_pages},
+         description='render changed location pages'),
+    Task('rewrite', rewrite_pages, deps=('pages',),
+         inputs=('templates', 'page_rewriter.py', 'add_submunicipalities.py',
+                 'fix_location_headers.py', 'update_location_pages.py'),
+         outputs=('public/locaties',), params=lambda context: {'overwrite': context.overwrite_pages},
+         description='page fixes of add_submunicipalities, fix_location_headers and update_location_pages'),
+    Task('sitemap', build_sitemap, deps=('rewrite',), inputs=('sitemap_builder.py',),
+         outputs=('public/sitemap*.xml',),
+         description='sitemap.xml'),
+    Task('docs', publish, deps=('sitemap',), inputs=('public', 'publish_docs.py'), outputs=('docs',),
+         params=lambda context: {'relative': context.relative},
+         description='publish public/ to docs/ (sync-to-docs.sh)'),
+    Task('precompress', precompress, deps=('sitemap',), inputs=('public', 'precompress.py'),
+         outputs=('.build/precompress.json',),
+         description='.gz/.br siblings in public/ for gzip_static hosts (opt-in, not in docs)'),
+]
+
+
+class InlineExecutor(Executor):
+    """Runs each submitted call right away in the calling thread"""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+
+
+class SiteBuild:
+    """Runs the tasks a set of targets needs, skipping the up-to-date ones"""
+
+    def __init__(self, tasks, manifest, context, force=False, serial=False, quiet=False):
+        self.tasks = {task.name: task for task in tasks}
+        self.manifest = manifest
+        self.context = context
+        self.force = force
+        self.serial = serial
+        self.quiet = quiet
+        self.outputs = {}
+        self.ran = []
+        self.skipped = []
+        self.failed = []
+
+    def plan(self, targets):
+        """Names of the targets and everything they depend on, in TASKS order"""
+        needed = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.tasks[name].deps)
+        return [name for name in self.tasks if name in needed]
+
+    def input_signature(self, task):
+        return hash_json({
+            'inputs': file_signature(task.inputs),
+            'deps': {dep: self.outputs[dep] for dep in task.deps},
+            'params': task.params(self.context) if task.params else None,
+        })
+
+    def is_current(self, task):
+        record = self.manifest.get(task.name)
+        return (not self.force and record is not None
+                and record['inputs'] == self.input_signature(task)
+                and record['outputs'] == file_signature(task.outputs))
+
+    def run_task(self, task, output):
+        """Run (or skip) one task, return (ran, printed text, seconds)"""
+        output.local.buffer = io.StringIO()
+        start = time.perf_counter()
+        try:
+            if self.is_current(task):
+                return False, '', time.perf_counter() - start
+            with timer(task.name):
+                task.action(self.context)
+            return True, output.local.buffer.getvalue(), time.perf_counter() - start
+        except Exception as error:
+            error.task_output = output.local.buffer.getvalue()
+            raise
+        finally:
+            output.local.buffer = None
+
+    def run(self, targets):
+        order = self.plan(targets)
+        pending = list(order)
+        done = []
+        output = TaskOutput(sys.stdout)
+        sys.stdout = output
+        executor = InlineExecutor() if self.serial else ThreadPoolExecutor(max_workers=len(order) or 1)
+        try:
+            with executor:
+                running = {}
+                while pending or running:
+                    for name in [n for n in pending if all(dep in self.outputs for dep in self.tasks[n].deps)]:
+                        pending.remove(name)
+                        running[executor.submit(self.run_task, self.tasks[name], output)] = name
+                    if not running:
+                        break
+
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name = running.pop(future)
+                        if self.finish(self.tasks[name], future):
+                            done.append(name)
+                    if self.failed:
+                        # Let the tasks already running finish, start nothing new
+                        pending = []
+        finally:
+            sys.stdout = output.stream
+            self.record(done)
+        return not self.failed
+
+    def finish(self, task, future):
+        """Print the result of a task, return True if it succeeded"""
+        try:
+            ran, text, seconds = future.result()
+        except Exception as error:
+            print(f"\n❌ {task.name} failed: {error}")
+            sys.stdout.write(getattr(error, 'task_output', ''))
+            self.manifest.remove(task.name)
+            self.failed.append(task.name)
+            return False
+
+        self.outputs[task.name] = file_signature(task.outputs)
+        if ran:
+            print(f"\n▶ {task.name} ({seconds:.2f}s)")
+            sys.stdout.write(text)
+            self.ran.append(task.name)
+        else:
+            if not self.quiet:
+                print(f"○ {task.name}: up to date")
+            self.skipped.append(task.name)
+        return True
+
+    def record(self, done):
+        """Store the signatures of the finished tasks as the build left them
+
+        Measured at the end rather than per task: tasks touch their own inputs
+        (hashed copies in public/css) and later tasks rewrite earlier outputs
+        (the page fixes), neither should make the next build run them again.
+        """
+        for name in done:
+            self.outputs[name] = file_signature(self.tasks[name].outputs)
+        for name in done:
+            self.manifest.set(name, inputs=self.input_signature(self.tasks[name]), outputs=self.outputs[name])
+        self.manifest.save()
+
+
+def list_tasks(build):
+    for task in build.tasks.values():
+        deps = f" (after {', '.join(task.deps)})" if task.deps else ''
+        print(f"   {task.name:<12} {task.description}{deps}")
+
+
+def watch_paths(tasks, order):
+    """Inputs of the planned tasks, as the files and directories to watch"""
+    paths = set()
+    for name in order:
+        for pattern in tasks[name].inputs:
+            path = os.path.dirname(pattern) if glob.has_magic(pattern) else pattern
+            if os.path.exists(path):
+                paths.add(path)
+    return sorted(paths)
+
+
+def clear_template_caches(changed):
+    """Make the next render re-read the template and components that changed"""
+    from location_template import COMPONENTS_DIR, TEMPLATE_PATH, load_components, load_template
+
+    if any(path == TEMPLATE_PATH or path.startswith(COMPONENTS_DIR + os.sep) for path in changed):
+        load_components.cache_clear()
+        load_template.cache_clear()
+
+
+def watch(targets, context, serial=False, polling=False):
+    """Rebuild `targets` after every burst of changes to their inputs
+
+    The build decides what to redo, so a CSV row change re-renders the one
+    page whose data changed and a template change every page. The build's
+    own writes wake the watcher too; those rebuilds find nothing to do and
+    print nothing.
+    """
+    def new_build():
+        return SiteBuild(TASKS, Manifest(manifest_path(MANIFEST_NAME)), context, serial=serial, quiet=True)
+
+    build = new_build()
+    watcher = create_watcher(watch_paths(build.tasks, build.plan(targets)), polling=polling)
+    build.run(targets)
+    print(f"\n👀 Watching {len(watcher.roots)} paths for changes ({type(watcher).__name__}), Ctrl+C to stop")
+
+    try:
+        for changed, first_change in watcher.bursts():
+            detected = time.perf_counter()
+            clear_template_caches(changed)
+            build = new_build()
+            ok = build.run(targets)
+            if not build.ran and ok:
+                continue
+
+            done = time.perf_counter()
+            names = ', '.join(sorted(changed)[:3]) + (f' (+{len(changed) - 3})' if len(changed) > 3 else '')
+            print(f"\n{'⏱️ ' if ok else '❌'} {names}: rebuilt {', '.join(build.ran) or 'nothing'} "
+                  f"in {(done - first_change) * 1000:.0f} ms after the first change "
+                  f"({(done - detected) * 1000:.0f} ms build)")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the site: import, pages, page fixes, sitemap and docs/')
+    parser.add_argument('targets', nargs='*', metavar='TASK',
+                        help=f"tasks to bring up to date (default: {' '.join(DEFAULT_TARGETS)})")
+    parser.add_argument('--force', action='store_true', help='run every task, even if it is up to date')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help='worker processes for rendering and compression (0 = one per CPU)')
+    parser.add_argument('--relative', action='store_true',
+                        help='publish docs/ with the build-docs.js path rewrites')
+    parser.add_argument('--overwrite-pages', action='store_true',
+                        help='let the pages and rewrite tasks replace location pages the generator did not write '
+                             '(SEO content is lost)')
+    parser.add_argument('--serial', action='store_true',
+                        help='run one task at a time in the main thread (implied by --profile, '
+                             'cProfile only sees the main thread)')
+    parser.add_argument('--list', action='store_true', help='list the tasks and exit')
+    parser.add_argument('--watch', action='store_true', help='rebuild whenever an input of the targets changes')
+    parser.add_argument('--poll', action='store_true', help='with --watch: poll for changes instead of inotify')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    context = BuildContext(jobs=args.jobs if args.jobs > 0 else (os.cpu_count() or 1), relative=args.relative,
+                           overwrite_pages=args.overwrite_pages)
+    build = SiteBuild(TASKS, Manifest(manifest_path(MANIFEST_NAME)), context,
+                      force=args.force, serial=args.serial or args.profile)
+    if args.list:
+        list_tasks(build)
+        return
+
+    targets = args.targets or DEFAULT_TARGETS
+    unknown = [name for name in targets if name not in build.tasks]
+    if unknown:
+        parser.error(f"unknown task(s): {', '.join(unknown)} (see --list)")
+
+    if args.watch:
+        watch(targets, context, serial=args.serial, polling=args.poll)
+        return
+
+    start_run('sitebuild', profile=args.profile)
+    start = time.perf_counter()
+    ok = build.run(targets)
+
+    print(f"\n{'✅' if ok else '❌'} {len(build.ran)} tasks run, {len(build.skipped)} up to date"
+          f"{', ' + str(len(build.failed)) + ' failed' if build.failed else ''} "
+          f"in {time.perf_counter() - start:.2f}s")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Generate public/sitemap.xml from the site pages and the location index
+
+Static pages are listed in PAGES; location URLs come from the municipalities
+in the location index that have a page under public/locaties/. Each entry's
+lastmod is the date its page content last changed, tracked per URL in the
+.build/sitemap.json manifest (size and mtime first, so unchanged pages are
+not re-hashed). URLs without a manifest record keep the lastmod the current
+sitemap already publishes.
+
+Past MAX_URLS entries the sitemap is split into sitemap-1.xml, sitemap-2.xml,
+... and sitemap.xml becomes the sitemap index pointing at them.
+
+Usage:
+    python3 sitemap_builder.py
+    python3 sitemap_builder.py --max-urls 50   # force a sitemap index
+"""
+import argparse
+import io
+import os
+import xml.etree.ElementTree as ET
+from datetime import date
+from xml.sax.saxutils import XMLGenerator
+
+from build_manifest import Manifest, hash_file, manifest_path, write_if_changed
+from locations import load_index
+
+SITE_URL = 'https://tafeltotaal.com'
+PUBLIC_DIR = 'public'
+LOCATIES_DIR = 'public/locaties'
+SITEMAP_NAME = 'sitemap.xml'
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+# Sitemap protocol limit per file
+MAX_URLS = 50000
+
+# (path, changefreq, priority); location pages are listed after /locaties
+PAGES = [
+    ('/', 'weekly', '1.0'),
+    ('/producten', 'weekly', '0.9'),
+    ('/product', 'weekly', '0.7'),
+    ('/pakketten', 'weekly', '0.9'),
+    ('/pakket', 'weekly', '0.7'),
+    ('/locaties', 'weekly', '0.8'),
+    ('/over-ons', 'monthly', '0.7'),
+    ('/hoe-werkt-het', 'monthly', '0.7'),
+    ('/faq', 'monthly', '0.7'),
+    ('/contact', 'monthly', '0.7'),
+    ('/voor-wie/bedrijven', 'monthly', '0.7'),
+    ('/voor-wie/bruiloften', 'monthly', '0.7'),
+    ('/voor-wie/evenementen', 'monthly', '0.7'),
+    ('/voor-wie/particulieren', 'monthly', '0.7'),
+    ('/algemene-voorwaarden', 'yearly', '0.3'),
+    ('/privacy', 'yearly', '0.3'),
+    ('/cookies', 'yearly', '0.3'),
+    ('/borg-schade', 'yearly', '0.3'),
+    ('/levering-retour', 'yearly', '0.4'),
+    ('/sitemap', 'weekly', '0.5'),
+]
+
+LOCATION_CHANGEFREQ = 'monthly'
+LOCATION_PRIORITY = '0.6'
+
+def page_file(path, public_dir=PUBLIC_DIR):
+    """File that serves a URL path"""
+    return os.path.join(public_dir, path.strip('/'), 'index.html')
+
+
+def location_paths(index, locaties_dir=LOCATIES_DIR):
+    """URL paths of the municipalities in the index that have a page, in slug
+    order, and the municipalities that do not have one yet (they get no URL)
+
+    Directories under locaties/ for places no longer in the index are left
+    out, so a stale page drops from the sitemap.
+    """
+    slugs = []
+    missing = []
+    for slug in index.municipalities:
+        if os.path.isfile(os.path.join(locaties_dir, slug, 'index.html')):
+            slugs.append(slug)
+        else:
+            missing.append(slug)
+    return [f'/locaties/{slug}' for slug in sorted(slugs)], sorted(missing)
+
+
+def iter_pages(index, locaties_dir=LOCATIES_DIR):
+    """Yield (path, changefreq, priority) for every URL in the sitemap"""
+    paths, _ = location_paths(index, locaties_dir)
+    for page in PAGES:
+        yield page
+        if page[0] == '/locaties':
+            for path in paths:
+                yield path, LOCATION_CHANGEFREQ, LOCATION_PRIORITY
+
+
+def published_lastmods(sitemap_dir):
+    """loc -> lastmod from the sitemap(s) currently on disk"""
+    lastmods = {}
+    pending = [os.path.join(sitemap_dir, SITEMAP_NAME)]
+    while pending:
+        try:
+            tree = ET.parse(pending.pop())
+        except (FileNotFoundError, ET.ParseError):
+            continue
+        for entry in tree.getroot():
+            loc = entry.findtext(f'{{{SITEMAP_NS}}}loc')
+            lastmod = entry.findtext(f'{{{SITEMAP_NS}}}lastmod')
+            if entry.tag == f'{{{SITEMAP_NS}}}sitemap':
+                pending.append(os.path.join(sitemap_dir, os.path.basename(loc)))
+            elif loc and lastmod:
+                lastmods[loc] = lastmod
+    return lastmods
+
+
+class LastmodTracker:
+    """Date each page's content last changed, backed by a manifest"""
+
+    def __init__(self, manifest, published, today):
+        self.manifest = manifest
+        self.published = published
+        self.today = today
+        self.changed = 0
+
+    def lastmod(self, path, filename):
+        try:
+            stat = os.stat(filename)
+        except FileNotFoundError:
+            return None
+
+        entry = self.manifest.get(path)
+        if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+            return entry['lastmod']
+
+        content_hash = hash_file(filename)
+        if entry and entry['hash'] == content_hash:
+            lastmod = entry['lastmod']
+        elif entry is None and SITE_URL + path in self.published:
+            lastmod = self.published[SITE_URL + path]
+        else:
+            lastmod = self.today
+            self.changed += 1
+
+        self.manifest.set(path, size=stat.st_size, mtime=stat.st_mtime_ns,
+                          hash=content_hash, lastmod=lastmod)
+        return lastmod
+
+
+class SitemapWriter:
+    """Writes indented sitemap XML with XMLGenerator into a byte buffer"""
+
+    def __init__(self, root):
+        self.buffer = io.BytesIO()
+        self.xml = XMLGenerator(self.buffer, encoding='UTF-8', short_empty_elements=True)
+        self.root = root
+        self.xml.startDocument()
+        self.xml.startElement(root, {'xmlns': SITEMAP_NS})
+
+    def entry(self, tag, fields):
+        xml = self.xml
+        xml.ignorableWhitespace('\n  ')
+        xml.startElement(tag, {})
+        for name, value in fields:
+            if value is None:
+                continue
+            xml.ignorableWhitespace('\n    ')
+            xml.startElement(name, {})
+            xml.characters(value)
+            xml.endElement(name)
+        xml.ignorableWhitespace('\n  ')
+        xml.endElement(tag)
+
+    def close(self):
+        self.xml.ignorableWhitespace('\n')
+        self.xml.endElement(self.root)
+        self.xml.endDocument()
+        return self.buffer.getvalue() + b'\n'
+
+
+def build_sitemaps(pages, tracker, max_urls=MAX_URLS, public_dir=PUBLIC_DIR):
+    """Render the sitemap file(s), return {filename: bytes}"""
+    parts = []
+    writer = None
+    for path, changefreq, priority in pages:
+        if writer is None or len(parts[-1][1]) >= max_urls:
+            writer = SitemapWriter('urlset')
+            parts.append((writer, []))
+        lastmod = tracker.lastmod(path, page_file(path, public_dir))
+        writer.entry('url', [('loc', SITE_URL + path), ('lastmod', lastmod),
+                             ('changefreq', changefreq), ('priority', priority)])
+        parts[-1][1].append(lastmod)
+
+    if len(parts) == 1:
+        return {SITEMAP_NAME: parts[0][0].close()}
+
+    files = {}
+    index = SitemapWriter('sitemapindex')
+    for number, (writer, lastmods) in enumerate(parts, 1):
+        filename = f'sitemap-{number}.xml'
+        files[filename] = writer.close()
+        part_lastmod = max((lastmod for lastmod in lastmods if lastmod), default=None)
+        index.entry('sitemap', [('loc', f'{SITE_URL}/{filename}'), ('lastmod', part_lastmod)])
+    files[SITEMAP_NAME] = index.close()
+    return files
+
+
+def write_sitemaps(files, public_dir=PUBLIC_DIR):
+    """Write the sitemap files and remove parts left over from a larger build"""
+    written = [name for name, content in files.items()
+               if write_if_changed(os.path.join(public_dir, name), content)]
+
+    removed = []
+    for filename in os.listdir(public_dir):
+        if filename.startswith('sitemap-') and filename.endswith('.xml') and filename[8:-4].isdigit():
+            if filename not in files:
+                os.remove(os.path.join(public_dir, filename))
+                removed.append(filename)
+    return written, removed
+
+
+def update_sitemap(index, max_urls=MAX_URLS):
+    """Rewrite the sitemap file(s) for a LocationIndex"""
+    manifest = Manifest(manifest_path('sitemap'))
+    tracker = LastmodTracker(manifest, published_lastmods(PUBLIC_DIR), date.today().isoformat())
+
+    pages = list(iter_pages(index))
+    files = build_sitemaps(pages, tracker, max_urls)
+
+    manifest.prune({path for path, _, _ in pages})
+    manifest.save()
+    written, removed = write_sitemaps(files)
+
+    _, missing = location_paths(index)
+    print(f"✓ {len(pages)} URLs in {len(files)} sitemap file(s), {tracker.changed} with a new lastmod")
+    print(f"   Written: {', '.join(written) or 'nothing, already up to date'}")
+    if removed:
+        print(f"   Removed: {', '.join(removed)}")
+    if missing:
+        print(f"⚠️  {len(missing)} municipalities without a page: {', '.join(missing)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate sitemap.xml from the site and location pages')
+    parser.add_argument('--max-urls', type=int, default=MAX_URLS,
+                        help='split into a sitemap index above this many URLs per file')
+    args = parser.parse_args()
+
+    update_sitemap(load_index(), args.max_urls)
+
+
+if __name__ == '__main__':
+    main()
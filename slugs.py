@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Shared slugify for location names
+
+One implementation for every script: lower-case, fold accents with Unicode
+NFKD, map letters NFKD cannot decompose through a translation table, and join
+the remaining alphanumeric runs with hyphens. Results are memoized, since the
+same hoofdgemeente names come back for every deelgemeente row.
+
+Usage:
+    python3 slugs.py --check   # compare against the old per-script slugify versions
+    python3 slugs.py --bench   # throughput over every name in the CSV
+"""
+import argparse
+import re
+import time
+import unicodedata
+from functools import lru_cache
+
+CSV_PATH = 'import-data/locations.csv'
+
+# Letters without an NFKD decomposition to ASCII
+SPECIAL_LETTERS = str.maketrans({
+    'ß': 'ss', 'æ': 'ae', 'œ': 'oe', 'ø': 'o', 'ł': 'l', 'đ': 'd', 'ð': 'd', 'þ': 'th',
+})
+
+# Drop the combining marks NFKD splits off
+COMBINING_MARKS = dict.fromkeys(
+    i for i in range(0x300, 0x370) if unicodedata.combining(chr(i))
+)
+
+NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+@lru_cache(maxsize=8192)
+def slugify(name):
+    """Convert name to URL-friendly slug"""
+    slug = name.lower()
+
+    if not slug.isascii():
+        slug = unicodedata.normalize('NFKD', slug.translate(SPECIAL_LETTERS))
+        slug = slug.translate(COMBINING_MARKS)
+
+    return NON_ALNUM.sub('-', slug).strip('-')
+
+
+# Previous per-script implementations, kept only for --check and --bench
+
+def _legacy_import_locations(name):
+    slug = name.lower()
+    replacements = {
+        'à': 'a', 'á': 'a', 'â': 'a', 'ä': 'a',
+        'è': 'e', 'é': 'e', 'ê': 'e', 'ë': 'e',
+        'ï': 'i', 'î': 'i', 'ì': 'i', 'í': 'i',
+        'ô': 'o', 'ö': 'o', 'ò': 'o', 'ó': 'o',
+        'ü': 'u', 'û': 'u', 'ù': 'u', 'ú': 'u',
+        'ç': 'c', 'ñ': 'n'
+    }
+    for old, new in replacements.items():
+        slug = slug.replace(old, new)
+    slug = re.sub(r'[^a-z0-9]+', '-', slug)
+    return slug.strip('-')
+
+
+def _legacy_generate_complete_locations(name):
+    slug = name.lower()
+    slug = slug.replace('à', 'a').replace('á', 'a').replace('â', 'a')
+    slug = slug.replace('è', 'e').replace('é', 'e').replace('ê', 'e').replace('ë', 'e')
+    slug = slug.replace('ï', 'i').replace('î', 'i')
+    slug = slug.replace('ô', 'o').replace('ö', 'o')
+    slug = slug.replace('ü', 'u').replace('û', 'u')
+    slug = re.sub(r'[^a-z0-9]+', '-', slug)
+    return slug.strip('-')
+
+
+def _legacy_update_locations_complete(name):
+    return name.lower().replace(' ', '-').replace('à', 'a').replace('é', 'e').replace('è', 'e').replace('ë', 'e').replace('ï', 'i').replace('ô', 'o').replace('ü', 'u')
+
+
+LEGACY_IMPLEMENTATIONS = {
+    'import_locations_from_csv': _legacy_import_locations,
+    'generate_complete_locations': _legacy_generate_complete_locations,
+    'update_locations_complete': _legacy_update_locations_complete,
+}
+
+
+def csv_names(csv_path=CSV_PATH):
+    """Every name the importer slugifies: place names and hoofdgemeente groups"""
+    from import_locations_from_csv import iter_csv_rows
+
+    names = []
+    for _, _, name, _, parent_group in iter_csv_rows(csv_path):
+        names.append(name)
+        names.append(parent_group)
+    return names
+
+
+def check(names):
+    """Report every name whose slug differs between old and new implementations"""
+    differences = 0
+    for name in sorted(set(names)):
+        new = slugify(name)
+        for label, legacy in LEGACY_IMPLEMENTATIONS.items():
+            old = legacy(name)
+            if old != new:
+                differences += 1
+                print(f"⚠️  {name!r}: {label} gives {old!r}, slugs.slugify gives {new!r}")
+
+    if differences:
+        print(f"\n❌ {differences} slug differences across {len(set(names))} names")
+    else:
+        print(f"✅ All {len(set(names))} names slugify identically")
+    return differences
+
+
+def bench(names, rounds=20):
+    """Names per second for each implementation over the full CSV"""
+    def measure(func):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for name in names:
+                func(name)
+        return len(names) * rounds / (time.perf_counter() - start)
+
+    print(f"⏱️  {len(names)} names x {rounds} rounds")
+    slugify.cache_clear()
+    print(f"   {'slugs.slugify (uncached)':<40} {measure(slugify.__wrapped__):>12,.0f} names/s")
+    print(f"   {'slugs.slugify (memoized)':<40} {measure(slugify):>12,.0f} names/s")
+    for label, legacy in LEGACY_IMPLEMENTATIONS.items():
+        print(f"   {label:<40} {measure(legacy):>12,.0f} names/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check and benchmark the shared slugify')
+    parser.add_argument('--check', action='store_true', help='flag slugs that differ from the old implementations')
+    parser.add_argument('--bench', action='store_true', help='measure throughput over the CSV names')
+    parser.add_argument('--csv', default=CSV_PATH)
+    args = parser.parse_args()
+
+    names = csv_names(args.csv)
+
+    if args.check or not args.bench:
+        check(names)
+    if args.bench:
+        bench(names)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,6 @@
 #!/bin/bash
 # Sync public folder to docs folder for GitHub Pages deployment
-# Excludes CNAME file to preserve custom domain configuration
+# Only changed files are copied; CNAME, .git and node_modules are left alone
+# (see publish_docs.py, pass --relative for the build-docs.js path rewrites)
 
-rsync -av --delete \
-  --exclude '.git' \
-  --exclude 'node_modules' \
-  --exclude 'CNAME' \
-  public/ docs/
-
-echo "✓ Synced public/ to docs/ (CNAME preserved)"
+python3 "$(dirname "$0")/publish_docs.py" "$@"
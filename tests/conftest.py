@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+# The build scripts are flat modules in the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def in_repo(monkeypatch):
+    """Run from the repository root, where the scripts find templates/ and public/"""
+    monkeypatch.chdir(ROOT)
+    return ROOT
@@ -0,0 +1,70 @@
+import json
+
+from build_manifest import MANIFEST_VERSION, Manifest, hash_bytes, hash_file, hash_json, write_if_changed
+
+
+def test_hash_json_ignores_key_order():
+    assert hash_json({'a': 1, 'b': [1, 2]}) == hash_json({'b': [1, 2], 'a': 1})
+    assert hash_json({'a': 1}) != hash_json({'a': 2})
+
+
+def test_hash_file(tmp_path):
+    path = tmp_path / 'page.html'
+    assert hash_file(path) is None
+    path.write_bytes(b'<html>')
+    assert hash_file(path) == hash_bytes(b'<html>')
+
+
+def test_write_if_changed(tmp_path):
+    path = tmp_path / 'page.html'
+    assert write_if_changed(path, b'one')
+    mtime = path.stat().st_mtime_ns
+    assert not write_if_changed(path, b'one')
+    assert path.stat().st_mtime_ns == mtime
+    assert write_if_changed(path, b'two')
+    assert path.read_bytes() == b'two'
+    assert [p.name for p in tmp_path.iterdir()] == ['page.html']
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / 'build' / 'pages.json'
+    manifest = Manifest(path)
+    manifest.set('brugge', input='a', output='b')
+    assert manifest.save()
+
+    loaded = Manifest(path)
+    assert loaded.get('brugge') == {'input': 'a', 'output': 'b'}
+    assert not loaded.dirty
+
+
+def test_save_only_when_changed(tmp_path):
+    manifest = Manifest(tmp_path / 'pages.json')
+    assert not manifest.save()
+
+    manifest.set('brugge', input='a')
+    assert manifest.save()
+    manifest.set('brugge', input='a')
+    assert not manifest.save()
+
+
+def test_remove_and_prune(tmp_path):
+    manifest = Manifest(tmp_path / 'pages.json')
+    for slug in ('aalst', 'brugge', 'gent'):
+        manifest.set(slug, input=slug)
+    manifest.save()
+
+    manifest.remove('missing')
+    assert not manifest.dirty
+    manifest.remove('aalst')
+    assert manifest.prune({'gent'}) == ['brugge']
+    assert list(manifest.entries) == ['gent']
+    assert manifest.dirty
+
+
+def test_corrupt_or_old_manifest_starts_empty(tmp_path):
+    path = tmp_path / 'pages.json'
+    path.write_text('{not json')
+    assert Manifest(path).entries == {}
+
+    path.write_text(json.dumps({'version': MANIFEST_VERSION - 1, 'entries': {'brugge': {}}}))
+    assert Manifest(path).entries == {}
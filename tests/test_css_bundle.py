@@ -0,0 +1,19 @@
+from css_bundle import minify_css, rebase_urls
+
+
+def test_minify_keeps_strings_and_drops_the_last_semicolon():
+    css = 'a::after { content: ";}"; color: red; }\n/* note */ b { margin: 0 ; }'
+    assert minify_css(css) == 'a::after{content:";}";color:red}b{margin:0}'
+
+
+def test_rebase_relative_urls_under_the_site_prefix():
+    css = "a{background:url(../images/x.png)}b{background:url('fonts/f.woff2')}"
+    assert rebase_urls(css, '/css/pages/location.css') == (
+        "a{background:url(/Tafel-Totaal/css/images/x.png)}"
+        "b{background:url('/Tafel-Totaal/css/pages/fonts/f.woff2')}"
+    )
+
+
+def test_rebase_leaves_absolute_urls_alone():
+    css = 'a{background:url("/images/y.png")}b{background:url(data:image/png;base64,AA)}'
+    assert rebase_urls(css, '/css/main.css') == css
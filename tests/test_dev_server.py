@@ -0,0 +1,38 @@
+from functools import partial
+
+from build_manifest import Manifest, hash_bytes
+from dev_server import DevSite
+from generate_missing_location_pages import page_path
+from locations import load_locations
+
+
+def write_page(locaties_dir, slug, content):
+    page_path(locaties_dir, slug).parent.mkdir(parents=True, exist_ok=True)
+    page_path(locaties_dir, slug).write_bytes(content)
+
+
+def test_hand_made_pages_are_served_from_disk(in_repo, tmp_path, monkeypatch):
+    monkeypatch.setattr('build_manifest.BUILD_DIR', str(tmp_path))
+    monkeypatch.setattr('dev_server.load_locations', partial(load_locations))
+    locaties_dir = str(tmp_path / 'locaties')
+    # gent was written by the generator, brugge is hand-made, aalst has no page yet
+    write_page(locaties_dir, 'gent', b'<html>Gent</html>')
+    write_page(locaties_dir, 'brugge', b'<html>Brugge</html>')
+    manifest = Manifest(tmp_path / 'location-pages.json')
+    manifest.set('gent', input='', output=hash_bytes(b'<html>Gent</html>'), sizes=[0, 0])
+    manifest.save()
+
+    site = DevSite(locaties_dir=locaties_dir)
+    site.refresh()
+    assert site.lookup('gent') is not None
+    assert site.lookup('aalst') is not None
+    assert site.lookup('brugge') is None
+
+    # Once the generated page is edited by hand it is no longer rendered either
+    write_page(locaties_dir, 'gent', b'<html>Gent, edited</html>')
+    site.refresh()
+    assert site.lookup('gent') is None
+
+    site = DevSite(locaties_dir=locaties_dir, overwrite_pages=True)
+    site.refresh()
+    assert site.lookup('brugge') is not None
@@ -0,0 +1,23 @@
+import json
+
+from featured_products import format_price, product_cards, read_source
+
+PRODUCTS = [
+    {'id': 1, 'name': 'Dinerbord', 'category_name': 'Borden', 'price_per_day': '0.45', 'images': []},
+    {'id': 2, 'name': 'Nieuw glas', 'category_name': 'Glazen', 'price_per_day': None, 'images': []},
+]
+
+
+def test_format_price():
+    assert format_price('1234.5') == '€\xa01.234,50'
+    assert format_price(0.455) == '€\xa00,46'
+
+
+def test_products_without_a_price_are_skipped(tmp_path):
+    source = tmp_path / 'products.json'
+    source.write_text(json.dumps({'success': True, 'data': PRODUCTS}), encoding='utf-8')
+
+    assert [product['id'] for product in read_source(str(source))] == [1]
+    cards = product_cards(PRODUCTS)
+    assert cards.count('class="product-card"') == 1
+    assert 'Nieuw glas' not in cards
@@ -0,0 +1,18 @@
+from build_manifest import Manifest
+from fingerprint import Fingerprinter
+
+
+def test_stale_copies_go_without_a_manifest(tmp_path):
+    (tmp_path / 'js').mkdir()
+    source = tmp_path / 'js' / 'app.js'
+    source.write_text('console.log(1)')
+    first = Fingerprinter(Manifest(tmp_path / 'a.json'), str(tmp_path)).fingerprint('/js/app.js')
+
+    # A fresh checkout: the old copy is on disk, the manifest is not
+    source.write_text('console.log(2)')
+    fingerprinter = Fingerprinter(Manifest(tmp_path / 'b.json'), str(tmp_path))
+    second = fingerprinter.fingerprint('/js/app.js')
+
+    assert second != first
+    assert fingerprinter.removed == [first]
+    assert {path.name for path in (tmp_path / 'js').iterdir()} == {'app.js', second.split('/')[-1]}
@@ -0,0 +1,37 @@
+from build_manifest import Manifest
+from generate_missing_location_pages import generate_incremental, generate_missing, page_path
+
+DATA = {
+    'west-vlaanderen': [
+        {'name': 'Brugge', 'slug': 'brugge', 'postal_codes': ['8000'], 'parent': None},
+        {'name': 'Assebroek', 'slug': 'brugge', 'postal_codes': ['8310'], 'parent': 'Brugge'},
+        {'name': 'Kortrijk', 'slug': 'kortrijk', 'postal_codes': ['8500'], 'parent': None},
+    ],
+    'oost-vlaanderen': [
+        {'name': 'Aalst', 'slug': 'aalst', 'postal_codes': ['9300'], 'parent': None},
+        {'name': 'Gent', 'slug': 'gent', 'postal_codes': ['9000'], 'parent': None},
+    ],
+}
+SLUGS = ('aalst', 'brugge', 'gent', 'kortrijk')
+
+
+def pages(locaties_dir):
+    return {slug: page_path(locaties_dir, slug).read_bytes() for slug in SLUGS}
+
+
+def test_worker_processes_write_the_same_pages(in_repo, tmp_path):
+    generate_incremental(DATA, tmp_path / 'serial', Manifest(tmp_path / 'serial.json'), workers=1)
+    counts = generate_incremental(DATA, tmp_path / 'pool', Manifest(tmp_path / 'pool.json'), workers=2)
+
+    assert counts['created'] == len(SLUGS)
+    assert pages(tmp_path / 'pool') == pages(tmp_path / 'serial')
+    assert Manifest(tmp_path / 'pool.json').entries == Manifest(tmp_path / 'serial.json').entries
+
+
+def test_generate_missing_leaves_existing_pages(in_repo, tmp_path):
+    page_path(tmp_path, 'gent').parent.mkdir(parents=True)
+    page_path(tmp_path, 'gent').write_bytes(b'<html>Gent</html>')
+
+    generate_missing(DATA, tmp_path, workers=2)
+    assert page_path(tmp_path, 'gent').read_bytes() == b'<html>Gent</html>'
+    assert all(page_path(tmp_path, slug).exists() for slug in SLUGS)
@@ -0,0 +1,24 @@
+import pytest
+
+from build_manifest import Manifest
+from image_pipeline import run_pipeline
+
+Image = pytest.importorskip('PIL.Image')
+
+
+def test_same_stem_different_extension(tmp_path):
+    source_dir = tmp_path / 'site'
+    source_dir.mkdir()
+    Image.new('RGB', (400, 200), 'white').save(source_dir / 'hero.jpg')
+    Image.new('RGB', (400, 200), 'black').save(source_dir / 'hero.png')
+    Image.new('RGBA', (64, 64)).save(source_dir / 'Logo-Zwart.png')
+    Image.new('RGBA', (32, 32)).save(source_dir / 'favicon.png')
+
+    manifest = Manifest(tmp_path / 'images.json')
+    encoded, _ = run_pipeline(manifest, str(source_dir), str(tmp_path / 'out'))
+
+    assert encoded == ['hero.jpg', 'hero.png']
+    names = {fmt: [name for _, name, _ in variants]
+             for fmt, variants in manifest.get('hero.png')['variants'].items()}
+    assert names['jpeg'] == ['hero-png-320.jpg', 'hero-png-400.jpg']
+    assert 'hero-jpg-400.jpg' in {path.name for path in (tmp_path / 'out').iterdir()}
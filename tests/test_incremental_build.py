@@ -0,0 +1,96 @@
+import copy
+
+import pytest
+
+from build_manifest import Manifest
+from generate_missing_location_pages import generate_incremental, page_path
+from location_template import render_location_bytes
+
+DATA = {
+    'west-vlaanderen': [
+        {'name': 'Assebroek', 'slug': 'brugge', 'postal_codes': ['8310'], 'parent': 'Brugge'},
+        {'name': 'Brugge', 'slug': 'brugge', 'postal_codes': ['8000'], 'parent': None},
+    ],
+    'oost-vlaanderen': [
+        {'name': 'Aalst', 'slug': 'aalst', 'postal_codes': ['9300'], 'parent': None},
+    ],
+}
+
+HAND_MADE = b'<html><body><h2>Borden Huren in Aalst</h2></body></html>'
+
+
+@pytest.fixture
+def site(in_repo, tmp_path):
+    locaties_dir = tmp_path / 'locaties'
+    manifest_file = tmp_path / 'location-pages.json'
+
+    def build(data=DATA, force=False):
+        return generate_incremental(data, locaties_dir, Manifest(manifest_file), force=force)
+
+    build.page = lambda slug: page_path(locaties_dir, slug)
+    build.manifest = lambda: Manifest(manifest_file)
+    return build
+
+
+def test_first_build_creates_every_page(site):
+    counts = site()
+    assert (counts['created'], counts['updated'], counts['unchanged']) == (2, 0, 0)
+    assert b'Assebroek' in site.page('brugge').read_bytes()
+    assert set(site.manifest().entries) == {'aalst', 'brugge'}
+
+
+def test_unchanged_pages_are_not_rewritten(site):
+    site()
+    mtimes = {slug: site.page(slug).stat().st_mtime_ns for slug in ('aalst', 'brugge')}
+
+    counts = site()
+    assert (counts['created'], counts['updated'], counts['unchanged']) == (0, 0, 2)
+    assert {slug: site.page(slug).stat().st_mtime_ns for slug in mtimes} == mtimes
+
+
+def test_only_the_changed_page_is_updated(site):
+    site()
+    data = copy.deepcopy(DATA)
+    data['west-vlaanderen'].append({'name': 'Sint-Kruis', 'slug': 'brugge', 'postal_codes': ['8310'],
+                                    'parent': 'Brugge'})
+
+    counts = site(data)
+    assert (counts['updated'], counts['unchanged']) == (1, 1)
+    assert b'Sint-Kruis' in site.page('brugge').read_bytes()
+
+
+def test_hand_made_page_is_kept_without_a_manifest(site):
+    site.page('aalst').parent.mkdir(parents=True)
+    site.page('aalst').write_bytes(HAND_MADE)
+
+    counts = site()
+    assert (counts['created'], counts['kept']) == (1, 1)
+    assert site.page('aalst').read_bytes() == HAND_MADE
+    assert site.manifest().get('aalst') is None
+
+
+def test_page_edited_after_the_build_is_kept(site):
+    site()
+    site.page('aalst').write_bytes(HAND_MADE)
+
+    assert site()['kept'] == 1
+    assert site.page('aalst').read_bytes() == HAND_MADE
+
+
+def test_force_overwrites_hand_made_pages(site):
+    site.page('aalst').parent.mkdir(parents=True)
+    site.page('aalst').write_bytes(HAND_MADE)
+
+    counts = site(force=True)
+    assert (counts['created'], counts['updated'], counts['kept']) == (1, 1, 0)
+    assert site.page('aalst').read_bytes() != HAND_MADE
+
+
+def test_page_already_rendered_is_adopted(site):
+    location, = DATA['oost-vlaanderen']
+    site.page('aalst').parent.mkdir(parents=True)
+    site.page('aalst').write_bytes(render_location_bytes(location, 'oost'))
+
+    counts = site()
+    assert (counts['unchanged'], counts['kept']) == (1, 0)
+    assert site.manifest().get('aalst') is not None
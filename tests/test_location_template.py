@@ -0,0 +1,28 @@
+import pytest
+
+from location_template import load_template, render_location_bytes, unminified_size
+
+BRUGGE = {'name': 'Brugge', 'slug': 'brugge', 'postal_codes': ['8000'], 'parent': None}
+
+
+@pytest.fixture
+def template(in_repo):
+    return load_template()
+
+
+def test_header_and_footer_are_inlined(template):
+    page = render_location_bytes(BRUGGE, 'west', template=template, minify=False)
+    assert b'<header class="site-header" id="site-header">' in page
+    assert b'<footer' in page
+    assert b'{{' not in page
+    # Their hashes are part of each page's input hash
+    assert {'header', 'footer'} <= set(template.components)
+
+
+@pytest.mark.parametrize('children', [(), ({'name': 'Assebroek', 'postal_codes': ['8310']},)])
+def test_minified_page(template, children):
+    full = render_location_bytes(BRUGGE, 'west', children, template=template, minify=False)
+    minified = render_location_bytes(BRUGGE, 'west', children, template=template)
+    assert len(minified) < len(full)
+    assert (b'Assebroek' in minified) == bool(children)
+    assert unminified_size(BRUGGE, 'west', children, template=template) == len(full)
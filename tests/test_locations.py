@@ -0,0 +1,79 @@
+import pytest
+
+from import_locations_from_csv import build_location_shards, parse_csv
+from locations import LocationIndex, load_locations
+
+# Deelgemeenten listed before their hoofdgemeente, as in the real CSV
+CSV = """provincie,postcode,plaats,Type,hoofdgemeente
+Oost-Vlaanderen,9170,De Klinge,Deelgemeente,SINT-GILLIS-WAAS
+Oost-Vlaanderen,9170,Sint-Gillis-Waas,Hoofdgemeente,SINT-GILLIS-WAAS
+Oost-Vlaanderen,9100,Nieuwkerken-Waas,Deelgemeente,SINT-NIKLAAS
+Oost-Vlaanderen,9100,Sint-Niklaas,Hoofdgemeente,SINT-NIKLAAS
+Oost-Vlaanderen,9520,Bavegem,Deelgemeente,SINT-LIEVENS-HOUTEM
+Oost-Vlaanderen,9520,Sint-Lievens-Houtem,Hoofdgemeente,SINT-LIEVENS-HOUTEM
+West-Vlaanderen,8300,Knokke,Deelgemeente,KNOKKE-HEIST
+West-Vlaanderen,8301,Heist-aan-Zee,Deelgemeente,KNOKKE-HEIST
+Oost-Vlaanderen,9120,Melsele,Deelgemeente,BEVEREN-KRUIBEKE-ZWIJNDRECHT
+Oost-Vlaanderen,9150,Kruibeke,Deelgemeente,BEVEREN-KRUIBEKE-ZWIJNDRECHT
+"""
+
+
+@pytest.fixture
+def index(tmp_path):
+    csv_path = tmp_path / 'locations.csv'
+    csv_path.write_text(CSV, encoding='utf-8')
+    return LocationIndex(parse_csv(str(csv_path)))
+
+
+def names(index, postal_code):
+    return [municipality.name for municipality in index.municipalities_for_postcode(postal_code)]
+
+
+@pytest.mark.parametrize('postal_code, municipality', [
+    ('9170', 'Sint-Gillis-Waas'),
+    ('9100', 'Sint-Niklaas'),
+    ('9520', 'Sint-Lievens-Houtem'),
+])
+def test_sint_municipalities_stay_apart(index, postal_code, municipality):
+    assert names(index, postal_code) == [municipality]
+
+
+def test_deelgemeenten_use_the_full_parent_slug(index):
+    assert index.municipality('sint') is None
+    assert [location.slug for location in index.by_postal_code('9170')] == ['sint-gillis-waas'] * 2
+
+
+def test_parent_without_hoofdgemeente_row(index):
+    municipality = index.municipality('knokke-heist')
+    assert municipality.name == 'Knokke-Heist'
+    assert municipality.postal_codes == ('8300', '8301')
+
+
+def test_no_shard_for_a_first_word(tmp_path):
+    csv_path = tmp_path / 'locations.csv'
+    csv_path.write_text(CSV, encoding='utf-8')
+    shards = build_location_shards(parse_csv(str(csv_path)))
+    assert 'sint' not in shards
+    assert sorted(shards) == ['beveren', 'knokke-heist', 'sint-gillis-waas', 'sint-lievens-houtem', 'sint-niklaas']
+
+
+def test_merged_municipality_keeps_the_page_slug(index):
+    assert [m.slug for m in index.lookup('Melsele')] == ['beveren']
+    assert [m.slug for m in index.lookup('9150')] == ['beveren']
+    assert index.municipality('beveren-kruibeke-zwijndrecht') is None
+
+
+def test_lookup(index):
+    assert [m.slug for m in index.lookup('Sint-Niklaas')] == ['sint-niklaas']
+    assert [m.slug for m in index.lookup('heist-aan-zee')] == ['knokke-heist']
+    assert [m.slug for m in index.lookup(' 8301 ')] == ['knokke-heist']
+
+
+@pytest.mark.parametrize('postal_code, municipality', [
+    ('9170', 'Sint-Gillis-Waas'),
+    ('9100', 'Sint-Niklaas'),
+    ('9120', 'Beveren-Kruibeke-Zwijndrecht'),
+])
+def test_real_dataset(in_repo, tmp_path, postal_code, municipality):
+    index = LocationIndex(load_locations(cache_path=str(tmp_path / 'locations.marshal')))
+    assert names(index, postal_code) == [municipality]
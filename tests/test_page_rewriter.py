@@ -0,0 +1,42 @@
+from build_manifest import Manifest
+from generate_missing_location_pages import generate_incremental, page_path
+from page_rewriter import location_pages
+
+DATA = {
+    'west-vlaanderen': [
+        {'name': 'Brugge', 'slug': 'brugge', 'postal_codes': ['8000'], 'parent': None},
+        {'name': 'Kortrijk', 'slug': 'kortrijk', 'postal_codes': ['8500'], 'parent': None},
+    ],
+    'oost-vlaanderen': [
+        {'name': 'Aalst', 'slug': 'aalst', 'postal_codes': ['9300'], 'parent': None},
+    ],
+}
+
+
+def slugs(pages):
+    return [page.slug for page in pages]
+
+
+def test_only_generated_pages_are_rewritten(in_repo, tmp_path):
+    # aalst is hand-made, kortrijk was generated and edited afterwards
+    page_path(tmp_path, 'aalst').parent.mkdir(parents=True)
+    page_path(tmp_path, 'aalst').write_bytes(b'<html>Aalst</html>')
+    manifest = Manifest(tmp_path / 'location-pages.json')
+    generate_incremental(DATA, tmp_path, manifest)
+    with open(page_path(tmp_path, 'kortrijk'), 'ab') as f:
+        f.write(b'<!-- edited -->')
+
+    assert slugs(location_pages(tmp_path, manifest=manifest)) == ['brugge']
+    assert slugs(location_pages(tmp_path, slugs={'aalst'}, manifest=manifest)) == []
+    assert slugs(location_pages(tmp_path, overwrite=True, manifest=manifest)) == ['aalst', 'brugge', 'kortrijk']
+
+
+def test_submunicipality_rules_only_touch_main_cities(in_repo):
+    from add_submunicipalities import PRODUCTS_ANCHOR
+    from page_rewriter import Page, RewritePipeline, all_rules
+
+    pipeline = RewritePipeline(all_rules())
+    content = f'<main>\n{PRODUCTS_ANCHOR}\n</main>'
+    # knokke-heist has no hoofdgemeente row, add_submunicipalities.py skips it
+    assert pipeline.rewrite(content, Page('knokke-heist/index.html', 'knokke-heist')) == (content, [])
+    assert 'Added sub-municipalities section' in pipeline.rewrite(content, Page('brugge/index.html', 'brugge'))[1]
@@ -0,0 +1,21 @@
+from types import SimpleNamespace
+
+from sitemap_builder import location_paths
+
+
+def make_page(locaties_dir, slug):
+    page = locaties_dir / slug / 'index.html'
+    page.parent.mkdir(parents=True)
+    page.write_text('<html></html>')
+
+
+def test_location_paths_follow_the_index(tmp_path):
+    for slug in ('brugge', 'gent', 'oud-dorp'):
+        make_page(tmp_path, slug)
+    (tmp_path / 'leeg').mkdir()
+    index = SimpleNamespace(municipalities=dict.fromkeys(['gent', 'brugge', 'aalst']))
+
+    paths, missing = location_paths(index, str(tmp_path))
+    # oud-dorp is no longer in the index, aalst has no page yet
+    assert paths == ['/locaties/brugge', '/locaties/gent']
+    assert missing == ['aalst']
@@ -0,0 +1,34 @@
+import pytest
+
+from slugs import LEGACY_IMPLEMENTATIONS, check, csv_names, slugify
+
+
+@pytest.mark.parametrize('name, slug', [
+    ('Brugge', 'brugge'),
+    ('Sint-Lievens-Houtem', 'sint-lievens-houtem'),
+    ('NAZARETH-DE PINTE', 'nazareth-de-pinte'),
+    ('Heist-aan-Zee', 'heist-aan-zee'),
+    ('Wervik (Geluwe)', 'wervik-geluwe'),
+    ('Liège', 'liege'),
+    ('Noël', 'noel'),
+    ('Straße', 'strasse'),
+    ('Œuvre Ærø', 'oeuvre-aero'),
+    ('  -Lo- ', 'lo'),
+])
+def test_slugify(name, slug):
+    assert slugify(name) == slug
+
+
+def test_ascii_matches_every_legacy_implementation():
+    for name in ('Aalst', 'Sint-Niklaas', 'De Panne', 'Knokke-Heist'):
+        assert {legacy(name) for legacy in LEGACY_IMPLEMENTATIONS.values()} == {slugify(name)}
+
+
+def test_check_reports_differences(capsys):
+    # The legacy tables never covered ß
+    assert check(['Straße']) == len(LEGACY_IMPLEMENTATIONS)
+    assert "'Straße'" in capsys.readouterr().out
+
+
+def test_check_passes_on_the_dataset(in_repo):
+    assert check(csv_names()) == 0
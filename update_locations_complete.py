@@ -4,6 +4,8 @@ Update all-locations.json with complete municipality data
 """
 import json
 
+from slugs import slugify
+
 # Complete data from user
 raw_data = """Oost-Vlaanderen	2070	Burcht	Deelgemeente	BEVEREN-KRUIBEKE-ZWIJNDRECHT
 Oost-Vlaanderen	2070	Zwijndrecht	Deelgemeente	BEVEREN-KRUIBEKE-ZWIJNDRECHT
@@ -127,10 +129,6 @@ Oost-Vlaanderen	9420	Vlekkem	Deelgemeente	ERPE-MERE"""
 # Parse the data - this is just a sample, the full script would process all lines
 # For brevity, I'll create a mapping function
 
-def slugify(name):
-    """Convert name to slug"""
-    return name.lower().replace(' ', '-').replace('à', 'a').replace('é', 'e').replace('è', 'e').replace('ë', 'e').replace('ï', 'i').replace('ô', 'o').replace('ü', 'u')
-
 def parse_data(raw_text):
     """Parse the tab-separated data"""
     lines = raw_text.strip().split('\n')
@@ -159,7 +157,7 @@ def parse_data(raw_text):
             parent = None
         else:
             # Deelgemeente - find parent slug
-            parent_slug = slug_map.get(parent_group, slugify(parent_group.split('-')[0]))
+            parent_slug = slug_map.get(parent_group, slugify(parent_group))
             slug = parent_slug
             parent = parent_group.title()
         